@@ -1,8 +1,22 @@
 import streamlit as st
 import json
-from datetime import datetime
-import matplotlib.pyplot as plt
-import numpy as np
+import re
+import time
+import uuid
+from modules.arama import add_summary, snippet, summary_index
+from modules.baslatma import prewarm_in_background
+from modules.cizim import render_pool
+from modules.depo import get_depo
+from modules.icerik import get_content
+from modules.ice_aktar import stream_import
+from modules.notlar import NoteStore
+from modules.onbellek import RENDER_STATS, figure_cache, pool_stats, render_graph
+from modules.onizleme import pending_count, warm_up
+from modules.profil import BUCKET_LABELS, profiled, render_profiler
+from modules.sayfa_plani import page_plan, plan_cache
+from modules.sema import validate_new_page
+from modules.yapilandirma import CONFIG
+from modules.yedek import build_backup
 
 # Sayfa ayarları
 st.set_page_config(
@@ -11,171 +25,76 @@ st.set_page_config(
     layout="wide"
 )
 
-# Session state başlatma
-if 'lessons' not in st.session_state:
-    st.session_state.lessons = []
-if 'tests' not in st.session_state:
-    st.session_state.tests = []
-if 'notes' not in st.session_state:
-    st.session_state.notes = {}
-if 'summaries' not in st.session_state:
-    st.session_state.summaries = []
-if 'selected_lesson' not in st.session_state:
-    st.session_state.selected_lesson = None
-if 'current_page' not in st.session_state:
-    st.session_state.current_page = 1
-
-# GRAFİK ÇİZİM FONKSİYONLARI
-def draw_budget_constraint(R1=100, R2=80, j12=0.1):
-    """İki dönemli bütçe kısıtı grafiği"""
-    fig, ax = plt.subplots(figsize=(10, 8))
-    
-    C1_max = (R1 * (1 + j12) + R2) / (1 + j12)
-    C2_max = R1 * (1 + j12) + R2
-    
-    C1_range = np.linspace(0, C1_max, 100)
-    C2_budget = R1 * (1 + j12) + R2 - (1 + j12) * C1_range
-    
-    ax.plot(C1_range, C2_budget, 'b-', linewidth=2, label='Bütçe Doğrusu (AB)')
-    
-    C1_indiff = np.linspace(20, C1_max - 20, 100)
-    C2_indiff1 = 3000 / C1_indiff
-    ax.plot(C1_indiff, C2_indiff1, 'g--', linewidth=1.5, alpha=0.7, label='U¹')
-    
-    C2_indiff2 = 5000 / C1_indiff
-    ax.plot(C1_indiff, C2_indiff2, 'r--', linewidth=1.5, alpha=0.7, label='U²')
-    
-    ax.plot(R1, R2, 'ko', markersize=10, label=f'Başlangıç (R): ({R1}, {R2})')
-    ax.annotate('R', xy=(R1, R2), xytext=(R1+5, R2+5), fontsize=12, fontweight='bold')
-    
-    C1_opt = C1_max * 0.55
-    C2_opt = R1 * (1 + j12) + R2 - (1 + j12) * C1_opt
-    ax.plot(C1_opt, C2_opt, 'ro', markersize=12, label=f'Optimum (P): ({C1_opt:.1f}, {C2_opt:.1f})')
-    ax.annotate('P', xy=(C1_opt, C2_opt), xytext=(C1_opt+5, C2_opt+5), 
-                fontsize=12, fontweight='bold', color='red')
-    
-    ax.set_xlabel('C₁ (Birinci Dönem Tüketimi)', fontsize=12, fontweight='bold')
-    ax.set_ylabel('C₂ (İkinci Dönem Tüketimi)', fontsize=12, fontweight='bold')
-    ax.set_title('İki Dönemli Tüketici Optimumu', fontsize=14, fontweight='bold')
-    ax.grid(True, alpha=0.3)
-    ax.legend(loc='upper right')
-    ax.set_xlim(0, C1_max * 1.1)
-    ax.set_ylim(0, C2_max * 1.1)
-    
-    info_text = f'Faiz Oranı (j₁₂): {j12*100:.1f}%\nBütçe Eğimi: -(1+j₁₂) = -{1+j12:.2f}'
-    ax.text(0.02, 0.98, info_text, transform=ax.transAxes, 
-            verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
-    
-    return fig
+# Profil açıkken yeniden çalıştırmanın toplam süresi için
+rerun_started = time.perf_counter()
 
-def draw_supply_demand(P_eq=10, Q_eq=100):
-    """Arz-talep grafiği"""
-    fig, ax = plt.subplots(figsize=(10, 8))
-    
-    P_range = np.linspace(0, 20, 100)
-    Q_demand = 200 - 10 * P_range
-    Q_supply = 10 * P_range
-    
-    ax.plot(Q_demand, P_range, 'b-', linewidth=2, label='Talep Eğrisi')
-    ax.plot(Q_supply, P_range, 'r-', linewidth=2, label='Arz Eğrisi')
-    
-    ax.plot(Q_eq, P_eq, 'go', markersize=15, label=f'Denge: (Q={Q_eq}, P={P_eq})')
-    ax.axhline(y=P_eq, color='gray', linestyle='--', alpha=0.5)
-    ax.axvline(x=Q_eq, color='gray', linestyle='--', alpha=0.5)
-    
-    ax.set_xlabel('Miktar (Q)', fontsize=12, fontweight='bold')
-    ax.set_ylabel('Fiyat (P)', fontsize=12, fontweight='bold')
-    ax.set_title('Arz ve Talep Dengesi', fontsize=14, fontweight='bold')
-    ax.grid(True, alpha=0.3)
-    ax.legend(loc='upper right')
-    ax.set_xlim(0, 220)
-    ax.set_ylim(0, 22)
-    
-    return fig
+# Kalıcı depo (SQLite) ve tüm oturumların paylaştığı salt okunur içerik
+depo = get_depo()
+content = get_content()
 
-# Demo veri yükleme
-if len(st.session_state.lessons) == 0:
-    st.session_state.lessons = [
-        {
-            "unit_number": 1,
-            "unit_title": "İki Dönemli Tüketici Modeli",
-            "pages": [
-                {
-                    "page_number": 1,
-                    "sections": [
-                        {
-                            "id": "s1",
-                            "type": "text",
-                            "content": "İki dönemli tüketici modeli, tüketicinin gelir ve faiz oranları kısıtı altında, bugünkü (C₁) ve gelecekteki (C₂) tüketimi arasındaki tercihlerini eniyilemesini inceler."
-                        },
-                        {
-                            "id": "s2",
-                            "type": "formula",
-                            "content": r"C_2 = R_1(1+j_{12}) + R_2 - (1+j_{12})C_1"
-                        }
-                    ]
-                },
-                {
-                    "page_number": 2,
-                    "sections": [
-                        {
-                            "id": "s1",
-                            "type": "text",
-                            "content": "Tüketici optimumu gösteren (P) noktasında, bütçe doğrusunun eğimi ile zaman kayıtsızlık eğrisinin eğimi birbirine eşittir."
-                        },
-                        {
-                            "id": "s2",
-                            "type": "graph",
-                            "graph_type": "budget_constraint",
-                            "title": "İki Dönemli Optimum Tüketim",
-                            "description": "Bütçe doğrusu ve farksızlık eğrileri",
-                            "params": {"R1": 100, "R2": 80, "j12": 0.1}
-                        }
-                    ]
-                }
-            ]
-        },
-        {
-            "unit_number": 2,
-            "unit_title": "Arz ve Talep Analizi",
-            "pages": [
-                {
-                    "page_number": 1,
-                    "sections": [
-                        {
-                            "id": "s1",
-                            "type": "text",
-                            "content": "Arz ve talep, piyasa ekonomisinin temel dinamiklerini açıklar. Fiyat mekanizması bu iki kuvvetin etkileşimiyle oluşur."
-                        },
-                        {
-                            "id": "s2",
-                            "type": "graph",
-                            "graph_type": "supply_demand",
-                            "title": "Arz ve Talep Dengesi",
-                            "description": "Piyasa denge noktası",
-                            "params": {"P_eq": 10, "Q_eq": 100}
-                        }
-                    ]
-                }
-            ]
-        }
-    ]
-    
-    st.session_state.tests = [
-        {
-            "id": 1,
-            "unit": "Ünite 1",
-            "questions": [
-                {
-                    "id": "q1",
-                    "type": "multiple",
-                    "question": "İki dönemli modelde faiz oranı artarsa bütçe doğrusunun eğimi nasıl değişir?",
-                    "options": ["Artar (daha dik)", "Azalır (daha yatık)", "Değişmez", "Belirsiz"],
-                    "correct": 0
-                }
-            ]
-        }
-    ]
+# matplotlib / numpy burada içe aktarılmaz; çizim arka ucu arka planda bir kez ısıtılır
+if CONFIG['prewarm_enabled']:
+    prewarm_in_background()
+
+NOTES_PER_PAGE = 50
+UNITS_PER_PAGE = 10
+# Bu sayıdan çok bölümü olan sayfalar içindekiler ve katlanır bölümlerle çizilir
+OUTLINE_MIN_SECTIONS = 6
+# Arama sayfasında her sonuç türü için gösterilen en fazla sonuç
+SEARCH_LIMIT = 20
+
+# Adres çubuğundaki kullanıcı anahtarı (?u=); yenilemede aynı notlar yüklenir
+USER_KEY = re.compile(r"[A-Za-z0-9_-]{1,64}")
+
+
+def session_user():
+    """Oturumun not sahibi: paylaşılan kullanıcı, adresteki anahtar ya da yeni bir anahtar"""
+    if CONFIG['shared_user'] is not None:
+        return CONFIG['shared_user']
+    # Streamlit 1.30+ st.query_params, daha eski sürümlerde experimental_* işlevleri
+    params = getattr(st, "query_params", None)
+    if params is not None:
+        user = params.get("u")
+    else:
+        user = (st.experimental_get_query_params().get("u") or [None])[0]
+    if not user or not USER_KEY.fullmatch(user):
+        user = uuid.uuid4().hex
+        if params is not None:
+            params["u"] = user
+        else:
+            st.experimental_set_query_params(u=user)
+    return user
+
+
+def config_input(widget, key, label, *args, **kwargs):
+    """Süreç geneli CONFIG ayarının widget'ı; yalnızca yönetici (MIKRO_ADMIN=1) değiştirebilir"""
+    kwargs['disabled'] = kwargs.get('disabled', False) or not CONFIG['admin']
+    value = widget(label, *args, **kwargs)
+    if CONFIG['admin']:
+        CONFIG[key] = value
+
+
+with profiled("genel", "oturum"):
+    # Session state başlatma: yalnızca oturuma ait notlar, özetler ve konum
+    if 'user' not in st.session_state:
+        st.session_state.user = session_user()
+    if 'notes' not in st.session_state:
+        st.session_state.notes = NoteStore.from_depo(depo, st.session_state.user)
+    if 'summaries' not in st.session_state:
+        st.session_state.summaries = depo.load_summaries()
+    if 'selected_unit' not in st.session_state:
+        st.session_state.selected_unit = None
+    if 'current_page' not in st.session_state:
+        st.session_state.current_page = 1
+    if 'render_mode' not in st.session_state:
+        st.session_state.render_mode = CONFIG['render_mode']
+
+    # İçerik başka bir oturumda değiştiyse seçili ünitenin hâlâ var olduğunu doğrula
+    if st.session_state.get('content_version') != content.version:
+        if st.session_state.selected_unit is not None and content.unit(st.session_state.selected_unit) is None:
+            st.session_state.selected_unit = None
+            st.session_state.current_page = 1
+        st.session_state.content_version = content.version
 
 # Üst başlık
 st.markdown("""
@@ -186,17 +105,108 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Sidebar menü
-st.sidebar.title("🎯 Menü")
-menu = st.sidebar.radio(
-    "Sayfa Seçin:",
-    ["📚 Dersler", "🧪 Test & Sorular", "📝 Notlarım", "📊 Özetler", "⚙️ Ayarlar"]
-)
+with profiled("genel", "kenar çubuğu"):
+    st.sidebar.title("🎯 Menü")
+    # Anahtar, arama sonuçlarından ders sayfasına geçişte menüyü değiştirmek için
+    menu = st.sidebar.radio(
+        "Sayfa Seçin:",
+        ["📚 Dersler", "🧪 Test & Sorular", "📝 Notlarım", "📊 Özetler", "🔎 Ara", "⚙️ Ayarlar"],
+        key="menu"
+    )
+
+# Profil kayıtlarında ders detayı liste görünümünden ayrı tutulur
+page_label = menu
+if menu == "📚 Dersler" and st.session_state.selected_unit is not None:
+    page_label = "📚 Dersler • Ünite"
+
+# ========================
+# BÖLÜM PARÇALARI
+# ========================
+# Streamlit 1.37+ st.fragment, 1.33-1.36 st.experimental_fragment; daha eski sürümlerde yoktur
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+
+def isolated(func):
+    """Yalıtım açıksa ve destekleniyorsa bölüm, kendi widget'ları değişince tek başına yeniden çalışır"""
+    if CONFIG['isolate_sections'] and _fragment is not None:
+        return _fragment(func)
+    return func
+
+
+@isolated
+def graph_section(graph):
+    """Grafik bölümü: slider'lar, grafik ve (varsa) tablo; graph sayfa planındaki grafik tanımıdır"""
+    with profiled(page_label, f"bölüm: graph ({graph['graph_type']})"):
+        graph_type = graph['graph_type']
+        overlay = graph['overlay']
+        
+        st.subheader(graph['heading'])
+        st.caption(graph['caption'])
+        
+        # Senaryolar: bir parametrenin birçok değeri tek figürde üst üste çizilir
+        slider_cols = st.columns(len(graph['sliders'])) if graph['sliders'] else []
+        values = {}
+        for col, (name, label, lo, hi, value, step, key) in zip(slider_cols, graph['sliders']):
+            with col:
+                values[name] = st.slider(label, lo, hi, value, step, key=key)
+        values.update(graph['options'])
+        
+        if graph['drawable'] and st.session_state.render_mode == 'vector':
+            # numpy yalnızca bir grafik ekrandayken içe aktarılır
+            from modules.vektor import render_vector
+            st.vega_lite_chart(render_vector(graph_type, values, overlay), use_container_width=True)
+        elif graph['drawable']:
+            try:
+                st.image(render_graph(graph_type, values, overlay), use_column_width=True)
+            except TimeoutError as e:
+                # Çizim havuzu dolu ya da yavaş; sayfanın geri kalanı yine çizilir
+                st.warning(f"⏳ {e}")
+            if overlay is None:
+                # Komşu slider değerlerini arka planda hazırla
+                warm_up(graph_type, values)
+        
+        if graph['table']:
+            from modules.cekirdekler import series_table
+            st.dataframe(series_table(graph_type, values), use_container_width=True, hide_index=True)
+
+
+@isolated
+def note_panel(unit_number, page_number, section_id, note_key):
+    """Bölümün not paneli: mevcut notlar ve yeni not formu"""
+    with st.container(), profiled(page_label, "not paneli"):
+        st.markdown("---")
+        st.markdown("### 💡 Notlar")
+        
+        # Mevcut notları göster
+        for note in st.session_state.notes.for_section(unit_number, page_number, section_id):
+            col_note, col_del = st.columns([10, 1])
+            with col_note:
+                st.info(f"**{note['date']}**\n\n{note['text']}")
+            with col_del:
+                if st.button("🗑️", key=f"del_note_{note_key}_{note['id']}"):
+                    st.session_state.notes.delete(note['id'])
+                    # Not sayısı bölüm düğmesinde de görünür; tüm sayfa yeniden çalışır
+                    st.rerun()
+        
+        new_note_text = st.text_area(
+            "Yeni not ekle:", 
+            key=f"input_{note_key}",
+            height=100
+        )
+        
+        if st.button("💾 Kaydet", key=f"save_{note_key}"):
+            if new_note_text and new_note_text.strip():
+                st.session_state.notes.add(unit_number, page_number, section_id, new_note_text.strip())
+                
+                st.success("✅ Not eklendi!")
+                # Input'u temizlemek ve not sayısını güncellemek için tüm sayfa yeniden çalışır
+                st.rerun()
 
 # ========================
 # DERSLER SAYFASI
 # ========================
 if menu == "📚 Dersler":
-    if st.session_state.selected_lesson is None:
+    if st.session_state.selected_unit is None:
         st.header("📚 Dersler")
         
         col1, col2 = st.columns([3, 1])
@@ -204,35 +214,54 @@ if menu == "📚 Dersler":
             if st.button("➕ Yeni Sayfa Ekle", type="primary"):
                 st.info("JSON formatında sayfa verisi ekleyin (Ayarlar sayfasından)")
         
+        # Büyük ders paketlerinde yalnızca filtrelenmiş listenin gösterilen dilimi çizilir
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            unit_query = st.text_input(
+                "🔎 Ünite ara:", key="unit_query", placeholder="Ünite numarası ya da başlık",
+                # Arama değişince liste ilk sayfadan başlar
+                on_change=st.session_state.pop, args=("units_page", None),
+            )
+        units = content.find_units(unit_query)
+        unit_page_count = max(1, -(-len(units) // UNITS_PER_PAGE))
+        with col2:
+            units_page = st.number_input("Sayfa:", 1, unit_page_count, 1, key="units_page") if unit_page_count > 1 else 1
+        
+        st.caption(f"{len(units)} ünite")
         st.markdown("---")
         
-        # Ünite numarasına göre sırala
-        sorted_lessons = sorted(st.session_state.lessons, key=lambda x: x['unit_number'])
+        if not units:
+            st.info("Aramayla eşleşen ünite yok.")
         
-        for lesson in sorted_lessons:
+        # İçerik deposu üniteleri numara sırasıyla tutar
+        for lesson in units[(units_page - 1) * UNITS_PER_PAGE:units_page * UNITS_PER_PAGE]:
             with st.container():
                 col1, col2 = st.columns([5, 1])
                 with col1:
                     st.subheader(f"Ünite {lesson['unit_number']}: {lesson['unit_title']}")
-                    st.caption(f"📄 {len(lesson['pages'])} sayfa")
+                    st.caption(f"📄 {lesson['page_count']} sayfa")
                 with col2:
-                    if st.button("Aç", key=f"open_unit_{lesson['unit_number']}"):
-                        st.session_state.selected_lesson = lesson
-                        st.session_state.current_page = 1
-                        st.rerun()
+                    # Geri çağırma, ek bir st.rerun() çalıştırması olmadan ünitenin açılmasını sağlar
+                    st.button(
+                        "Aç",
+                        key=f"open_unit_{lesson['unit_number']}",
+                        on_click=st.session_state.update,
+                        kwargs={"selected_unit": lesson['unit_number'], "current_page": 1},
+                    )
                 st.markdown("---")
     
     else:
         # Ders detay sayfası
-        lesson = st.session_state.selected_lesson
-        total_pages = len(lesson['pages'])
-        current_page_num = st.session_state.current_page
+        lesson = content.unit(st.session_state.selected_unit)
+        pages = content.pages(lesson['unit_number'])
+        total_pages = len(pages)
+        current_page_num = min(st.session_state.current_page, total_pages)
         
         # Üst navigasyon
         col1, col2, col3 = st.columns([1, 3, 1])
         with col1:
             if st.button("⬅️ Derslere Dön"):
-                st.session_state.selected_lesson = None
+                st.session_state.selected_unit = None
                 st.session_state.current_page = 1
                 st.rerun()
         with col2:
@@ -242,59 +271,57 @@ if menu == "📚 Dersler":
         
         st.markdown("---")
         
-        # Mevcut sayfayı al
-        current_page = lesson['pages'][current_page_num - 1]
+        # Mevcut sayfanın planı: bölüm türleri ve widget anahtarları sayfa başına bir kez kurulur
+        plan = page_plan(content, lesson['unit_number'], current_page_num)
+        page_key = plan['page_key']
+        
+        # Uzun sayfalarda bölümler katlanır; kapalı bölümün (özellikle grafiğin) widget'ları hiç oluşturulmaz
+        outline = len(plan['sections']) >= OUTLINE_MIN_SECTIONS
+        if outline:
+            open_keys = plan['open_keys']
+            with st.expander(f"📑 İçindekiler ({len(open_keys)} bölüm)"):
+                for number, section in enumerate(plan['sections'], 1):
+                    st.markdown(f"{number}. {section['title']}")
+                col_open, col_close = st.columns(2)
+                col_open.button("Tümünü aç", key=f"open_all_{page_key}", use_container_width=True,
+                                on_click=st.session_state.update, args=(dict.fromkeys(open_keys, True),))
+                col_close.button("Tümünü kapat", key=f"close_all_{page_key}", use_container_width=True,
+                                 on_click=st.session_state.update, args=(dict.fromkeys(open_keys, False),))
         
         # Sayfa içeriği
-        for idx, section in enumerate(current_page['sections']):
-            note_key = f"{lesson['unit_number']}-{current_page_num}-{section['id']}"
-            section_notes = st.session_state.notes.get(note_key, [])
+        for section in plan['sections']:
+            if outline:
+                # Metin ve formül açık, grafikler kapalı başlar
+                st.session_state.setdefault(section['open_key'], section['type'] != 'graph')
+                if not st.toggle(section['title'], key=section['open_key']):
+                    continue
+            
+            section_notes = st.session_state.notes.for_section(lesson['unit_number'], plan['page_number'], section['id'])
             
             # Not görünürlük durumu için unique key
-            show_note_state_key = f"show_note_{note_key}"
+            show_note_state_key = section['show_key']
             
             # Bölüm içeriği
             col1, col2 = st.columns([12, 1])
             
             with col1:
-                if section['type'] == 'text':
-                    st.markdown(f"{section['content']}")
-                
-                elif section['type'] == 'formula':
-                    st.latex(section['content'])
-                
-                elif section['type'] == 'graph':
-                    st.subheader(f"📊 {section.get('title', 'Grafik')}")
-                    st.caption(section.get('description', ''))
-                    
-                    params = section.get('params', {})
-                    graph_type = section.get('graph_type', 'budget_constraint')
-                    
-                    if graph_type == 'budget_constraint':
-                        col_a, col_b, col_c = st.columns(3)
-                        with col_a:
-                            R1 = st.slider("R₁ - Gelir 1", 50, 200, params.get('R1', 100), key=f"r1_{note_key}")
-                        with col_b:
-                            R2 = st.slider("R₂ - Gelir 2", 50, 200, params.get('R2', 80), key=f"r2_{note_key}")
-                        with col_c:
-                            j12 = st.slider("j₁₂ - Faiz", 0.0, 0.5, params.get('j12', 0.1), 0.01, key=f"j12_{note_key}")
+                if section['type'] == 'graph':
+                    # Grafik bölümü kendi süresini ölçer; yalnız başına yeniden çalıştığında da
+                    graph_section(section['graph'])
+                else:
+                    with profiled(page_label, f"bölüm: {section['type']}"):
+                        if section['type'] == 'text':
+                            st.markdown(section['content'])
                         
-                        fig = draw_budget_constraint(R1, R2, j12)
-                        st.pyplot(fig)
-                        plt.close()
-                    
-                    elif graph_type == 'supply_demand':
-                        col_a, col_b = st.columns(2)
-                        with col_a:
-                            P_eq = st.slider("Denge Fiyatı (P)", 5, 15, params.get('P_eq', 10), key=f"p_{note_key}")
-                        with col_b:
-                            Q_eq = st.slider("Denge Miktarı (Q)", 50, 150, params.get('Q_eq', 100), key=f"q_{note_key}")
+                        elif section['latex_error']:
+                            # Bozuk formül tarayıcıda KaTeX hatası yerine kaynağıyla gösterilir
+                            st.warning(f"⚠️ Formül gösterilemedi: {section['latex_error']}")
+                            st.code(section['content'], language="latex")
                         
-                        fig = draw_supply_demand(P_eq, Q_eq)
-                        st.pyplot(fig)
-                        plt.close()
+                        else:
+                            st.latex(section['content'])
             
-            with col2:
+            with col2, profiled(page_label, "not paneli"):
                 # Not butonu
                 note_count = len(section_notes)
                 if note_count > 0:
@@ -303,7 +330,7 @@ if menu == "📚 Dersler":
                     button_label = "📝"
                 
                 # Not butonuna unique key
-                if st.button(button_label, key=f"note_toggle_{note_key}"):
+                if st.button(button_label, key=section['toggle_key']):
                     # Toggle durumunu değiştir
                     if show_note_state_key in st.session_state:
                         st.session_state[show_note_state_key] = not st.session_state[show_note_state_key]
@@ -312,46 +339,7 @@ if menu == "📚 Dersler":
             
             # Not paneli
             if st.session_state.get(show_note_state_key, False):
-                with st.container():
-                    st.markdown("---")
-                    st.markdown("### 💡 Notlar")
-                    
-                    # Mevcut notları göster
-                    if len(section_notes) > 0:
-                        for note_idx, note in enumerate(section_notes):
-                            col_note, col_del = st.columns([10, 1])
-                            with col_note:
-                                st.info(f"**{note['date']}**\n\n{note['text']}")
-                            with col_del:
-                                if st.button("🗑️", key=f"del_note_{note_key}_{note_idx}"):
-                                    st.session_state.notes[note_key].pop(note_idx)
-                                    st.rerun()
-                    
-                    # Yeni not ekleme formu - TAM UNIQUE KEY
-                    note_form_key = f"form_{note_key}_{current_page_num}_{idx}"
-                    note_input_key = f"input_{note_key}_{current_page_num}_{idx}"
-                    
-                    new_note_text = st.text_area(
-                        "Yeni not ekle:", 
-                        key=note_input_key,
-                        height=100
-                    )
-                    
-                    if st.button("💾 Kaydet", key=f"save_{note_form_key}"):
-                        if new_note_text and new_note_text.strip():
-                            # Not ekle
-                            if note_key not in st.session_state.notes:
-                                st.session_state.notes[note_key] = []
-                            
-                            st.session_state.notes[note_key].append({
-                                "id": datetime.now().timestamp(),
-                                "text": new_note_text.strip(),
-                                "date": datetime.now().strftime("%d.%m.%Y %H:%M")
-                            })
-                            
-                            st.success("✅ Not eklendi!")
-                            # Input'u temizlemek için rerun
-                            st.rerun()
+                note_panel(lesson['unit_number'], plan['page_number'], section['id'], section['note_key'])
             
             st.markdown("---")
         
@@ -380,39 +368,59 @@ if menu == "📚 Dersler":
 elif menu == "🧪 Test & Sorular":
     st.header("🧪 Test & Sorular")
     
+    # Puanlama ve madde istatistikleri numpy gerektirir; yalnızca bu sayfada içe aktarılır
+    from modules.sinav import draw_questions, item_stats, record_attempt
+    
     if 'selected_test' not in st.session_state:
         st.session_state.selected_test = None
-    if 'test_answers' not in st.session_state:
-        st.session_state.test_answers = {}
-    if 'show_test_answers' not in st.session_state:
-        st.session_state.show_test_answers = False
+    if 'quiz_round' not in st.session_state:
+        st.session_state.quiz_round = 0
+    if 'quiz_result' not in st.session_state:
+        st.session_state.quiz_result = None
+    
+    # İçerik başka bir oturumda değiştiyse seçili test artık olmayabilir
+    if st.session_state.selected_test is not None and content.test(st.session_state.selected_test) is None:
+        st.session_state.selected_test = None
     
     if st.session_state.selected_test is None:
-        for test in st.session_state.tests:
+        for test in content.tests():
             with st.container():
                 col1, col2 = st.columns([5, 1])
                 with col1:
                     st.subheader(test['unit'])
-                    st.caption(f"{len(test['questions'])} soru")
+                    if test.get('sample'):
+                        st.caption(f"{len(test['questions'])} soruluk banka • her denemede {test['sample']} soru")
+                    else:
+                        st.caption(f"{len(test['questions'])} soru")
                 with col2:
                     if st.button("Başla", key=f"test_{test['id']}"):
-                        st.session_state.selected_test = test
-                        st.session_state.test_answers = {}
-                        st.session_state.show_test_answers = False
+                        st.session_state.selected_test = test['id']
+                        st.session_state.quiz_round += 1
+                        st.session_state.quiz_questions = draw_questions(test, time.time_ns())
+                        st.session_state.quiz_result = None
                         st.rerun()
                 st.markdown("---")
     
     else:
-        test = st.session_state.selected_test
+        test = content.test(st.session_state.selected_test)
+        questions = {q['id']: q for q in test['questions']}
+        # Test başka bir oturumda değiştiyse artık olmayan sorular atlanır
+        quiz_questions = [q_id for q_id in st.session_state.get('quiz_questions', []) if q_id in questions]
+        result = st.session_state.quiz_result
         
         if st.button("⬅️ Testlere Dön"):
             st.session_state.selected_test = None
             st.rerun()
         
         st.subheader(test['unit'])
+        if len(quiz_questions) < len(questions):
+            st.caption(f"{len(questions)} soruluk bankadan rastgele {len(quiz_questions)} soru")
         st.markdown("---")
         
-        for idx, q in enumerate(test['questions']):
+        # Cevaplar widget anahtarlarında durur; her denemenin anahtarları ayrıdır
+        answer_key = f"q_{test['id']}_{st.session_state.quiz_round}_"
+        for idx, q_id in enumerate(quiz_questions):
+            q = questions[q_id]
             st.markdown(f"### Soru {idx + 1}")
             st.write(q['question'])
             
@@ -421,25 +429,41 @@ elif menu == "🧪 Test & Sorular":
                     "Cevabınız:",
                     options=range(len(q['options'])),
                     format_func=lambda x: q['options'][x],
-                    key=f"q_{q['id']}"
+                    index=None,
+                    key=answer_key + str(q_id),
+                    disabled=result is not None
                 )
-                st.session_state.test_answers[q['id']] = answer
                 
-                if st.session_state.show_test_answers:
-                    if answer == q['correct']:
+                if result is not None:
+                    if result['results'].get(q_id):
                         st.success("✅ Doğru!")
                     else:
                         st.error(f"❌ Yanlış! Doğru cevap: {q['options'][q['correct']]}")
             
             elif q['type'] == 'classic':
-                answer = st.text_area("Cevabınız:", key=f"q_{q['id']}", height=150)
-                st.session_state.test_answers[q['id']] = answer
+                st.text_area("Cevabınız:", key=answer_key + str(q_id), height=150, disabled=result is not None)
             
             st.markdown("---")
         
-        if st.button("👁️ Cevaplara Bak" if not st.session_state.show_test_answers else "🙈 Cevapları Gizle", type="primary"):
-            st.session_state.show_test_answers = not st.session_state.show_test_answers
-            st.rerun()
+        if result is None:
+            if st.button("✅ Testi Bitir", type="primary"):
+                answers = {q_id: st.session_state.get(answer_key + str(q_id)) for q_id in quiz_questions}
+                st.session_state.quiz_result = record_attempt(depo, test, quiz_questions, answers)
+                st.rerun()
+        else:
+            if result['total']:
+                st.success(f"🎯 Puan: {result['correct']} / {result['total']} (%{result['correct'] / result['total'] * 100:.0f})")
+            if st.button("🔁 Yeni Deneme", type="primary"):
+                st.session_state.quiz_round += 1
+                st.session_state.quiz_questions = draw_questions(test, time.time_ns())
+                st.session_state.quiz_result = None
+                st.rerun()
+        
+        # Tüm oturumların denemelerinden artımlı madde istatistikleri
+        with st.expander("📈 Soru İstatistikleri"):
+            stats = item_stats(depo, test)
+            st.caption(f"{stats.attempts} deneme • Güçlük: doğru cevap oranı • Ayırt edicilik: soru puanı ile testin geri kalanı arasındaki korelasyon")
+            st.dataframe(stats.table(test), use_container_width=True, hide_index=True)
 
 # ========================
 # NOTLARIM SAYFASI
@@ -447,31 +471,33 @@ elif menu == "🧪 Test & Sorular":
 elif menu == "📝 Notlarım":
     st.header("📝 Tüm Notlarım")
     
-    all_notes = []
-    for key, note_list in st.session_state.notes.items():
-        parts = key.split('-')
-        unit_num = int(parts[0])
-        page_num = int(parts[1])
-        
-        lesson = next((l for l in st.session_state.lessons if l['unit_number'] == unit_num), None)
-        
-        for note in note_list:
-            all_notes.append({
-                **note,
-                "unit_title": f"Ünite {unit_num}: {lesson['unit_title']}" if lesson else "Bilinmeyen",
-                "page_num": page_num,
-                "unit_num": unit_num
-            })
+    notes = st.session_state.notes
     
-    if len(all_notes) == 0:
+    if len(notes) == 0:
         st.info("Henüz not eklenmemiş. Dersler sayfasından not ekleyebilirsiniz.")
     else:
-        # Ünite ve sayfaya göre sırala
-        all_notes_sorted = sorted(all_notes, key=lambda x: (x['unit_num'], x['page_num'], -x['id']))
+        unit_titles = {l['unit_number']: l['unit_title'] for l in content.units()}
         
-        for note in all_notes_sorted:
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            unit_filter = st.selectbox(
+                "Ünite:",
+                options=[None] + notes.units(),
+                format_func=lambda x: "Tüm üniteler" if x is None else f"Ünite {x}: {unit_titles.get(x, 'Bilinmeyen')}"
+            )
+        
+        note_total = len(notes) if unit_filter is None else notes.count_for_unit(unit_filter)
+        page_count = max(1, -(-note_total // NOTES_PER_PAGE))
+        with col2:
+            notes_page = st.number_input("Sayfa:", 1, page_count, 1) if page_count > 1 else 1
+        
+        # Ünite ve sayfaya göre sıralı görünüm yalnızca gösterilen dilim için okunur
+        for note in notes.sorted_notes(unit_filter, (notes_page - 1) * NOTES_PER_PAGE, NOTES_PER_PAGE):
+            unit_title = f"Ünite {note['unit']}: {unit_titles[note['unit']]}" if note['unit'] in unit_titles else "Bilinmeyen"
             with st.container():
-                st.markdown(f"**{note['unit_title']} - Sayfa {note['page_num']}** • {note['date']}")
+                # Ders sayfasındaki gibi sayfanın ünitedeki sırası gösterilir
+                shown_page = content.page_position(note['unit'], note['page']) or note['page']
+                st.markdown(f"**{unit_title} - Sayfa {shown_page}** • {note['date']}")
                 st.write(note['text'])
                 st.markdown("---")
 
@@ -492,7 +518,10 @@ elif menu == "📊 Özetler":
     if st.button("➕ Özet Ekle", type="primary"):
         try:
             summary_data = json.loads(json_input)
+            depo.add_summary(summary_data)
             st.session_state.summaries.append(summary_data)
+            if 'summary_index' in st.session_state:
+                add_summary(st.session_state.summary_index, len(st.session_state.summaries) - 1, summary_data)
             st.success("Özet başarıyla eklendi!")
             st.rerun()
         except:
@@ -504,62 +533,223 @@ elif menu == "📊 Özetler":
         with st.expander(summary.get('unit', 'Özet')):
             st.write(summary.get('summary', ''))
 
+# ========================
+# ARAMA SAYFASI
+# ========================
+elif menu == "🔎 Ara":
+    st.header("🔎 Ara")
+    
+    query = st.text_input("Ders içeriği, notlar ve özetlerde ara:", key="search_query",
+                          placeholder="ör. faiz oranı, bütçe doğrusu")
+    
+    if query.strip():
+        with profiled(page_label, "arama"):
+            started = time.perf_counter()
+            section_hits = content.search(query, SEARCH_LIMIT)
+            note_hits = st.session_state.notes.search(query, SEARCH_LIMIT)
+            # Özet dizini oturuma aittir; ilk aramada kurulur, eklemede güncellenir
+            if 'summary_index' not in st.session_state:
+                st.session_state.summary_index = summary_index(st.session_state.summaries)
+            summary_hits = st.session_state.summary_index.search(query, SEARCH_LIMIT)
+            elapsed = time.perf_counter() - started
+        
+        st.caption(f"{len(section_hits) + len(note_hits) + len(summary_hits)} sonuç • {elapsed * 1000:.1f} ms")
+        
+        tab1, tab2, tab3 = st.tabs([f"📚 Dersler ({len(section_hits)})", f"📝 Notlar ({len(note_hits)})",
+                                    f"📊 Özetler ({len(summary_hits)})"])
+        
+        with tab1:
+            if not section_hits:
+                st.info("Ders içeriğinde eşleşme yok.")
+            for _, hit, fields, words in section_hits:
+                position = content.page_position(hit['unit'], hit['page'])
+                if position is None:
+                    continue
+                hit_key = f"{hit['unit']}-{hit['page']}-{hit['section']}"
+                col1, col2 = st.columns([5, 1])
+                with col1:
+                    st.markdown(f"**Ünite {hit['unit']}: {hit['unit_title']} • Sayfa {position}**"
+                                + (f" — {fields['title']}" if fields['title'] else ""))
+                    st.caption(snippet(fields['content'] or fields['description'], words))
+                with col2:
+                    # Bölüm, uzun sayfalarda katlanmış olsa da açık gelir
+                    st.button("Git", key=f"goto_{hit_key}", on_click=st.session_state.update, kwargs={
+                        "menu": "📚 Dersler", "selected_unit": hit['unit'], "current_page": position,
+                        f"open_{hit_key}": True,
+                    })
+        
+        with tab2:
+            if not note_hits:
+                st.info("Notlarda eşleşme yok.")
+            for _, hit, fields, words in note_hits:
+                # Notlar sayfa numarasıyla tutulur; gezinme sayfanın ünitedeki sırasıyla yapılır
+                hit_key = f"{hit['unit']}-{hit['page']}-{hit['section']}"
+                position = content.page_position(hit['unit'], hit['page'])
+                col1, col2 = st.columns([5, 1])
+                with col1:
+                    st.markdown(f"**Ünite {hit['unit']} • Sayfa {position or hit['page']}** • {hit['date']}")
+                    st.caption(snippet(fields['content'], words))
+                with col2:
+                    if position is not None:
+                        st.button("Git", key=f"goto_note_{hit['id']}", on_click=st.session_state.update, kwargs={
+                            "menu": "📚 Dersler", "selected_unit": hit['unit'], "current_page": position,
+                            f"open_{hit_key}": True, f"show_note_{hit_key}": True,
+                        })
+        
+        with tab3:
+            if not summary_hits:
+                st.info("Özetlerde eşleşme yok.")
+            for _, hit, fields, words in summary_hits:
+                with st.expander(fields['title'] or "Özet"):
+                    st.write(st.session_state.summaries[hit['position']].get('summary', ''))
+
 # ========================
 # AYARLAR SAYFASI
 # ========================
 elif menu == "⚙️ Ayarlar":
     st.header("⚙️ Ayarlar")
     
-    tab1, tab2, tab3 = st.tabs(["📥 Veri Yükleme", "💾 Veri Yedekleme", "➕ Yeni Sayfa Ekle"])
+    tab1, tab2, tab3, tab4, tab5, tab6 = st.tabs(["📥 Veri Yükleme", "💾 Veri Yedekleme", "🖨️ Dışa Aktar", "➕ Yeni Sayfa Ekle", "🚀 Performans", "⏱️ Profil"])
     
     with tab1:
         st.subheader("📥 JSON Verisi Yükle")
-        uploaded_file = st.file_uploader("JSON dosyası seçin:", type=['json'])
+        uploaded_file = st.file_uploader("JSON dosyası seçin:", type=['json', 'gz'])
         
+        # Dosya yalnızca butona basıldığında akış halinde okunur
         if uploaded_file is not None:
-            try:
-                data = json.load(uploaded_file)
+            st.caption(f"{uploaded_file.name} • {uploaded_file.size / 1024:.1f} KB")
+            
+            if st.button("Verileri Yükle", type="primary"):
+                progress = st.progress(0.0, text="İçe aktarılıyor...")
+                
+                def show_progress(fraction, report):
+                    imported = ", ".join(f"{count} {name}" for name, count in report['imported'].items())
+                    progress.progress(fraction, text=f"İçe aktarılıyor... {imported}")
                 
-                if st.button("Verileri Yükle", type="primary"):
-                    if 'lessons' in data:
-                        st.session_state.lessons = data['lessons']
-                    if 'tests' in data:
-                        st.session_state.tests = data['tests']
-                    if 'notes' in data:
-                        st.session_state.notes = data['notes']
-                    if 'summaries' in data:
-                        st.session_state.summaries = data['summaries']
+                try:
+                    report = stream_import(depo, uploaded_file, show_progress, st.session_state.user)
+                except Exception as e:
+                    progress.empty()
+                    st.error(f"❌ Hata: Geçersiz JSON dosyası! ({e})")
+                else:
+                    if 'lessons' in report['collections'] or 'tests' in report['collections']:
+                        # Paylaşılan içerik tüm oturumlar için yeniden okunur
+                        content.invalidate()
+                        plan_cache.clear()
+                        st.session_state.selected_unit = None
+                        st.session_state.selected_test = None
+                    if 'notes' in report['collections']:
+                        st.session_state.notes = NoteStore.from_depo(depo, st.session_state.user)
+                    if 'summaries' in report['collections']:
+                        st.session_state.summaries = depo.load_summaries()
+                        st.session_state.pop('summary_index', None)
                     
-                    st.success("✅ Veriler başarıyla yüklendi!")
+                    st.session_state.import_report = report
                     st.rerun()
-            except:
-                st.error("❌ Hata: Geçersiz JSON dosyası!")
+        
+        report = st.session_state.get('import_report')
+        if report:
+            imported = ", ".join(f"{count} {name}" for name, count in report['imported'].items())
+            if report['delta']:
+                st.success(f"✅ Artımlı yedek birleştirildi: {imported}")
+            else:
+                st.success(f"✅ Veriler başarıyla yüklendi: {imported}")
+            if report['errors']:
+                st.warning(f"⚠️ {len(report['errors'])} hatalı kayıt atlandı:")
+                st.dataframe(report['errors'], use_container_width=True, hide_index=True)
     
     with tab2:
         st.subheader("💾 Verileri Yedekle")
         
-        backup_data = {
-            "lessons": st.session_state.lessons,
-            "tests": st.session_state.tests,
-            "notes": st.session_state.notes,
-            "summaries": st.session_state.summaries,
-            "export_date": datetime.now().isoformat()
-        }
+        col1, col2 = st.columns(2)
+        with col1:
+            backup_kind = st.radio(
+                "Yedek türü:",
+                options=["full", "delta"],
+                format_func=lambda x: "Tam yedek" if x == "full" else "Artımlı (son yedekten beri)",
+                horizontal=True
+            )
+        with col2:
+            compress_backup = st.checkbox("gzip ile sıkıştır", value=True)
         
-        json_str = json.dumps(backup_data, ensure_ascii=False, indent=2)
+        # Yedekte içerikle birlikte yalnızca bu oturumun kullanıcısının notları bulunur
+        last_seq = depo.last_backup_seq(st.session_state.user)
+        if last_seq is None:
+            st.caption("Henüz yedek alınmadı; artımlı yedek yerine tam yedek hazırlanır")
+        else:
+            st.caption(f"Son yedekten beri {depo.count_changes_since(last_seq, st.session_state.user)} değişiklik")
         
-        st.download_button(
-            label="📥 JSON İndir",
-            data=json_str,
-            file_name=f"mikro_econ_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json",
-            mime="application/json",
-            type="primary"
-        )
+        # Yedek yalnızca istendiğinde oluşturulur
+        if st.button("📦 Yedeği Hazırla"):
+            st.session_state.backup_file = build_backup(
+                depo, st.session_state.user, delta=backup_kind == "delta", compress=compress_backup
+            )
+        
+        backup_file = st.session_state.get('backup_file')
+        if backup_file:
+            st.download_button(
+                label="📥 Yedeği İndir",
+                data=backup_file['data'],
+                file_name=backup_file['file_name'],
+                mime=backup_file['mime'],
+                type="primary",
+                on_click=depo.mark_backup,
+                args=(backup_file['seq'], st.session_state.user)
+            )
+            st.caption(f"{backup_file['file_name']} • {len(backup_file['data']) / 1024:.1f} KB")
         
-        total_notes = sum(len(notes) for notes in st.session_state.notes.values())
-        st.info(f"📊 İstatistikler:\n- {len(st.session_state.lessons)} Ünite\n- {len(st.session_state.tests)} Test\n- {total_notes} Not\n- {len(st.session_state.summaries)} Özet")
+        # Not ve özet sayıları oturumun kendi depolarından okunur; notlar yedekteki notlarla aynıdır
+        notes = st.session_state.notes
+        st.info(f"📊 İstatistikler:\n- {len(content.units())} Ünite\n- {content.page_total} Sayfa\n- {len(content.tests())} Test\n- {len(notes)} Not\n- {len(st.session_state.summaries)} Özet")
+        with st.expander("Ünite bazında"):
+            unit_pages = content.unit_pages()
+            st.dataframe([
+                {"Ünite": unit_num, "Sayfa": unit_pages.get(unit_num, 0), "Not": notes.count_for_unit(unit_num)}
+                for unit_num in sorted(unit_pages.keys() | set(notes.units()))
+            ], use_container_width=True, hide_index=True)
     
     with tab3:
+        st.subheader("🖨️ Ders Notu Olarak Dışa Aktar")
+        st.caption(
+            "Seçilen ünitelerin tüm sayfaları tek bir HTML dosyasına yazılır: metinler, formüller ve "
+            "grafikler varsayılan parametreleriyle; dosya internet bağlantısı olmadan açılır. PDF için dosyayı tarayıcıda açıp Yazdır → PDF olarak kaydet."
+        )
+        
+        unit_titles = {unit['unit_number']: unit['unit_title'] for unit in content.units()}
+        export_units_selected = st.multiselect(
+            "Üniteler:",
+            options=list(unit_titles),
+            format_func=lambda x: f"Ünite {x}: {unit_titles[x]}"
+        )
+        include_notes = st.checkbox("Notlarımı ekle", value=True)
+        
+        if st.button("📄 HTML Oluştur", disabled=not export_units_selected):
+            from modules.disa_aktar import export_units
+            progress = st.progress(0.0, text="Grafikler çiziliyor...")
+            st.session_state.export_file = export_units(
+                content, export_units_selected,
+                notes=st.session_state.notes if include_notes else None,
+                on_progress=lambda fraction: progress.progress(fraction, text="Grafikler çiziliyor...")
+            )
+            progress.empty()
+        
+        export_file = st.session_state.get('export_file')
+        if export_file:
+            st.download_button(
+                label="📥 HTML İndir",
+                data=export_file['data'],
+                file_name=export_file['file_name'],
+                mime=export_file['mime'],
+                type="primary"
+            )
+            st.caption(
+                f"{export_file['file_name']} • {len(export_file['data']) / 1024:.1f} KB • "
+                f"{export_file['graphs']} grafik, {export_file['render_seconds']:.1f} sn"
+            )
+            if export_file['missing']:
+                st.warning(f"{export_file['missing']} grafik zaman aşımı nedeniyle eklenemedi.")
+    
+    with tab4:
         st.subheader("➕ Yeni Sayfa Ekle")
         
         st.markdown("""
@@ -579,7 +769,8 @@ elif menu == "⚙️ Ayarlar":
         }
         ```
         
-        **Not:** Aynı ünite başlığı varsa sayfa o üniteye eklenir, yoksa yeni ünite oluşturulur.
+        **Not:** Aynı ünite numarası varsa sayfa o üniteye eklenir, yoksa yeni ünite oluşturulur.
+        Birden çok sayfayı tek seferde eklemek için bu nesnelerden oluşan bir liste girin.
         """)
         
         json_input = st.text_area(
@@ -587,67 +778,209 @@ elif menu == "⚙️ Ayarlar":
             height=300,
             placeholder='{"unit_number": 1, "unit_title": "...", "page_number": 2, "sections": [...]}'
         )
+        replace_pages = st.checkbox("Aynı numaralı sayfaların üzerine yaz", value=False)
         
         if st.button("Sayfa Ekle", type="primary"):
             try:
                 new_page_data = json.loads(json_input)
-                
-                # Zorunlu alanları kontrol et
-                if 'unit_number' not in new_page_data:
-                    st.error("❌ 'unit_number' alanı zorunludur!")
-                    st.stop()
-                if 'unit_title' not in new_page_data:
-                    st.error("❌ 'unit_title' alanı zorunludur!")
-                    st.stop()
-                if 'page_number' not in new_page_data:
-                    st.error("❌ 'page_number' alanı zorunludur!")
-                    st.stop()
-                if 'sections' not in new_page_data:
-                    st.error("❌ 'sections' alanı zorunludur!")
-                    st.stop()
-                
-                unit_num = new_page_data['unit_number']
-                unit_title = new_page_data['unit_title']
-                page_num = new_page_data['page_number']
-                sections = new_page_data['sections']
-                
-                # Ünite var mı kontrol et
-                existing_unit = next((l for l in st.session_state.lessons if l['unit_number'] == unit_num), None)
-                
-                if existing_unit:
-                    # Mevcut üniteye sayfa ekle
-                    existing_unit['pages'].append({
-                        "page_number": page_num,
-                        "sections": sections
-                    })
-                    # Sayfa numarasına göre sırala
-                    existing_unit['pages'].sort(key=lambda x: x['page_number'])
+            except Exception as e:
+                st.error(f"❌ Geçersiz JSON formatı! Hata: {str(e)}")
+                st.stop()
+            
+            new_pages = new_page_data if isinstance(new_page_data, list) else [new_page_data]
+            
+            # Zorunlu alanları ve bölümleri kontrol et
+            errors = []
+            for idx, page_data in enumerate(new_pages, 1):
+                prefix = f"Kayıt {idx}: " if len(new_pages) > 1 else ""
+                errors.extend(prefix + error for error in validate_new_page(page_data))
+            if errors:
+                for error in errors:
+                    st.error(f"❌ {error}")
+                st.stop()
+            
+            # Sayfalar tek işlemde yazılır; paylaşılan dizin yerinde güncellenir
+            try:
+                result = content.add_pages(new_pages, replace=replace_pages)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                st.stop()
+            
+            if len(new_pages) == 1:
+                page_data = new_pages[0]
+                unit_num, page_num = page_data['unit_number'], page_data['page_number']
+                if result['replaced']:
+                    st.success(f"✅ Ünite {unit_num}, Sayfa {page_num} güncellendi!")
+                elif not result['new_units']:
                     st.success(f"✅ Sayfa {page_num}, Ünite {unit_num}'e eklendi!")
                 else:
-                    # Yeni ünite oluştur
-                    st.session_state.lessons.append({
-                        "unit_number": unit_num,
-                        "unit_title": unit_title,
-                        "pages": [
-                            {
-                                "page_number": page_num,
-                                "sections": sections
-                            }
-                        ]
-                    })
                     st.success(f"✅ Yeni ünite ({unit_num}) ve sayfa ({page_num}) eklendi!")
-                
-                st.rerun()
-            except Exception as e:
-                st.error(f"❌ Geçersiz JSON formatı! Hata: {str(e)}")
+            else:
+                st.success(
+                    f"✅ {result['added']} sayfa eklendi, {result['replaced']} sayfa güncellendi, "
+                    f"{len(result['new_units'])} yeni ünite oluşturuldu!"
+                )
+            
+            st.rerun()
+
+    with tab5:
+        if not CONFIG['admin']:
+            st.caption("Çizim modu dışındaki ayarlar tüm kullanıcıları etkiler ve salt okunurdur; değiştirmek için uygulamayı MIKRO_ADMIN=1 ile başlatın.")
+        
+        st.subheader("🖼️ Grafik Çizim Modu")
+        
+        render_modes = {"png": "Sunucu (matplotlib PNG)", "vector": "Tarayıcı (vektör grafik)"}
+        # Seçim yalnızca bu oturumun grafiklerini etkiler; başlangıç değeri MIKRO_RENDER_MODE
+        st.session_state.render_mode = st.radio(
+            "Çizim modu:",
+            options=list(render_modes),
+            format_func=lambda x: render_modes[x],
+            index=list(render_modes).index(st.session_state.render_mode),
+            horizontal=True
+        )
+        
+        mode_rows = []
+        for mode, stats in RENDER_STATS.items():
+            renders = stats['renders']
+            mode_rows.append({
+                "Mod": render_modes[mode],
+                "Çizim": renders,
+                "Ort. sunucu süresi (ms)": round(stats['seconds'] / renders * 1000, 1) if renders else 0.0,
+                "Ort. boyut (KB)": round(stats['bytes'] / renders / 1024, 1) if renders else 0.0,
+                "Toplam (MB)": round(stats['bytes'] / (1024 * 1024), 2),
+            })
+        st.dataframe(mode_rows, use_container_width=True, hide_index=True)
+        
+        st.markdown("---")
+        st.subheader("🚀 Grafik Önbelleği")
+        
+        cache_stats = figure_cache.stats()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Kayıt", cache_stats['entries'])
+        col2.metric("Boyut", f"{cache_stats['bytes'] / (1024 * 1024):.1f} MB")
+        col3.metric("İsabet / Iska", f"{cache_stats['hits']} / {cache_stats['misses']}")
+        col4.metric("İsabet Oranı", f"{cache_stats['hit_rate'] * 100:.0f}%")
+        st.caption(f"Çıkarılan kayıt: {cache_stats['evictions']}")
+        
+        if st.button("🧹 Önbelleği Temizle"):
+            figure_cache.clear()
+            st.rerun()
+        
+        st.markdown("---")
+        st.subheader("♻️ Figür Havuzu")
+        st.caption("Tek senaryolu grafiklerde figür bir kez kurulur; slider değişince yalnızca veriler güncellenir.")
+        
+        config_input(st.checkbox, 'figure_pool', "Figür havuzunu etkinleştir", value=CONFIG['figure_pool'])
+        figure_pool_stats = pool_stats()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("Boşta figür", f"{figure_pool_stats['idle']} ({figure_pool_stats['layouts']} düzen)")
+        col2.metric("Kurulan", figure_pool_stats['built'])
+        col3.metric("Yeniden kullanılan", figure_pool_stats['reused'])
+        
+        st.markdown("---")
+        st.subheader("🏭 Çizim Havuzu")
+        st.caption(
+            "PNG grafikler sınırlı bir çizim havuzunda çizilir; kuyruk dolunca yeni istekler bekletilir, "
+            "süre aşılırsa grafik yerine uyarı gösterilir. 0 işçi: çizim oturumun içinde yapılır."
+        )
+        render_stats = render_pool.stats()
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            config_input(st.number_input, 'render_workers', "İşçi sayısı", 0, 32, CONFIG['render_workers'])
+        with col2:
+            config_input(st.number_input, 'render_queue', "İşçi başına kuyruk", 1, 64, CONFIG['render_queue'])
+        with col3:
+            config_input(st.number_input, 'render_timeout', "Zaman aşımı (sn)", 1.0, 300.0, CONFIG['render_timeout'], 1.0)
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("İşçi", render_stats['workers'])
+        col2.metric("Süren çizim", render_stats['inflight'])
+        col3.metric("Reddedilen", render_stats['rejected'])
+        col4.metric("Zaman aşımı", render_stats['timeouts'])
+        
+        st.markdown("---")
+        st.subheader("🔥 Ön Isıtma")
+        st.caption("Grafik bölümü açıldığında slider değerlerinin çevresi arka planda çizilir.")
+        
+        config_input(st.checkbox, 'warmup_enabled', "Ön ısıtmayı etkinleştir", value=CONFIG['warmup_enabled'])
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            config_input(st.number_input, 'warmup_budget', "Bütçe (grafik)", 10, 5000, CONFIG['warmup_budget'], 10)
+        with col2:
+            config_input(st.number_input, 'warmup_radius', "Komşuluk (adım)", 1, 50, CONFIG['warmup_radius'])
+        with col3:
+            config_input(st.number_input, 'warmup_workers', "İşçi sayısı", 1, 16, CONFIG['warmup_workers'])
+        st.caption(f"Kuyrukta bekleyen: {pending_count()}")
+        
+        st.markdown("---")
+        st.subheader("🧩 Bölüm Yalıtımı")
+        st.caption(
+            "Grafik bölümleri ve not panelleri kendi widget'ları değişince tek başına yeniden çalışır; "
+            "sayfanın geri kalanı yeniden çizilmez."
+        )
+        if _fragment is None:
+            st.info(f"Streamlit {st.__version__} bölüm yalıtımını desteklemiyor (1.33+ gerekir); tüm sayfa yeniden çalışır.")
+        config_input(st.checkbox, 'isolate_sections', "Bölüm yalıtımını etkinleştir", value=CONFIG['isolate_sections'],
+                     disabled=_fragment is None)
+
+    with tab6:
+        st.subheader("⏱️ Aşama Profili")
+        st.caption(
+            "Her yeniden çalıştırmada oturum başlatma, kenar çubuğu, sayfa bölümleri (türüne göre), "
+            "not paneli ve alt bilgi süreleri ölçülür. PNG grafiklerde figür oluşturma ile PNG "
+            "kodlama ayrı kaydedilir. Son ölçümler sayfa ve aşama başına tutulur."
+        )
+        
+        # Ölçümler tüm oturumlarda toplanır; açma, temizleme ve indirme yöneticiye açıktır
+        if not CONFIG['admin']:
+            st.caption("Profil ayarı ve ölçümler tüm kullanıcılarda ortaktır; değiştirmek için uygulamayı MIKRO_ADMIN=1 ile başlatın.")
+        config_input(st.checkbox, 'profiling_enabled', "Profili etkinleştir", value=CONFIG['profiling_enabled'])
+        
+        profile_rows = render_profiler.summary()
+        if not profile_rows:
+            st.info("Henüz ölçüm yok. Profili etkinleştirip ders sayfalarında gezinin.")
+        else:
+            st.dataframe(profile_rows, use_container_width=True, hide_index=True)
+            
+            stage_options = [(row['Sayfa'], row['Aşama']) for row in profile_rows]
+            selected_stage = st.selectbox(
+                "Histogram:",
+                stage_options,
+                format_func=lambda option: f"{option[0]} • {option[1]}"
+            )
+            counts = render_profiler.histogram(*selected_stage)
+            # Kovalar alfabetik değil, süre sırasıyla gösterilir
+            st.vega_lite_chart({
+                "data": {"values": [{"Süre": label, "Adet": count} for label, count in zip(BUCKET_LABELS, counts)]},
+                "mark": "bar",
+                "encoding": {
+                    "x": {"field": "Süre", "type": "ordinal", "sort": None},
+                    "y": {"field": "Adet", "type": "quantitative"},
+                },
+            }, use_container_width=True)
+            
+            if CONFIG['admin']:
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.download_button(
+                        label="📥 Profili İndir (JSON)",
+                        data=json.dumps(render_profiler.export(), ensure_ascii=False, indent=2),
+                        file_name="mikro_profil.json",
+                        mime="application/json"
+                    )
+                with col2:
+                    if st.button("🧹 Ölçümleri Temizle"):
+                        render_profiler.clear()
+                        st.rerun()
 
 # Footer
-st.sidebar.markdown("---")
-total_pages = sum(len(lesson['pages']) for lesson in st.session_state.lessons)
-total_notes = sum(len(notes) for notes in st.session_state.notes.values())
-st.sidebar.info(f"""
+with profiled(page_label, "alt bilgi"):
+    st.sidebar.markdown("---")
+    st.sidebar.info(f"""
 **📈 Mikro Ekonomi Lab v3.0**  
-✅ {len(st.session_state.lessons)} Ünite  
-✅ {total_pages} Sayfa  
-✅ {total_notes} Not
+✅ {len(content.units())} Ünite  
+✅ {content.page_total} Sayfa  
+✅ {len(st.session_state.notes)} Not
 """)
+
+if CONFIG['profiling_enabled']:
+    render_profiler.record(page_label, "toplam", time.perf_counter() - rerun_started)
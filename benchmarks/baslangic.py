@@ -0,0 +1,101 @@
+"""Soğuk başlangıç ölçümü: içe aktarma süreleri ve ilk grafik gecikmesi
+
+Her ölçüm yeni bir Python sürecinde yapılır; böylece ölçekleme sonrası açılan
+boş bir konteynerdeki durum taklit edilir.
+
+    python benchmarks/baslangic.py --runs 5 --output baslangic.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Her senaryo ayrı bir süreçte çalışır ve ölçtüğü süreleri JSON olarak yazar
+SCENARIOS = {
+    # app.py'nin en üstte içe aktardıkları (matplotlib / numpy hariç olmalı)
+    "app_imports": """
+t = time.perf_counter()
+import streamlit
+t_st = time.perf_counter()
+import modules.baslatma, modules.depo, modules.grafik_turleri, modules.icerik, modules.ice_aktar
+import modules.notlar, modules.onbellek, modules.onizleme, modules.sema, modules.yedek
+done = time.perf_counter()
+result = {"streamlit": t_st - t, "modules": done - t_st,
+          "plotting_loaded": "matplotlib.pyplot" in sys.modules}
+""",
+    # Isıtma olmadan ilk grafik: içe aktarma + yazı tipleri + çizim kullanıcının yolunda
+    "first_render_cold": """
+from modules.onbellek import draw_png
+t = time.perf_counter()
+draw_png("budget_constraint", {"R1": 100, "R2": 80, "j12": 0.1})
+first = time.perf_counter()
+draw_png("budget_constraint", {"R1": 101, "R2": 80, "j12": 0.1})
+result = {"first_render": first - t, "second_render": time.perf_counter() - first}
+""",
+    # Arka uç önceden ısıtıldıktan sonra ilk grafik
+    "first_render_warm": """
+from modules.baslatma import STARTUP_STATS, prewarm
+from modules.onbellek import draw_png
+prewarm()
+t = time.perf_counter()
+draw_png("budget_constraint", {"R1": 100, "R2": 80, "j12": 0.1})
+result = {"plotting_import": STARTUP_STATS["import_seconds"],
+          "prewarm": STARTUP_STATS["prewarm_seconds"],
+          "first_render": time.perf_counter() - t}
+""",
+}
+
+PRELUDE = "import json, sys, time\nsys.path.insert(0, %r)\n" % ROOT
+EPILOGUE = "\nprint(json.dumps(result))\n"
+
+
+def run_scenario(code):
+    output = subprocess.run(
+        [sys.executable, "-c", PRELUDE + code + EPILOGUE],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def summarize(samples):
+    """Her ölçüm için medyan ve en küçük değer"""
+    summary = {}
+    for name in samples[0]:
+        values = [sample[name] for sample in samples]
+        if isinstance(values[0], bool):
+            summary[name] = all(values)
+        else:
+            summary[name] = {"median": statistics.median(values), "min": min(values)}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3, help="senaryo başına süreç sayısı")
+    parser.add_argument("--output", help="JSON raporunun yazılacağı dosya")
+    args = parser.parse_args()
+
+    report = {"python": sys.version.split()[0], "runs": args.runs, "scenarios": {}}
+    for name, code in SCENARIOS.items():
+        samples = [run_scenario(code) for _ in range(args.runs)]
+        report["scenarios"][name] = summarize(samples)
+
+    for name, summary in report["scenarios"].items():
+        print(name)
+        for metric, value in summary.items():
+            if isinstance(value, dict):
+                print(f"  {metric:<18} {value['median'] * 1000:8.1f} ms (min {value['min'] * 1000:.1f})")
+            else:
+                print(f"  {metric:<18} {value}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Ölçümler için yedek dosyası biçiminde sentetik veri üretici"""
+import random
+
+from modules.grafik_turleri import GRAPH_SLIDERS
+from modules.notlar import note_key
+
+
+def synthetic_lesson(unit_number, pages, rng):
+    """Her sayfada metin, formül ve grafik bölümü olan bir ünite"""
+    graph_types = sorted(GRAPH_SLIDERS)
+    lesson = {"unit_number": unit_number, "unit_title": f"Sentetik Ünite {unit_number}", "pages": []}
+    for page_number in range(1, pages + 1):
+        graph_type = graph_types[(unit_number + page_number) % len(graph_types)]
+        params = {
+            name: rng.choice([lo, default, hi]) if isinstance(step, int) else default
+            for name, _, lo, hi, default, step in GRAPH_SLIDERS[graph_type]
+        }
+        lesson["pages"].append({
+            "page_number": page_number,
+            "sections": [
+                {"id": "s1", "type": "text",
+                 "content": f"**Sayfa {page_number}.** " + "Tüketici seçimi ve bütçe kısıtı. " * rng.randint(5, 40)},
+                {"id": "s2", "type": "formula", "content": r"C_1 + \frac{C_2}{1+j_{12}} = R_1 + \frac{R_2}{1+j_{12}}"},
+                {"id": "s3", "type": "graph", "graph_type": graph_type, "title": "Grafik",
+                 "description": "Sentetik grafik", "params": params},
+            ],
+        })
+    return lesson
+
+
+def synthetic_test(test_id, questions, rng):
+    return {
+        "id": test_id,
+        "unit": f"Ünite {test_id}",
+        "questions": [
+            {
+                # Tek numaralı testlerde içe aktarılan bankalardaki gibi sayısal id'ler
+                "id": idx if test_id % 2 else f"q{idx}",
+                "type": "multiple",
+                "question": f"Soru {idx}: faiz oranı artarsa ne olur?",
+                "options": ["Artar", "Azalır", "Değişmez", "Belirsiz"],
+                "correct": rng.randrange(4),
+            }
+            for idx in range(1, questions + 1)
+        ],
+    }
+
+
+def synthetic_dataset(units, pages, notes, tests, questions=10, seed=0):
+    """units x pages sayfa, rastgele bölümlere dağıtılmış notes not ve tests test"""
+    rng = random.Random(seed)
+    data = {
+        "lessons": [synthetic_lesson(unit_num, pages, rng) for unit_num in range(1, units + 1)],
+        "tests": [synthetic_test(test_id, questions, rng) for test_id in range(1, tests + 1)],
+        "notes": {},
+        "summaries": [{"unit": f"Ünite {unit_num}", "summary": "Sentetik özet"} for unit_num in range(1, units + 1)],
+    }
+    base_id = 1_700_000_000.0
+    for idx in range(notes):
+        key = note_key(rng.randint(1, units), rng.randint(1, pages), rng.choice(["s1", "s2", "s3"]))
+        data["notes"].setdefault(key, []).append({
+            "id": base_id + idx,
+            "text": f"Sentetik not {idx}",
+            "date": "01.01.2024 12:00",
+        })
+    return data
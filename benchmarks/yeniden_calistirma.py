@@ -0,0 +1,188 @@
+"""app.py yeniden çalıştırma (rerun) süresi ölçümü: Streamlit AppTest ile başsız
+
+Her veri boyutu (N ünite, M sayfa, K not, T test) ayrı bir süreçte, geçici bir
+SQLite deposuyla ölçülür. Her menü sayfası için duvar saati süreleri ve
+tracemalloc tepe belleği raporlanır.
+
+    python benchmarks/yeniden_calistirma.py --dataset 20,10,2000,20 --output rerun.json
+    python benchmarks/yeniden_calistirma.py --compare eski.json --output yeni.json
+"""
+import argparse
+import itertools
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (ünite, sayfa, not, test)
+DEFAULT_DATASETS = ["3,5,50,3", "20,10,2000,20", "100,20,20000,100"]
+
+MENU = {
+    "dersler": "📚 Dersler",
+    "test": "🧪 Test & Sorular",
+    "notlarim": "📝 Notlarım",
+    "ozetler": "📊 Özetler",
+    "ayarlar": "⚙️ Ayarlar",
+}
+
+
+def _timed(action):
+    started = time.perf_counter()
+    action()
+    return time.perf_counter() - started
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def measure(at, navigate, rerun, runs):
+    """Sayfaya geçiş süresi, ardından runs kez yeniden çalıştırma ve tepe bellek"""
+    first = _timed(navigate)
+    if at.exception:
+        raise RuntimeError(str(at.exception))
+    times = [_timed(rerun) for _ in range(runs)]
+    tracemalloc.start()
+    rerun()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "first": first,
+        "median": statistics.median(times),
+        "p95": _percentile(times, 0.95),
+        "max": max(times),
+        "peak_alloc_kb": peak / 1024,
+    }
+
+
+def run_child(spec, runs):
+    """Tek bir veri boyutunu bu süreçte ölçer ve sonucu JSON olarak yazar"""
+    units, pages, notes, tests = (int(part) for part in spec.split(","))
+    os.environ["MIKRO_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "bench.db")
+    os.environ.setdefault("MIKRO_WARMUP", "0")
+    os.environ.setdefault("MIKRO_PREWARM", "0")
+    # Sentetik notların sahibi yok; ölçülen oturum hepsini yüklesin
+    os.environ.setdefault("MIKRO_USER", "")
+    os.chdir(ROOT)
+    sys.path.insert(0, ROOT)
+
+    from streamlit.testing.v1 import AppTest
+
+    from benchmarks.sentetik import synthetic_dataset
+    from modules.depo import get_depo
+
+    seed_seconds = _timed(lambda: get_depo().replace_all(synthetic_dataset(units, pages, notes, tests)))
+
+    at = AppTest.from_file("app.py", default_timeout=600)
+    startup = _timed(at.run)
+    results = {}
+
+    def menu(name):
+        # Menü her seferinde güncel ağaçtan alınır; eski ağaç kaybolmuş widget'ları taşır
+        return lambda: at.sidebar.radio[0].set_value(MENU[name]).run()
+
+    results["dersler"] = measure(at, menu("dersler"), at.run, runs)
+    results["ders_detay"] = measure(at, lambda: at.button(key="open_unit_1").click().run(), at.run, runs)
+
+    # Her yeniden çalıştırmada slider değişir; önbellekte olmayan bir grafik çizilir
+    slider = at.slider[0]
+    steps = int(round((slider.max - slider.min) / slider.step))
+    values = itertools.cycle(type(slider.value)(slider.min + slider.step * idx) for idx in range(1, steps + 1))
+    results["ders_detay_slider"] = measure(
+        at, lambda: None, lambda: at.slider[0].set_value(next(values)).run(), runs
+    )
+
+    for name in ("test", "notlarim", "ozetler", "ayarlar"):
+        results[name] = measure(at, menu(name), at.run, runs)
+
+    return {
+        "dataset": {"units": units, "pages": pages, "notes": notes, "tests": tests},
+        "seed_seconds": seed_seconds,
+        "startup_seconds": startup,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "pages": results,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old, new):
+    """Aynı veri boyutları için sayfa medyanlarının oranını yazdırır"""
+    old_by_size = {json.dumps(item["dataset"], sort_keys=True): item for item in old["datasets"]}
+    for item in new["datasets"]:
+        previous = old_by_size.get(json.dumps(item["dataset"], sort_keys=True))
+        if previous is None:
+            continue
+        print(f"{item['dataset']} ({old.get('commit')} -> {new.get('commit')})")
+        for page, result in item["pages"].items():
+            if page in previous["pages"]:
+                before = previous["pages"][page]["median"]
+                print(f"  {page:<18} {before * 1000:8.1f} -> {result['median'] * 1000:8.1f} ms "
+                      f"({result['median'] / before:.2f}x)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--dataset", action="append",
+                        help="ünite,sayfa,not,test (birden çok verilebilir)")
+    parser.add_argument("--runs", type=int, default=5, help="sayfa başına yeniden çalıştırma sayısı")
+    parser.add_argument("--output", help="JSON raporunun yazılacağı dosya")
+    parser.add_argument("--compare", help="karşılaştırılacak önceki JSON raporu")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_child(args.child, args.runs)))
+        return
+
+    import streamlit
+
+    report = {
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "streamlit": streamlit.__version__,
+        "runs": args.runs,
+        "datasets": [],
+    }
+    for spec in args.dataset or DEFAULT_DATASETS:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", spec, "--runs", str(args.runs)],
+            capture_output=True, text=True,
+        )
+        if completed.returncode != 0:
+            sys.exit(completed.stderr)
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        report["datasets"].append(result)
+
+        print(f"{result['dataset']} • başlangıç {result['startup_seconds'] * 1000:.0f} ms • "
+              f"RSS {result['max_rss_mb']:.0f} MB")
+        for page, stats in result["pages"].items():
+            print(f"  {page:<18} medyan {stats['median'] * 1000:8.1f} ms  p95 {stats['p95'] * 1000:8.1f} ms  "
+                  f"tepe {stats['peak_alloc_kb']:8.0f} KB")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(json.load(f), report)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""Eşzamanlı oturum yük testi: websocket üzerinden N öğrencinin gezintisi
+
+Her oturum sayısı için geçici bir SQLite deposuyla yeni bir `streamlit run app.py`
+süreci başlatılır. N oturum tarayıcının kullandığı websocket protokolüyle bağlanır
+ve aynı gezintiyi yapar: üniteyi aç, sonraki sayfaya geç, grafiğin slider'larını
+sürükle, not ekle, menüler arasında dolaş. Her yeniden çalıştırmanın gecikmesi
+(istek → script_finished), saniyedeki yeniden çalıştırma sayısı ve sunucu sürecinin
+yerleşik belleği (RSS, yalnızca Linux) raporlanır.
+
+    python benchmarks/yuk_testi.py --sessions 1,5,10,20 --output yuk.json
+    python benchmarks/yuk_testi.py --sessions 50 --dataset 20,10,2000,20 --think 1.0
+
+Yük üreteci sunucuyla aynı makinede çalışır; çok çekirdekli ölçümlerde
+sunucunun çekirdekleri ayrıca sınırlanmalıdır (ör. taskset).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (ünite, sayfa, not, test)
+DEFAULT_DATASET = "3,5,50,3"
+DEFAULT_SESSIONS = "1,5,10,20"
+
+MENU = ["📚 Dersler", "🧪 Test & Sorular", "📝 Notlarım", "📊 Özetler", "🔎 Ara", "⚙️ Ayarlar"]
+# Gezintinin dolaştığı menüler; sonunda derslere dönülür
+MENU_TOUR = ["🧪 Test & Sorular", "📝 Notlarım", "📊 Özetler", "📚 Dersler"]
+
+# Websocket mesajları ProtoBuf; widget kimlikleri "$$ID-<özet>-<anahtar>" biçimindedir
+WIDGET_TYPES = {"button", "slider", "radio", "text_area", "text_input", "checkbox", "selectbox",
+                "number_input", "multiselect", "toggle"}
+
+
+def _percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def _rss_mb(pid, field="VmRSS"):
+    """Sürecin yerleşik belleği (VmRSS) ya da tepe değeri (VmHWM), MB; /proc yoksa None"""
+    try:
+        with open(f"/proc/{pid}/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def seed_database(dataset):
+    """Sentetik veriyle doldurulmuş şablon depo; her yük düzeyi bunun bir kopyasıyla başlar"""
+    units, pages, notes, tests = (int(part) for part in dataset.split(","))
+    path = os.path.join(tempfile.mkdtemp(), "yuk.db")
+    os.environ["MIKRO_DB_PATH"] = path
+    sys.path.insert(0, ROOT)
+    from benchmarks.sentetik import synthetic_dataset
+    from modules.depo import get_depo
+    get_depo().replace_all(synthetic_dataset(units, pages, notes, tests))
+    return path
+
+
+def start_server(template):
+    """Şablon deponun kopyasıyla app.py'yi başlatır: (süreç, port)"""
+    env = dict(os.environ, MIKRO_DB_PATH=os.path.join(tempfile.mkdtemp(), "yuk.db"))
+    env.setdefault("MIKRO_WARMUP", "0")
+    # Sentetik notların sahibi yok; oturumlar tek kullanıcı olarak hepsini yükler
+    env.setdefault("MIKRO_USER", "")
+    # WAL kipindeki depo yedekleme API'siyle kopyalanır; dosya kopyası -wal içeriğini kaçırır
+    source, target = sqlite3.connect(template), sqlite3.connect(env["MIKRO_DB_PATH"])
+    try:
+        source.backup(target)
+    finally:
+        source.close()
+        target.close()
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless", "true",
+         "--server.port", str(port), "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as response:
+                if response.status == 200:
+                    return server, port
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("Sunucu 60 saniyede başlamadı")
+
+
+class Session:
+    """Tek bir tarayıcı oturumu: widget kimliklerini ağaçtan okur, widget durumlarını gönderir"""
+
+    def __init__(self, url, timeout):
+        self.url = url
+        self.timeout = timeout
+        self.ws = None
+        self.widgets = {}
+        self.values = {}
+        # Son tam çalıştırmada görülen anahtarlı widget'lar: [(anahtar, tür)]
+        self.page = []
+        self.latencies = []
+        self.errors = []
+
+    async def connect(self):
+        from tornado.websocket import websocket_connect
+        self.ws = await websocket_connect(self.url, max_message_size=256 * 1024 * 1024)
+
+    def _remember(self, element, fragment_id):
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors.append(f"istisna: {element.exception.message}")
+        if kind not in WIDGET_TYPES:
+            return
+        widget = getattr(element, kind)
+        key = widget.id.split("-", 2)[2] if widget.id.count("-") >= 2 else widget.id
+        info = (widget.id, widget, fragment_id)
+        if key != "None":
+            self.widgets[key] = info
+            self.page.append((key, kind))
+        # Anahtarsız widget'lar (ör. sayfa düğmeleri) etiketleriyle bulunur
+        self.widgets[f"label:{widget.label}"] = info
+
+    def find(self, prefix):
+        return next((info for key, info in self.widgets.items() if key.startswith(prefix)), None)
+
+    async def rerun(self, action, changes=(), fragment_id=""):
+        """Widget değişiklikleriyle yeniden çalıştırma ister ve bitmesini bekler"""
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        message = BackMsg()
+        client_state = message.rerun_script
+        client_state.query_string = ""
+        if fragment_id and "fragment_id" in type(client_state).DESCRIPTOR.fields_by_name:
+            client_state.fragment_id = fragment_id
+        triggers = []
+        for state in changes:
+            if state.trigger_value:
+                triggers.append(state)
+            else:
+                self.values[state.id] = state
+        # Tarayıcı gibi tüm bilinen değerler gönderilir; düğme tetikleri yalnızca bir kez
+        for state in list(self.values.values()) + triggers:
+            client_state.widget_states.widgets.add().CopyFrom(state)
+
+        if not fragment_id:
+            self.page = []
+        started = time.perf_counter()
+        await self.ws.write_message(message.SerializeToString(), binary=True)
+        while True:
+            raw = await asyncio.wait_for(self.ws.read_message(), self.timeout)
+            if raw is None:
+                raise ConnectionError("Sunucu bağlantıyı kapattı")
+            forward = ForwardMsg()
+            forward.ParseFromString(raw)
+            kind = forward.WhichOneof("type")
+            if kind == "delta" and forward.delta.WhichOneof("type") == "new_element":
+                self._remember(forward.delta.new_element, forward.delta.fragment_id)
+            elif kind == "script_finished":
+                self.latencies.append((action, time.perf_counter() - started))
+                return
+
+    async def click(self, action, name):
+        info = self.widgets.get(name) or self.find(name)
+        if info is None:
+            self.errors.append(f"widget bulunamadı: {name}")
+            return
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        state = WidgetState(id=info[0], trigger_value=True)
+        await self.rerun(action, [state], info[2])
+
+    async def set_value(self, action, name, **value):
+        info = self.widgets.get(name) or self.find(name)
+        if info is None:
+            self.errors.append(f"widget bulunamadı: {name}")
+            return
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+        state = WidgetState(id=info[0])
+        for field, item in value.items():
+            if field == "double_array_value":
+                state.double_array_value.data[:] = item
+            else:
+                setattr(state, field, item)
+        await self.rerun(action, [state], info[2])
+
+    async def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+
+def _slider_values(widget, count, rng):
+    steps = int(round((widget.max - widget.min) / widget.step))
+    return [widget.min + widget.step * rng.randint(0, steps) for _ in range(count)]
+
+
+async def journey(session, rng, drags, think):
+    """Bir öğrencinin gezintisi; her adım bir yeniden çalıştırmadır"""
+    async def pause():
+        if think:
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * think)
+
+    await session.rerun("açılış")
+    await pause()
+    await session.click("ünite aç", "open_unit_1")
+    await pause()
+    await session.click("sayfa geçişi", "label:Sonraki Sayfa ➡️")
+    await pause()
+
+    # Sayfadaki grafiğin slider'ları (ör. r1_1-2-s3, j12_1-2-s3) sırayla sürüklenir
+    for name in [key for key, kind in session.page if kind == "slider"]:
+        for value in _slider_values(session.widgets[name][1], drags, rng):
+            await session.set_value("slider", name, double_array_value=[value])
+            await pause()
+
+    toggles = [key for key, _ in session.page if key.startswith("note_toggle_")]
+    if toggles:
+        note_key = toggles[-1][len("note_toggle_"):]
+        # Not paneli önceki gezintiden açık kalmış olabilir; düğme paneli kapatır
+        if f"input_{note_key}" not in dict(session.page):
+            await session.click("not", toggles[-1])
+        await session.set_value("not", f"input_{note_key}", string_value=f"Yük testi notu {rng.random():.6f}")
+        await session.click("not", f"save_{note_key}")
+        await pause()
+
+    for choice in MENU_TOUR:
+        await session.set_value("menü", "menu", int_value=MENU.index(choice))
+        await pause()
+    await session.click("ünite listesi", "label:⬅️ Derslere Dön")
+
+
+async def run_level(port, sessions, journeys, drags, think, timeout, seed):
+    url = f"ws://127.0.0.1:{port}/_stcore/stream"
+    clients = [Session(url, timeout) for _ in range(sessions)]
+    await asyncio.gather(*(client.connect() for client in clients))
+
+    async def drive(idx, client):
+        rng = random.Random(seed + idx)
+        for _ in range(journeys):
+            try:
+                await journey(client, rng, drags, think)
+            except (asyncio.TimeoutError, ConnectionError) as exc:
+                client.errors.append(f"gezinti kesildi: {type(exc).__name__}")
+                return
+
+    started = time.perf_counter()
+    await asyncio.gather(*(drive(idx, client) for idx, client in enumerate(clients)))
+    elapsed = time.perf_counter() - started
+    return clients, elapsed
+
+
+def measure_level(template, sessions, args):
+    server, port = start_server(template)
+    try:
+        # Tek bir oturum içeriği ve çizim arka ucunu ısıtır; taban bellek ondan sonra okunur.
+        # Oturum başına bellek (RSS - taban) / N bir tahmindir: ayırıcı boşalan belleği
+        # sisteme hemen geri vermez, küçük N'de gürültü baskındır.
+        asyncio.run(run_level(port, 1, 1, 1, 0, args.timeout, args.seed - 1))
+        base_rss = _rss_mb(server.pid)
+        clients, elapsed = asyncio.run(
+            run_level(port, sessions, args.journeys, args.drags, args.think, args.timeout, args.seed)
+        )
+        rss = _rss_mb(server.pid)
+        peak_rss = _rss_mb(server.pid, "VmHWM")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    latencies = [seconds for client in clients for _, seconds in client.latencies]
+    by_action = {}
+    for client in clients:
+        for action, seconds in client.latencies:
+            by_action.setdefault(action, []).append(seconds)
+    summary = lambda values: {
+        "count": len(values),
+        "p50": statistics.median(values),
+        "p95": _percentile(values, 0.95),
+        "p99": _percentile(values, 0.99),
+    } if values else {"count": 0}
+    return {
+        "sessions": sessions,
+        "reruns": len(latencies),
+        "errors": sum(len(client.errors) for client in clients),
+        "error_kinds": sorted({error for client in clients for error in client.errors}),
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        **summary(latencies),
+        "actions": {action: summary(values) for action, values in by_action.items()},
+        "rss_base_mb": base_rss,
+        "rss_mb": rss,
+        "rss_peak_mb": peak_rss,
+        "rss_per_session_mb": (rss - base_rss) / sessions if rss is not None and base_rss is not None else None,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", default=DEFAULT_SESSIONS, help="virgülle ayrılmış eşzamanlı oturum sayıları")
+    parser.add_argument("--dataset", default=DEFAULT_DATASET, help="ünite,sayfa,not,test")
+    parser.add_argument("--journeys", type=int, default=2, help="oturum başına gezinti sayısı")
+    parser.add_argument("--drags", type=int, default=5, help="slider başına sürükleme sayısı")
+    parser.add_argument("--think", type=float, default=0.0, help="adımlar arası ortalama bekleme (sn)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="tek bir yeniden çalıştırmanın en uzun süresi (sn)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="JSON raporunun yazılacağı dosya")
+    args = parser.parse_args()
+
+    import streamlit
+
+    report = {
+        "commit": _git_commit(),
+        "python": sys.version.split()[0],
+        "streamlit": streamlit.__version__,
+        "dataset": args.dataset,
+        "journeys": args.journeys,
+        "drags": args.drags,
+        "think": args.think,
+        "levels": [],
+    }
+    print(f"{'oturum':>6} {'istek':>6} {'hata':>5} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+          f"{'istek/sn':>9} {'RSS MB':>8} {'MB/oturum':>10}")
+    template = seed_database(args.dataset)
+    for sessions in (int(part) for part in args.sessions.split(",")):
+        level = measure_level(template, sessions, args)
+        report["levels"].append(level)
+        per_session = level["rss_per_session_mb"]
+        print(f"{sessions:>6} {level['reruns']:>6} {level['errors']:>5} "
+              f"{level.get('p50', 0) * 1000:>9.1f} {level.get('p95', 0) * 1000:>9.1f} {level.get('p99', 0) * 1000:>9.1f} "
+              f"{level['throughput']:>9.2f} {level['rss_mb'] or 0:>8.0f} "
+              f"{per_session if per_session is not None else float('nan'):>10.2f}")
+        for action, stats in level["actions"].items():
+            if stats["count"]:
+                print(f"{'':>6} {action:<14} p50 {stats['p50'] * 1000:8.1f}  p95 {stats['p95'] * 1000:8.1f}  "
+                      f"p99 {stats['p99'] * 1000:8.1f} ms ({stats['count']})")
+        for error in level["error_kinds"]:
+            print(f"{'':>6} ! {error}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+import bisect
+import heapq
+import math
+import re
+import threading
+
+# Harf ve rakam dizileri; alt çizgi ayırıcı sayılır (C_2, j_{12} → c, 2, j, 12)
+_TOKEN = re.compile(r"[^\W_]+")
+
+# Türkçe büyük harfler: str.lower() "I"yı "i"ye, "İ"yi "i̇"ye (iki karakter) çevirir
+_TURKISH_UPPER = str.maketrans({"I": "ı", "İ": "i"})
+
+# Türkçe karakter kullanmadan yazılan sorgular için ("butce" → "bütçe")
+_ASCII = str.maketrans("çğıöşüâîû", "cgiosuaiu")
+
+# Okapi BM25 sabitleri
+K1 = 1.2
+B = 0.75
+
+# Sorgunun son kelimesi yazılırken önek olarak aranır; çok kısa önekler aranmaz
+PREFIX_MIN = 2
+# Bir önekten açılan en fazla terim
+PREFIX_TERMS = 50
+
+# Alan ağırlıkları: başlıkta geçen kelime gövdede geçenden daha belirleyicidir
+FIELD_WEIGHTS = {"title": 3, "description": 2, "content": 1}
+
+SNIPPET_CHARS = 160
+
+
+def fold(text):
+    """Türkçe büyük/küçük harf katlama; karakter sayısını korur"""
+    return text.translate(_TURKISH_UPPER).lower()
+
+
+def tokenize(text):
+    return _TOKEN.findall(fold(text))
+
+
+def ascii_form(term):
+    return term.translate(_ASCII)
+
+
+class SearchIndex:
+    """Ters dizin (terim → {belge: ağırlıklı terim sıklığı}) üzerinde BM25 sıralı arama
+
+    Belgeler tek tek eklenir ve silinir; sözlük sıralı tutulduğu için son sorgu
+    kelimesi önek olarak da aranır. Sorgu kelimeleri Türkçe karakterlerden arındırılmış
+    biçimleriyle eşleşir ("isik" → "ışık", "ısık"). Birden çok kelimeli sorgularda tüm
+    kelimeleri içeren belgeler döner.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._postings = {}
+        # Arındırılmış biçim → terimler; sıralı sözlük arındırılmış biçimleri tutar
+        self._variants = {}
+        self._vocabulary = []
+        self._docs = {}
+        self._lengths = {}
+        self._total_length = 0
+
+    def __len__(self):
+        return len(self._docs)
+
+    def add(self, doc_id, fields, meta):
+        """fields: {alan adı: metin}; aynı id varsa önce eskisi silinir"""
+        counts = {}
+        length = 0
+        for field, text in fields.items():
+            weight = FIELD_WEIGHTS.get(field, 1)
+            for term in tokenize(text or ""):
+                counts[term] = counts.get(term, 0) + weight
+                length += 1
+        with self._lock:
+            self.remove(doc_id)
+            for term, count in counts.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = {}
+                    plain = ascii_form(term)
+                    variants = self._variants.get(plain)
+                    if variants is None:
+                        variants = self._variants[plain] = set()
+                        bisect.insort(self._vocabulary, plain)
+                    variants.add(term)
+                postings[doc_id] = count
+            self._docs[doc_id] = (tuple(counts), fields, meta)
+            self._lengths[doc_id] = length
+            self._total_length += length
+
+    def remove(self, doc_id):
+        with self._lock:
+            doc = self._docs.pop(doc_id, None)
+            if doc is None:
+                return False
+            self._total_length -= self._lengths.pop(doc_id)
+            for term in doc[0]:
+                postings = self._postings[term]
+                del postings[doc_id]
+                if not postings:
+                    del self._postings[term]
+                    plain = ascii_form(term)
+                    variants = self._variants[plain]
+                    variants.discard(term)
+                    if not variants:
+                        del self._variants[plain]
+                        del self._vocabulary[bisect.bisect_left(self._vocabulary, plain)]
+            return True
+
+    def _expand(self, word, prefix):
+        """Kelimeyle (prefix ise kelimeyle başlayan) eşleşen terimler"""
+        plain = ascii_form(word)
+        if not prefix:
+            return self._variants.get(plain, ())
+        pos = bisect.bisect_left(self._vocabulary, plain)
+        terms = []
+        while pos < len(self._vocabulary) and len(terms) < PREFIX_TERMS:
+            if not self._vocabulary[pos].startswith(plain):
+                break
+            terms.extend(self._variants[self._vocabulary[pos]])
+            pos += 1
+        return terms
+
+    def search(self, query, limit=20, prefix=True):
+        """Sorguya uyan belgeler, skora göre azalan: [(skor, meta, alanlar, sorgu terimleri)]"""
+        words = tokenize(query)
+        if not words:
+            return []
+        with self._lock:
+            if not self._docs:
+                return []
+            total = len(self._docs)
+            lengths = self._lengths
+            # BM25 uzunluk normalizasyonu: K1·(1 - B + B·uzunluk/ortalama)
+            base = K1 * (1 - B)
+            scale = K1 * B * total / (self._total_length or 1)
+
+            # Her sorgu kelimesi için {belge: skor}; son kelime önek olarak açılır
+            word_scores = []
+            for idx, word in enumerate(words):
+                expand = prefix and idx == len(words) - 1 and len(word) >= PREFIX_MIN
+                scores = {}
+                for term in self._expand(word, expand):
+                    postings = self._postings[term]
+                    idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5)) * (K1 + 1)
+                    for doc_id, tf in postings.items():
+                        score = idf * tf / (tf + base + scale * lengths[doc_id])
+                        if score > scores.get(doc_id, 0.0):
+                            scores[doc_id] = score
+                if not scores:
+                    return []
+                word_scores.append(scores)
+
+            # Kesişim en az belgeli kelimeden başlar
+            word_scores.sort(key=len)
+            ranked, rest = word_scores[0], word_scores[1:]
+            if rest:
+                ranked = {
+                    doc_id: score + sum(scores[doc_id] for scores in rest)
+                    for doc_id, score in ranked.items() if all(doc_id in scores for scores in rest)
+                }
+            best = heapq.nlargest(limit, ranked.items(), key=lambda item: item[1])
+            return [(score, self._docs[doc_id][2], self._docs[doc_id][1], words) for doc_id, score in best]
+
+
+def snippet(text, words, width=SNIPPET_CHARS):
+    """Metnin ilk eşleşen kelime çevresindeki parçası; fold karakter sayısını koruduğu için konumlar aynıdır"""
+    text = " ".join(text.split())
+    folded = fold(text)
+    hits = [pos for pos in (folded.find(word) for word in words) if pos >= 0]
+    if not hits:
+        plain = ascii_form(folded)
+        hits = [pos for pos in (plain.find(ascii_form(word)) for word in words) if pos >= 0]
+    start = max(0, min(hits) - width // 4) if hits else 0
+    part = text[start:start + width]
+    return ("…" if start else "") + part + ("…" if start + width < len(text) else "")
+
+
+def section_fields(section):
+    """Ders bölümünün dizinlenen alanları"""
+    return {
+        "title": section.get('title', ''),
+        "description": section.get('description', ''),
+        "content": section.get('content', ''),
+    }
+
+
+def summary_index(summaries):
+    """Oturumun özetleri için dizin; belge id'si listedeki sıradır"""
+    index = SearchIndex()
+    for position, summary in enumerate(summaries):
+        add_summary(index, position, summary)
+    return index
+
+
+def add_summary(index, position, summary):
+    index.add(position, {"title": str(summary.get('unit', '')), "content": str(summary.get('summary', ''))},
+              {"kind": "summary", "position": position})
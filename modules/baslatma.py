@@ -0,0 +1,39 @@
+import threading
+import time
+
+_lock = threading.Lock()
+_ready = threading.Event()
+_thread = None
+
+# Süreç başına bir kez ölçülen çizim arka ucu hazırlık süreleri
+STARTUP_STATS = {"import_seconds": None, "prewarm_seconds": None}
+
+
+def prewarm():
+    """matplotlib / numpy'yi içe aktarır ve Agg arka ucunu süreç başına bir kez ısıtır"""
+    if _ready.is_set():
+        return
+    with _lock:
+        if _ready.is_set():
+            return
+        started = time.perf_counter()
+        from modules import grafikler
+        imported = time.perf_counter()
+        grafikler.prewarm_figure()
+        STARTUP_STATS["import_seconds"] = imported - started
+        STARTUP_STATS["prewarm_seconds"] = time.perf_counter() - imported
+        _ready.set()
+
+
+def prewarm_in_background():
+    """Isıtmayı ilk grafik istenmeden önce arka planda başlatır; yalnızca bir kez"""
+    global _thread
+    with _lock:
+        if _ready.is_set() or _thread is not None:
+            return
+        _thread = threading.Thread(target=prewarm, name="mikro-prewarm", daemon=True)
+        _thread.start()
+
+
+def is_warm():
+    return _ready.is_set()
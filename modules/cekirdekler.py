@@ -0,0 +1,242 @@
+import importlib
+
+import numpy as np
+
+from modules.denge import equilibrium, quantity
+from modules.fayda import UTILITY_FAMILIES, indifference_curve, preferences, slutsky, solve, utility_level
+from modules.grafik_turleri import DEFAULT_DEMAND, DEFAULT_SUPPLY, GRAPH_TYPES
+
+# Eğri başına nokta sayısı; tüm senaryolar aynı ızgarayı paylaşır
+CURVE_POINTS = 100
+_GRID = np.linspace(0.0, 1.0, CURVE_POINTS)
+
+# Karşılaştırmalı durağanlık taramasındaki faiz oranları
+STATICS_POINTS = 2000
+STATICS_RATES = np.linspace(0.0, 0.5, STATICS_POINTS)
+
+# Çekirdek çıktısı:
+#   lines:  [{label, x, y, color, style, width, alpha, vary, straight}]  x, y: (n, k)
+#   points: [{label, mark, x, y, color, size}]                          x, y: (n,)
+#   xlim, ylim: tüm senaryoları kapsayan eksen sınırları
+#   info: senaryo başına bilgi metni listesi ya da None
+#   table: (isteğe bağlı) ilk senaryo için bölümün altında gösterilecek satırlar
+
+
+def _preferences(utility, alpha, sigma, beta, theta):
+    if utility not in UTILITY_FAMILIES:
+        raise ValueError(f"Bilinmeyen fayda ailesi: {utility}")
+    return preferences(alpha, sigma, beta, theta)
+
+
+def budget_constraint_kernel(R1, R2, j12, utility="cobb_douglas", alpha=None, sigma=None, beta=None, theta=None):
+    """İki dönemli bütçe kısıtı, gerçek optimum ve teğet kayıtsızlık eğrisi; n senaryo tek seferde"""
+    prefs = _preferences(utility, alpha, sigma, beta, theta)
+    C2_max = R1 * (1 + j12) + R2
+    C1_max = C2_max / (1 + j12)
+
+    C1_range = C1_max[:, None] * _GRID
+    C2_budget = C2_max[:, None] - (1 + j12)[:, None] * C1_range
+
+    C1_opt, C2_opt, U_opt = solve(utility, R1, R2, j12, prefs)
+    U_endowment = utility_level(utility, R1, R2, prefs)
+
+    # Kayıtsızlık eğrileri: başlangıç noktasından geçen (U¹) ve bütçeye teğet olan (U²)
+    C1_indiff = C1_max[:, None] * (0.02 + 1.08 * _GRID)
+    C2_endowment = indifference_curve(utility, C1_indiff, U_endowment[:, None], prefs)
+    C2_tangent = indifference_curve(utility, C1_indiff, U_opt[:, None], prefs)
+
+    return {
+        "lines": [
+            {"label": "Bütçe Doğrusu (AB)", "x": C1_range, "y": C2_budget, "color": "b",
+             "width": 2, "vary": True, "straight": True},
+            {"label": "U¹ (R'den geçen)", "x": C1_indiff, "y": C2_endowment, "color": "g", "style": "--",
+             "width": 1.5, "alpha": 0.7},
+            {"label": "U² (teğet)", "x": C1_indiff, "y": C2_tangent, "color": "r", "style": "--",
+             "width": 1.5, "alpha": 0.7, "vary": True},
+        ],
+        "points": [
+            {"label": "Başlangıç (R)", "mark": "R", "x": R1, "y": R2, "color": "k", "size": 10},
+            {"label": "Optimum (P)", "mark": "P", "x": C1_opt, "y": C2_opt, "color": "r", "size": 12},
+        ],
+        "xlim": (0, C1_max.max() * 1.1),
+        "ylim": (0, C2_max.max() * 1.1),
+        "info": [
+            f'Faiz Oranı (j₁₂): {rate*100:.1f}%\nBütçe Eğimi: -(1+j₁₂) = -{1+rate:.2f}\n'
+            f'Tasarruf: S = R₁ - C₁* = {saving:.1f}'
+            for rate, saving in zip(j12, R1 - C1_opt)
+        ],
+    }
+
+
+def intertemporal_statics_kernel(R1, R2, j12, utility="cobb_douglas", alpha=None, sigma=None, beta=None, theta=None):
+    """Faiz oranı taraması: tasarruf değişiminin ikame ve gelir etkilerine ayrılması
+
+    j₁₂ slider'ı başlangıç faizidir; her senaryo için STATICS_POINTS faiz oranı tek seferde çözülür.
+    """
+    prefs = _preferences(utility, alpha, sigma, beta, theta)
+    rates = np.broadcast_to(STATICS_RATES, (len(R1), len(STATICS_RATES)))
+    effects = slutsky(utility, R1[:, None], R2[:, None], j12[:, None], rates, prefs)
+
+    # Tasarruf S = R₁ - C₁ olduğundan C₁ etkilerinin işareti ters çevrilir
+    total, substitution, income = -effects["total"], -effects["substitution"], -effects["income"]
+    finite = np.concatenate([total, substitution, income], axis=None)
+    finite = finite[np.isfinite(finite)]
+    low, high = (finite.min(), finite.max()) if finite.size else (-1.0, 1.0)
+    pad = max(high - low, 1e-6) * 0.1
+
+    table_rates = np.round(np.linspace(STATICS_RATES[0], STATICS_RATES[-1], 11), 4)
+    table = slutsky(utility, R1[0], R2[0], j12[0], table_rates, prefs)
+
+    return {
+        "lines": [
+            {"label": "Toplam Etki (ΔS)", "x": rates, "y": total, "color": "b", "width": 2.5, "vary": True},
+            {"label": "İkame Etkisi", "x": rates, "y": substitution, "color": "g", "style": "--",
+             "width": 1.5, "vary": True},
+            {"label": "Gelir Etkisi", "x": rates, "y": income, "color": "r", "style": ":",
+             "width": 1.5, "vary": True},
+            {"label": None, "x": np.array([[STATICS_RATES[0], STATICS_RATES[-1]]]), "y": np.zeros((1, 2)),
+             "color": "gray", "alpha": 0.5, "straight": True},
+        ],
+        "points": [
+            {"label": "Başlangıç faizi", "mark": "A", "x": j12, "y": np.zeros(len(j12)), "color": "k", "size": 8},
+        ],
+        "xlim": (STATICS_RATES[0], STATICS_RATES[-1]),
+        "ylim": (low - pad, high + pad),
+        "info": [f'Başlangıç: j₁₂ = {rate*100:.1f}%, S = {saving:.1f}'
+                 for rate, saving in zip(j12, R1 - solve(utility, R1, R2, j12, prefs)[0])],
+        "table": [
+            {
+                "j₁₂": float(rate),
+                "C₁*": round(float(C1), 2),
+                "C₂*": round(float(C2), 2),
+                "Tasarruf (S)": round(float(saving), 2),
+                "ΔS": round(float(-total_effect), 2),
+                "İkame": round(float(-sub), 2),
+                "Gelir": round(float(-inc), 2),
+            }
+            for rate, C1, C2, saving, total_effect, sub, inc in zip(
+                table_rates, table["C1_new"], table["C2_new"], table["saving"],
+                table["total"], table["substitution"], table["income"]
+            )
+        ],
+    }
+
+
+def _amount(value):
+    return "∞" if np.isinf(value) else f"{value:.1f}"
+
+
+def supply_demand_kernel(demand_shift, supply_shift, tax, demand=None, supply=None, ceiling=None):
+    """Arz-talep eğrileri ve gerçek kesişme noktası; n senaryo tek seferde (bkz. modules/denge.py)"""
+    demand = demand or DEFAULT_DEMAND
+    supply = supply or DEFAULT_SUPPLY
+    result = equilibrium(demand, supply, tax, demand_shift, supply_shift, ceiling)
+    n = len(tax)
+    buyer_price, seller_price, traded = result["buyer_price"], result["seller_price"], result["quantity"]
+
+    # Eksenler vergisiz dengenin iki katını kapsar (varsayılan eğrilerde 0-220 ve 0-22)
+    P_top = 2.2 * result["price0"].max()
+    Q_top = 2.2 * result["quantity0"].max()
+    P_range = np.broadcast_to(P_top * (0.005 + 0.995 * _GRID), (n, CURVE_POINTS))
+    demand_straight = demand["form"] == "linear"
+    supply_straight = supply["form"] == "linear"
+    # Eğriler yalnızca kendi kayması senaryolar arasında değişiyorsa senaryo rengi alır
+    demand_varies = bool(np.ptp(demand_shift) > 0)
+    supply_varies = bool(np.ptp(supply_shift) > 0)
+
+    lines = [
+        {"label": "Talep Eğrisi", "x": quantity(demand, P_range, demand_shift), "y": P_range, "color": "b",
+         "width": 2, "vary": demand_varies, "straight": demand_straight},
+        {"label": "Arz Eğrisi", "x": quantity(supply, P_range, supply_shift), "y": P_range, "color": "r",
+         "width": 2, "vary": supply_varies, "straight": supply_straight},
+        # Denge fiyatı ve miktarı kılavuz çizgileri
+        {"label": None, "x": np.column_stack([np.zeros(n), traded]),
+         "y": np.column_stack([buyer_price, buyer_price]), "color": "gray", "style": "--", "alpha": 0.5,
+         "vary": True, "straight": True},
+        {"label": None, "x": np.column_stack([traded, traded]),
+         "y": np.column_stack([np.zeros(n), buyer_price]), "color": "gray", "style": "--",
+         "alpha": 0.5, "vary": True, "straight": True},
+    ]
+    points = [
+        {"label": "Denge (E)", "mark": "E", "x": traded, "y": buyer_price, "color": "g", "size": 15},
+    ]
+    taxed = bool((tax > 0).any())
+    if taxed:
+        # Vergi arz eğrisini alıcı fiyatı ekseninde t kadar yukarı taşır
+        lines.insert(2, {"label": "Vergili Arz (S + t)", "x": quantity(supply, P_range, supply_shift),
+                         "y": P_range + tax[:, None], "color": "r", "style": "--", "width": 1.5,
+                         "alpha": 0.7, "vary": True, "straight": supply_straight})
+        points.append({"label": "Satıcı Fiyatı (F)", "mark": "F", "x": traded, "y": seller_price,
+                       "color": "m", "size": 10})
+    if ceiling is not None:
+        lines.append({"label": "Tavan Fiyat", "x": np.column_stack([np.zeros(n), np.full(n, Q_top)]),
+                      "y": np.column_stack([result["ceiling"], result["ceiling"]]), "color": "k",
+                      "style": ":", "width": 1.5, "straight": True})
+        points.append({"label": "Tavanda Talep (K)", "mark": "K", "x": result["ceiling_demand"],
+                       "y": result["ceiling"], "color": "orange", "size": 10})
+
+    info = []
+    for idx in range(n):
+        lines_text = [
+            f'Denge: P* = {buyer_price[idx]:.2f}, Q* = {traded[idx]:.1f}',
+            f'Tüketici Artığı: {_amount(result["consumer_surplus"][idx])}',
+            f'Üretici Artığı: {_amount(result["producer_surplus"][idx])}',
+        ]
+        if tax[idx] > 0:
+            lines_text += [
+                f'Vergi Geliri: {result["tax_revenue"][idx]:.1f}, Ölü Ağırlık Kaybı: {result["deadweight_loss"][idx]:.1f}',
+                f'Vergi Yükü: alıcı %{result["buyer_share"][idx]*100:.0f}, satıcı %{result["seller_share"][idx]*100:.0f}',
+            ]
+        if result["shortage"][idx] > 0:
+            lines_text.append(f'Kıtlık: {result["shortage"][idx]:.1f}')
+        info.append("\n".join(lines_text))
+
+    rows = [
+        ("Alıcı fiyatı (P_b)", buyer_price), ("Satıcı fiyatı (P_s)", seller_price), ("Miktar (Q)", traded),
+        ("Vergisiz denge fiyatı", result["price0"]), ("Vergisiz denge miktarı", result["quantity0"]),
+        ("Tüketici artığı", result["consumer_surplus"]), ("Üretici artığı", result["producer_surplus"]),
+        ("Vergi geliri", result["tax_revenue"]), ("Ölü ağırlık kaybı", result["deadweight_loss"]),
+        ("Alıcının vergi payı (%)", result["buyer_share"] * 100), ("Kıtlık", result["shortage"]),
+    ]
+    return {
+        "lines": lines,
+        "points": points,
+        "xlim": (0, Q_top),
+        "ylim": (0, P_top + (tax.max() if taxed else 0)),
+        "info": info,
+        # Vergisiz senaryoda tanımsız olan vergi payı (NaN) tabloda boş kalır
+        "table": [
+            {"Büyüklük": name, "Değer": None if np.isnan(values[0]) else
+             (values[0] if np.isinf(values[0]) else round(float(values[0]), 2))}
+            for name, values in rows
+        ],
+    }
+
+
+def load_kernel(graph_type):
+    module_name, function_name = GRAPH_TYPES[graph_type]["kernel"].split(":")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+def compute_series(graph_type, params, overlay=None):
+    """Parametreleri (n,) dizilere açıp çekirdeği bir kez çağırır
+
+    overlay verilirse (parametre, değerler) ile o parametre senaryolar boyunca değişir.
+    (çekirdek çıktısı, senaryo değerleri ya da None) döndürür.
+    """
+    spec = GRAPH_TYPES[graph_type]
+    n = len(overlay[1]) if overlay else 1
+    batch = {}
+    for name, _, _, _, default, _ in spec["params"]:
+        batch[name] = np.full(n, params.get(name, default), dtype=float)
+    if overlay:
+        batch[overlay[0]] = np.asarray(overlay[1], dtype=float)
+    # Slider olmayan seçenekler tüm senaryolarda aynıdır
+    options = {name: params.get(name, default) for name, (default, _) in spec["options"].items()}
+    return load_kernel(graph_type)(**batch, **options), (batch[overlay[0]] if overlay else None)
+
+
+def series_table(graph_type, params):
+    """Tablo üreten grafik türlerinde bölümün altında gösterilecek satırlar"""
+    series, _ = compute_series(graph_type, params)
+    return series.get("table", [])
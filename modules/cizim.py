@@ -0,0 +1,102 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+
+from modules.onbellek import draw_png, figure_cache
+from modules.yapilandirma import CONFIG
+
+
+def _render_task(key, graph_type, params, overlay):
+    png = draw_png(graph_type, params, overlay)
+    # Süresi dolan isteğin sonucu da saklanır; yeniden deneme önbellekten okur
+    figure_cache.put(key, png)
+    return png
+
+
+class RenderPool:
+    """PNG çizimleri için sınırlı iş parçacığı havuzu
+
+    Çizim pyplot kullanmadığı için (bkz. modules/grafikler.py) her figür yalnızca onu
+    çizen iş parçacığına aittir. numpy hesapları ve PNG sıkıştırması GIL'i bıraktığından
+    çizimler çekirdeklere yayılır. Aynı anda en fazla workers × render_queue çizim kabul
+    edilir (geri basınç): yer açılmazsa ya da çizim render_timeout saniyede bitmezse
+    TimeoutError yükseltilir. Aynı anahtarla süren bir çizim varsa yeni istek onu bekler.
+
+    Süreç havuzu kullanılmaz: Streamlit betiği __main__ olarak çalıştırdığı için spawn
+    ile başlayan her süreç app.py'yi baştan çalıştırır.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor = None
+        self._workers = 0
+        self._slots = None
+        self._inflight = {}
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _get_executor(self):
+        workers = max(1, CONFIG["render_workers"])
+        if self._executor is None or self._workers != workers:
+            if self._executor is not None:
+                # Süren çizimler bitince eski havuz kapanır
+                self._executor.shutdown(wait=False)
+            self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mikro-render")
+            self._workers = workers
+            self._slots = threading.BoundedSemaphore(workers * max(1, CONFIG["render_queue"]))
+            self._inflight = {}
+        return self._executor
+
+    def _finished(self, key, slots, future):
+        slots.release()
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _submit(self, key, graph_type, params, overlay, deadline):
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                return future
+            self._get_executor()
+            slots = self._slots
+        # Kuyruk doluysa yer açılmasını en fazla kalan süre kadar bekle
+        if not slots.acquire(timeout=max(0.0, deadline - time.monotonic())):
+            with self._lock:
+                self.rejected += 1
+            raise TimeoutError("Grafik sunucusu şu anda çok meşgul, lütfen tekrar deneyin.")
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                slots.release()
+                return future
+            future = self._executor.submit(_render_task, key, graph_type, params, overlay)
+            self._inflight[key] = future
+        future.add_done_callback(lambda f: self._finished(key, slots, f))
+        return future
+
+    def render(self, key, graph_type, params, overlay=None):
+        """PNG baytları; render_workers 0 ise çizim çağıran iş parçacığında yapılır"""
+        if CONFIG["render_workers"] <= 0:
+            return _render_task(key, graph_type, params, overlay)
+        deadline = time.monotonic() + CONFIG["render_timeout"]
+        future = self._submit(key, graph_type, params, overlay, deadline)
+        try:
+            return future.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeout:
+            with self._lock:
+                self.timeouts += 1
+            raise TimeoutError(f"Grafik {CONFIG['render_timeout']:g} saniyede çizilemedi.") from None
+
+    def stats(self):
+        with self._lock:
+            return {
+                "workers": self._workers if self._executor is not None else 0,
+                "inflight": len(self._inflight),
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+            }
+
+
+render_pool = RenderPool()
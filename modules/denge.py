@@ -0,0 +1,164 @@
+import numpy as np
+
+# Arz ve talep eğrisi biçimleri; eğriler fiyatın fonksiyonu olarak miktarı verir, Q(P)
+#   linear:              Q = intercept + slope·P
+#   constant_elasticity: Q = scale·P^elasticity
+#   piecewise:           (prices, quantities) kırılma noktaları arasında doğrusal;
+#                        uçlarda ilk ve son parçanın eğimiyle uzatılır
+# Biçimlerin zorunlu alanları grafik türü kaydındadır (bkz. modules/grafik_turleri.py)
+
+# İkiye bölme adımı; arama aralığı 2^-60 oranında daralır
+BISECT_ITERATIONS = 60
+
+# Artık integrallerindeki fiyat noktası sayısı
+SURPLUS_POINTS = 512
+
+# Üst fiyat sınırı başlangıç fiyatından en fazla bu kadar ikiye katlanarak aranır
+_MAX_DOUBLINGS = 40
+
+# Tüm fonksiyonlar (n,) boyutlu dizilerle n senaryoyu tek seferde hesaplar; kaymalar
+# eğriyi yatay olarak (her fiyatta aynı miktar) taşır.
+
+
+def quantity(spec, price, shift=0.0):
+    """Eğrinin verilen fiyatlardaki miktarı; price (n, k), shift (n,) ya da skaler"""
+    form = spec["form"]
+    shift = np.asarray(shift, dtype=float)
+    if shift.ndim:
+        shift = shift[:, None]
+    if form == "linear":
+        return spec["intercept"] + spec["slope"] * price + shift
+    if form == "constant_elasticity":
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return spec["scale"] * price ** spec["elasticity"] + shift
+    if form == "piecewise":
+        prices = np.asarray(spec["prices"], dtype=float)
+        quantities = np.asarray(spec["quantities"], dtype=float)
+        inside = np.interp(price, prices, quantities)
+        low_slope = (quantities[1] - quantities[0]) / (prices[1] - prices[0])
+        high_slope = (quantities[-1] - quantities[-2]) / (prices[-1] - prices[-2])
+        below = quantities[0] + low_slope * (price - prices[0])
+        above = quantities[-1] + high_slope * (price - prices[-1])
+        return np.where(price < prices[0], below, np.where(price > prices[-1], above, inside)) + shift
+    raise ValueError(f"Bilinmeyen eğri biçimi: {form}")
+
+
+def bisect(func, low, high, iterations=BISECT_ITERATIONS):
+    """func(low) ≥ 0 ≥ func(high) olan n aralıkta kökü birlikte arar; func (n, 1) → (n, 1)"""
+    low = np.array(low, dtype=float)
+    high = np.array(high, dtype=float)
+    for _ in range(iterations):
+        mid = (low + high) / 2
+        positive = func(mid[:, None])[:, 0] > 0
+        low = np.where(positive, mid, low)
+        high = np.where(positive, high, mid)
+    return (low + high) / 2
+
+
+def upper_bound(func, start):
+    """func'ın negatife düştüğü fiyatı ikiye katlayarak arar: (sınır, bulundu mu)"""
+    high = np.maximum(np.asarray(start, dtype=float), 1.0)
+    positive = func(high[:, None])[:, 0] > 0
+    for _ in range(_MAX_DOUBLINGS):
+        if not positive.any():
+            break
+        high = np.where(positive, high * 2, high)
+        positive = func(high[:, None])[:, 0] > 0
+    return high, ~positive
+
+
+def integrate(func, low, high):
+    """∫ max(func(p), 0) dp, low'dan high'a; senaryo başına SURPLUS_POINTS noktalı yamuk kuralı"""
+    grid = low[:, None] + (high - low)[:, None] * np.linspace(0.0, 1.0, SURPLUS_POINTS)
+    values = np.nan_to_num(np.maximum(func(grid), 0.0), posinf=0.0)
+    return np.trapz(values, grid, axis=1)
+
+
+def _unbounded_surplus(spec, price, shift):
+    """Talebi hiç sıfırlanmayan eğride ∫ D(p) dp, price'tan sonsuza
+
+    Yalnızca ε < -1 olan kaydırılmamış sabit esneklikli talepte sonludur: A·P^(ε+1) / -(ε+1).
+    """
+    if spec["form"] == "constant_elasticity" and spec["elasticity"] < -1:
+        elasticity = spec["elasticity"]
+        tail = spec["scale"] * price ** (elasticity + 1) / -(elasticity + 1)
+        return np.where(shift == 0, tail, np.inf)
+    return np.full_like(price, np.inf)
+
+
+def _market(demand, supply, tax, demand_shift, supply_shift):
+    """Alıcı fiyatı P_b, satıcı fiyatı P_s = P_b - t ve miktar; D(P_b) = S(P_b - t)"""
+    def excess(price):
+        return quantity(demand, price, demand_shift) - quantity(supply, price - tax[:, None], supply_shift)
+
+    high, _ = upper_bound(excess, tax * 2)
+    buyer_price = bisect(excess, tax, high)
+    seller_price = buyer_price - tax
+    traded = quantity(demand, buyer_price[:, None], demand_shift)[:, 0]
+    return buyer_price, seller_price, traded
+
+
+def equilibrium(demand, supply, tax=0.0, demand_shift=0.0, supply_shift=0.0, ceiling=None):
+    """Arz-talep dengesi ve türetilen büyüklükler; tüm girdiler (n,) dizilere yayılır
+
+    tax satıcıdan alınan birim vergidir; vergi yükü alıcı ve satıcı fiyatlarının vergisiz
+    dengeden sapmasıyla paylaştırılır. ceiling verilirse alıcı fiyatına tavan uygulanır ve
+    tavanın bağlayıcı olduğu senaryolarda kıtlık (talep - arz) hesaplanır.
+    """
+    tax, demand_shift, supply_shift = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(value, dtype=float)) for value in (tax, demand_shift, supply_shift))
+    )
+    zero = np.zeros_like(tax)
+
+    price0, _, quantity0 = _market(demand, supply, zero, demand_shift, supply_shift)
+    buyer_price, seller_price, traded = _market(demand, supply, tax, demand_shift, supply_shift)
+
+    def demanded(price):
+        return quantity(demand, price, demand_shift)
+
+    def supplied(price):
+        return quantity(supply, price, supply_shift)
+
+    # Tüketici artığı: alıcı fiyatından talebin sıfırlandığı fiyata ∫ D(p) dp
+    high, chokes = upper_bound(demanded, buyer_price * 2)
+    choke = bisect(demanded, buyer_price, high)
+    consumer = np.where(
+        chokes,
+        integrate(demanded, buyer_price, choke),
+        _unbounded_surplus(demand, buyer_price, demand_shift),
+    )
+    producer = integrate(supplied, np.zeros_like(seller_price), seller_price)
+    revenue = tax * traded
+
+    # Artık kayıpları vergisiz dengeye göre sonlu aralıklarda hesaplanır; ölü ağırlık kaybı
+    # tüketici artığı sonsuz olsa da tanımlıdır
+    consumer_loss = integrate(demanded, price0, buyer_price)
+    producer_loss = integrate(supplied, seller_price, price0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        buyer_share = np.where(tax > 0, (buyer_price - price0) / tax, np.nan)
+
+    result = {
+        "price0": price0,
+        "quantity0": quantity0,
+        "buyer_price": buyer_price,
+        "seller_price": seller_price,
+        "quantity": traded,
+        "consumer_surplus": consumer,
+        "producer_surplus": producer,
+        "tax_revenue": revenue,
+        "deadweight_loss": consumer_loss + producer_loss - revenue,
+        "buyer_share": buyer_share,
+        "seller_share": 1 - buyer_share,
+        "shortage": zero,
+    }
+    if ceiling is not None:
+        ceiling = np.broadcast_to(np.asarray(ceiling, dtype=float), tax.shape)
+        binding = ceiling < buyer_price
+        at_ceiling_demand = demanded(ceiling[:, None])[:, 0]
+        at_ceiling_supply = quantity(supply, (ceiling - tax)[:, None], supply_shift)[:, 0]
+        result["ceiling"] = ceiling
+        result["ceiling_demand"] = np.where(binding, at_ceiling_demand, traded)
+        result["ceiling_supply"] = np.where(binding, np.maximum(at_ceiling_supply, 0.0), traded)
+        result["shortage"] = result["ceiling_demand"] - result["ceiling_supply"]
+    return result
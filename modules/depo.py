@@ -0,0 +1,472 @@
+import json
+import sqlite3
+import threading
+
+from modules.veri import DEMO_LESSONS, DEMO_TESTS
+from modules.yapilandirma import CONFIG
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS units (
+    unit_number INTEGER PRIMARY KEY,
+    unit_title TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS pages (
+    unit_number INTEGER NOT NULL REFERENCES units(unit_number) ON DELETE CASCADE,
+    page_number INTEGER NOT NULL,
+    sections TEXT NOT NULL,
+    PRIMARY KEY (unit_number, page_number)
+);
+CREATE TABLE IF NOT EXISTS tests (
+    position INTEGER PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS notes (
+    id REAL PRIMARY KEY,
+    unit_number INTEGER NOT NULL,
+    page_number INTEGER NOT NULL,
+    section_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    date TEXT NOT NULL,
+    owner TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS notes_by_section ON notes (unit_number, page_number, section_id);
+CREATE TABLE IF NOT EXISTS summaries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS attempts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    test_id TEXT NOT NULL,
+    date TEXT NOT NULL,
+    answers TEXT NOT NULL,
+    correct INTEGER NOT NULL,
+    total INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS attempts_by_test ON attempts (test_id, id);
+CREATE TABLE IF NOT EXISTS journal (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    collection TEXT NOT NULL,
+    record_key TEXT NOT NULL,
+    op TEXT NOT NULL,
+    owner TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+
+def _note_record(note_id, text, date, owner):
+    # Yedeklerde sahip yalnızca varsa yazılır; eski yedek biçimi değişmez
+    note = {"id": note_id, "text": text, "date": date}
+    if owner:
+        note["owner"] = owner
+    return note
+
+
+def split_note_key(note_key):
+    """"ünite-sayfa-bölüm" not anahtarını parçalarına ayırır"""
+    unit_num, page_num, section_id = note_key.split('-', 2)
+    return int(unit_num), int(page_num), section_id
+
+
+class Depo:
+    """Dersler, testler, notlar ve özetler için SQLite (WAL) deposu"""
+
+    def __init__(self, path):
+        self.path = path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+            # owner sütunundan önce oluşturulmuş depolar; eski notların sahibi ''
+            if 'owner' not in {row[1] for row in conn.execute("PRAGMA table_info(notes)")}:
+                conn.execute("ALTER TABLE notes ADD COLUMN owner TEXT NOT NULL DEFAULT ''")
+            conn.execute("CREATE INDEX IF NOT EXISTS notes_by_owner ON notes (owner, unit_number, page_number, section_id)")
+            # Not kayıtlarının günlüğü sahibiyle tutulur; artımlı yedek yalnızca kendi notlarını taşır
+            if 'owner' not in {row[1] for row in conn.execute("PRAGMA table_info(journal)")}:
+                conn.execute("ALTER TABLE journal ADD COLUMN owner TEXT")
+            # Eski tek yedek noktası sahipsiz ('') kullanıcıya geçer
+            conn.execute("UPDATE OR IGNORE meta SET key = 'last_backup_seq:' WHERE key = 'last_backup_seq'")
+            # Notlar eskiden sayfanın ünitedeki sırasıyla kaydedilirdi; bir kez sayfa numarasına taşınır
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'note_pages'").fetchone() is None:
+                self.number_note_pages(conn)
+                conn.execute("INSERT INTO meta (key, value) VALUES ('note_pages', 'page_number')")
+
+    def _conn(self):
+        # Her Streamlit oturum iş parçacığı kendi bağlantısını kullanır
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            self._local.conn = conn
+        return conn
+
+    def is_empty(self):
+        conn = self._conn()
+        return conn.execute("SELECT NOT EXISTS (SELECT 1 FROM units) AND NOT EXISTS (SELECT 1 FROM tests)").fetchone()[0] == 1
+
+    # Okuma
+    def load_units(self):
+        """Ünite başlıkları ve sayfa sayıları (sayfa içerikleri olmadan)"""
+        rows = self._conn().execute(
+            "SELECT u.unit_number, u.unit_title, COUNT(p.page_number) "
+            "FROM units u LEFT JOIN pages p ON p.unit_number = u.unit_number "
+            "GROUP BY u.unit_number ORDER BY u.unit_number"
+        )
+        return [
+            {"unit_number": unit_num, "unit_title": title, "page_count": page_count}
+            for unit_num, title, page_count in rows
+        ]
+
+    def load_pages(self, unit_number):
+        rows = self._conn().execute(
+            "SELECT page_number, sections FROM pages WHERE unit_number = ? ORDER BY page_number",
+            (unit_number,)
+        )
+        return [{"page_number": page_num, "sections": json.loads(sections)} for page_num, sections in rows]
+
+    def load_tests(self):
+        return [json.loads(data) for (data,) in self._conn().execute("SELECT data FROM tests ORDER BY position")]
+
+    def iter_note_rows(self, owner):
+        """Bir kullanıcının notları"""
+        return self._conn().execute(
+            "SELECT id, unit_number, page_number, section_id, text, date FROM notes WHERE owner = ? "
+            "ORDER BY unit_number, page_number, section_id, id",
+            (owner,)
+        )
+
+    def iter_notes(self, owner):
+        """Kullanıcının (not anahtarı, not listesi) çiftlerini bölüm sırasıyla üretir"""
+        note_key, note_list = None, []
+        rows = self._conn().execute(
+            "SELECT id, unit_number, page_number, section_id, text, date, owner FROM notes WHERE owner = ? "
+            "ORDER BY unit_number, page_number, section_id, id",
+            (owner,)
+        )
+        for note_id, unit_num, page_num, section_id, text, date, owner in rows:
+            key = f"{unit_num}-{page_num}-{section_id}"
+            if key != note_key:
+                if note_list:
+                    yield note_key, note_list
+                note_key, note_list = key, []
+            note_list.append(_note_record(note_id, text, date, owner))
+        if note_list:
+            yield note_key, note_list
+
+    def load_summaries(self):
+        return [json.loads(data) for (data,) in self._conn().execute("SELECT data FROM summaries ORDER BY id")]
+
+    def iter_attempts(self, test_id, after=0):
+        """Testin id'si after'dan büyük denemeleri: (id, {soru id: seçilen}) sırasıyla"""
+        rows = self._conn().execute(
+            "SELECT id, answers FROM attempts WHERE test_id = ? AND id > ? ORDER BY id",
+            (json.dumps(test_id), after)
+        )
+        for attempt_id, answers in rows:
+            yield attempt_id, json.loads(answers)
+
+    def count_attempts(self, test_id):
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM attempts WHERE test_id = ?", (json.dumps(test_id),)
+        ).fetchone()[0]
+
+    def iter_lessons(self):
+        """Dersleri ünite ünite üretir; tüm içerik aynı anda belleğe alınmaz"""
+        for lesson in self.load_units():
+            del lesson['page_count']
+            lesson['pages'] = self.load_pages(lesson['unit_number'])
+            yield lesson
+
+    # Değişiklik günlüğü (artımlı yedek için)
+    def _journal(self, conn, collection, record_key, op, owner=None):
+        conn.execute(
+            "INSERT INTO journal (collection, record_key, op, owner) VALUES (?, ?, ?, ?)",
+            (collection, str(record_key), op, owner)
+        )
+
+    def current_seq(self):
+        return self._conn().execute("SELECT COALESCE(MAX(seq), 0) FROM journal").fetchone()[0]
+
+    def last_backup_seq(self, owner):
+        """Kullanıcının son yedek noktası; hiç yedek almadıysa None"""
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (f"last_backup_seq:{owner}",)).fetchone()
+        return int(row[0]) if row else None
+
+    def mark_backup(self, seq, owner):
+        """Kullanıcının yedeklediği noktayı kaydeder; tüm yedek noktalarından eski günlük kayıtları silinir"""
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                (f"last_backup_seq:{owner}", str(seq))
+            )
+            # Hiç yedek almamış kullanıcılar ilk kez tam yedek alır; günlüğü tutmaları gerekmez
+            oldest = conn.execute(
+                "SELECT MIN(CAST(value AS INTEGER)) FROM meta WHERE key LIKE 'last_backup_seq:%'"
+            ).fetchone()[0]
+            conn.execute("DELETE FROM journal WHERE seq <= ?", (oldest,))
+
+    def count_changes_since(self, seq, owner):
+        return self._conn().execute(
+            "SELECT COUNT(*) FROM journal WHERE seq > ? AND (owner IS NULL OR owner = ?)", (seq, owner)
+        ).fetchone()[0]
+
+    def changes_since(self, seq, until, owner):
+        """(seq, until] aralığında her kaydın son işlemi: {koleksiyon: {anahtar: işlem}}
+
+        Not kayıtlarından yalnızca owner kullanıcısınınkiler döner.
+        """
+        changes = {}
+        rows = self._conn().execute(
+            "SELECT collection, record_key, op FROM journal "
+            "WHERE seq > ? AND seq <= ? AND (owner IS NULL OR owner = ?) ORDER BY seq",
+            (seq, until, owner)
+        )
+        for collection, record_key, op in rows:
+            if op == 'replace':
+                # Koleksiyon tamamen değiştiyse önceki kayıt işlemleri önemsiz
+                changes[collection] = {'*': 'replace'}
+            else:
+                changes.setdefault(collection, {})[record_key] = op
+        return changes
+
+    def load_page(self, unit_number, page_number):
+        row = self._conn().execute(
+            "SELECT u.unit_title, p.sections FROM pages p JOIN units u ON u.unit_number = p.unit_number "
+            "WHERE p.unit_number = ? AND p.page_number = ?",
+            (unit_number, page_number)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"unit_title": row[0], "page_number": page_number, "sections": json.loads(row[1])}
+
+    def load_note(self, note_id, owner):
+        row = self._conn().execute(
+            "SELECT unit_number, page_number, section_id, text, date, owner FROM notes WHERE id = ? AND owner = ?",
+            (note_id, owner)
+        ).fetchone()
+        if row is None:
+            return None
+        unit_num, page_num, section_id, text, date, owner = row
+        return f"{unit_num}-{page_num}-{section_id}", _note_record(note_id, text, date, owner)
+
+    def load_summary(self, summary_id):
+        row = self._conn().execute("SELECT data FROM summaries WHERE id = ?", (summary_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    # Artımlı yazma: her değişiklik kendi küçük işlemi
+    def _upsert_page(self, conn, unit_number, unit_title, page_number, sections):
+        conn.execute(
+            "INSERT INTO units (unit_number, unit_title) VALUES (?, ?) ON CONFLICT(unit_number) DO NOTHING",
+            (unit_number, unit_title)
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO pages (unit_number, page_number, sections) VALUES (?, ?, ?)",
+            (unit_number, page_number, json.dumps(sections, ensure_ascii=False))
+        )
+        self._journal(conn, 'pages', f"{unit_number}-{page_number}", 'upsert')
+
+    def _free_note_id(self, conn, note_id, owner):
+        """Not id'si başka bir kullanıcıya aitse kullanılmayan en yakın id"""
+        while conn.execute("SELECT 1 FROM notes WHERE id = ? AND owner != ?", (note_id, owner)).fetchone():
+            note_id += 1e-6
+        return note_id
+
+    def _upsert_note(self, conn, note_key, note, owner):
+        """Notu owner kullanıcısına yazar ve kullanılan id'yi döndürür"""
+        unit_num, page_num, section_id = split_note_key(note_key)
+        note_id = self._free_note_id(conn, note['id'], owner)
+        conn.execute(
+            "INSERT OR REPLACE INTO notes (id, unit_number, page_number, section_id, text, date, owner) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (note_id, unit_num, page_num, section_id, note['text'], note['date'], owner)
+        )
+        self._journal(conn, 'notes', repr(note_id), 'upsert', owner)
+        return note_id
+
+    def _delete_note(self, conn, note_id, owner):
+        conn.execute("DELETE FROM notes WHERE id = ? AND owner = ?", (note_id, owner))
+        self._journal(conn, 'notes', repr(note_id), 'delete', owner)
+
+    def _insert_summary(self, conn, summary):
+        cursor = conn.execute("INSERT INTO summaries (data) VALUES (?)", (json.dumps(summary, ensure_ascii=False),))
+        self._journal(conn, 'summaries', cursor.lastrowid, 'upsert')
+
+    def add_page(self, unit_number, unit_title, page_number, sections):
+        with self._conn() as conn:
+            self._upsert_page(conn, unit_number, unit_title, page_number, sections)
+
+    def add_pages(self, pages):
+        """Birden çok sayfayı tek işlemde yazar"""
+        with self._conn() as conn:
+            for page in pages:
+                self._upsert_page(conn, page['unit_number'], page['unit_title'], page['page_number'], page['sections'])
+
+    def add_attempt(self, test_id, date, answers, correct, total):
+        """Tamamlanan test denemesini yazar ve id'sini döndürür"""
+        with self._conn() as conn:
+            cursor = conn.execute(
+                "INSERT INTO attempts (test_id, date, answers, correct, total) VALUES (?, ?, ?, ?, ?)",
+                (json.dumps(test_id), date, json.dumps(answers, ensure_ascii=False), correct, total)
+            )
+            return cursor.lastrowid
+
+    def add_note(self, note_key, note, owner):
+        """Notu yazar; id başka kullanıcının notuyla çakışırsa değişen id'yi döndürür"""
+        with self._conn() as conn:
+            return self._upsert_note(conn, note_key, note, owner)
+
+    def delete_note(self, note_id, owner):
+        with self._conn() as conn:
+            self._delete_note(conn, note_id, owner)
+
+    def add_summary(self, summary):
+        with self._conn() as conn:
+            self._insert_summary(conn, summary)
+
+    # Toplu yazma (JSON içe aktarma, demo verisi)
+    def transaction(self):
+        """Birden çok toplu yazmayı tek işlemde toplamak için bağlantı bağlamı"""
+        return self._conn()
+
+    def clear_collection(self, conn, collection, owner=''):
+        """Koleksiyonu boşaltır; notlarda yalnızca owner kullanıcısının notları silinir"""
+        if collection == 'notes':
+            self._journal(conn, collection, '*', 'replace', owner)
+            conn.execute("DELETE FROM notes WHERE owner = ?", (owner,))
+            return
+        self._journal(conn, collection, '*', 'replace')
+        if collection == 'lessons':
+            conn.execute("DELETE FROM pages")
+            conn.execute("DELETE FROM units")
+        else:
+            conn.execute(f"DELETE FROM {collection}")
+
+    def insert_records(self, conn, collection, records, owner=''):
+        """Koleksiyona kayıt ekler; notlar (anahtar, not listesi) çiftleri olarak gelir ve owner'a yazılır
+
+        Başka bir kullanıcının notuyla aynı id'yi taşıyan not yeni bir id alır.
+        """
+        if collection == 'lessons':
+            conn.executemany(
+                "INSERT OR REPLACE INTO units (unit_number, unit_title) VALUES (?, ?)",
+                [(lesson['unit_number'], lesson['unit_title']) for lesson in records]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO pages (unit_number, page_number, sections) VALUES (?, ?, ?)",
+                [
+                    (lesson['unit_number'], page['page_number'], json.dumps(page['sections'], ensure_ascii=False))
+                    for lesson in records for page in lesson.get('pages', [])
+                ]
+            )
+        elif collection == 'tests':
+            conn.executemany(
+                "INSERT INTO tests (data) VALUES (?)",
+                [(json.dumps(test, ensure_ascii=False),) for test in records]
+            )
+        elif collection == 'notes':
+            rows = []
+            for note_key, note_list in records:
+                unit_num, page_num, section_id = split_note_key(note_key)
+                rows.extend(
+                    (self._free_note_id(conn, note['id'], owner), unit_num, page_num, section_id,
+                     note['text'], note['date'], owner)
+                    for note in note_list
+                )
+            conn.executemany(
+                "INSERT OR REPLACE INTO notes (id, unit_number, page_number, section_id, text, date, owner) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        elif collection == 'summaries':
+            conn.executemany(
+                "INSERT INTO summaries (data) VALUES (?)",
+                [(json.dumps(summary, ensure_ascii=False),) for summary in records]
+            )
+
+    def replace_collection(self, conn, collection, records, owner=''):
+        self.clear_collection(conn, collection, owner)
+        self.insert_records(conn, collection, records, owner)
+
+    def replace_all(self, data):
+        """Verilen koleksiyonları tek işlemde değiştirir; eksik olanlara dokunmaz (notlar sahipsiz kullanıcıya)"""
+        with self._conn() as conn:
+            for collection in ('lessons', 'tests', 'notes', 'summaries'):
+                if collection in data:
+                    records = data[collection]
+                    if collection == 'notes':
+                        records = records.items()
+                    self.replace_collection(conn, collection, records)
+
+    def number_note_pages(self, conn, owner=None, note_ids=None):
+        """Sayfa sırasıyla (1, 2, ...) kaydedilmiş notları sayfa numarasına taşır
+
+        Eski depolar ve yedekler notun sayfasını ünitedeki sırasıyla tutar; araya sayfa
+        eklenince not başka sayfaya kayardı. owner ya da note_ids verilirse yalnızca
+        o notlar taşınır. Taşınan not sayısını döndürür.
+        """
+        numbers = {}
+        for unit_num, page_num in conn.execute("SELECT unit_number, page_number FROM pages ORDER BY unit_number, page_number"):
+            numbers.setdefault(unit_num, []).append(page_num)
+        if owner is None:
+            rows = conn.execute("SELECT id, unit_number, page_number, owner FROM notes").fetchall()
+        else:
+            rows = conn.execute("SELECT id, unit_number, page_number, owner FROM notes WHERE owner = ?", (owner,)).fetchall()
+        if note_ids is not None:
+            note_ids = set(note_ids)
+            rows = [row for row in rows if row[0] in note_ids]
+        moved = []
+        for note_id, unit_num, position, note_owner in rows:
+            unit_pages = numbers.get(unit_num, [])
+            if 1 <= position <= len(unit_pages) and unit_pages[position - 1] != position:
+                moved.append((unit_pages[position - 1], note_id, note_owner))
+        conn.executemany("UPDATE notes SET page_number = ? WHERE id = ?", [(page_num, note_id) for page_num, note_id, _ in moved])
+        for _, note_id, note_owner in moved:
+            self._journal(conn, 'notes', repr(note_id), 'upsert', note_owner)
+        return len(moved)
+
+    def merge_delta(self, delta, conn=None, owner=''):
+        """Artımlı yedeği mevcut verinin üzerine uygular; notlar owner kullanıcısına yazılır"""
+        if conn is None:
+            with self._conn() as conn:
+                return self.merge_delta(delta, conn, owner)
+        replaced = set(delta.get('replaced', []))
+        if 'lessons' in replaced:
+            self.replace_collection(conn, 'lessons', delta.get('lessons', []))
+        else:
+            for lesson in delta.get('lessons', []):
+                for page in lesson.get('pages', []):
+                    self._upsert_page(conn, lesson['unit_number'], lesson['unit_title'], page['page_number'], page['sections'])
+        if 'tests' in delta:
+            self.replace_collection(conn, 'tests', delta['tests'])
+        if 'notes' in replaced:
+            self.replace_collection(conn, 'notes', delta.get('notes', {}).items(), owner)
+        else:
+            for note_id in delta.get('deleted_notes', []):
+                self._delete_note(conn, note_id, owner)
+            for note_key, note_list in delta.get('notes', {}).items():
+                for note in note_list:
+                    self._upsert_note(conn, note_key, note, owner)
+        if 'summaries' in replaced:
+            self.replace_collection(conn, 'summaries', delta.get('summaries', []))
+        else:
+            for summary in delta.get('summaries', []):
+                self._insert_summary(conn, summary)
+
+
+_depo = None
+_depo_lock = threading.Lock()
+
+
+def get_depo():
+    """Süreç genelindeki depo; ilk çağrıda boşsa demo içerikle doldurulur"""
+    global _depo
+    with _depo_lock:
+        if _depo is None:
+            _depo = Depo(CONFIG['db_path'])
+            if _depo.is_empty():
+                _depo.replace_all({"lessons": DEMO_LESSONS, "tests": DEMO_TESTS})
+        return _depo
@@ -0,0 +1,223 @@
+import base64
+import html
+import io
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from modules.grafik_turleri import GRAPH_SLIDERS, GRAPH_TYPES, graph_options, graph_params, graph_topic, overlay_values
+from modules.icerik import section_title
+from modules.onbellek import render_graph
+from modules.yapilandirma import CONFIG
+
+# Formüller matplotlib mathtext ile SVG'ye çizilip gömülür; dosya çevrimdışı açılır
+FORMULA_SIZE = 16
+
+_STYLE = """
+body { font-family: "DejaVu Sans", Arial, sans-serif; max-width: 900px; margin: 2rem auto; color: #222; line-height: 1.5; }
+h1 { color: #4b3f9e; border-bottom: 3px solid #764ba2; padding-bottom: .3rem; }
+h2 { color: #4b3f9e; margin-top: 2rem; }
+.unit { page-break-before: always; }
+.unit:first-of-type { page-break-before: avoid; }
+.page { page-break-inside: avoid; border-top: 1px solid #ddd; padding-top: .5rem; }
+.formula { text-align: center; margin: 1rem 0; }
+.formula pre { display: inline-block; text-align: left; background: #f6f6f6; padding: .3rem .6rem; }
+figure { margin: 1rem 0; text-align: center; }
+figure img { max-width: 100%; }
+figcaption { color: #666; font-size: .9rem; }
+table { border-collapse: collapse; margin: .5rem auto; font-size: .9rem; }
+td, th { border: 1px solid #ccc; padding: .2rem .6rem; }
+.note { background: #fff8dc; border-left: 4px solid #e0b000; padding: .4rem .8rem; margin: .4rem 0; }
+.note small { color: #777; }
+.missing { color: #a00; font-style: italic; }
+@media print { body { margin: 0; max-width: none; } }
+"""
+
+_BOLD = re.compile(r"\*\*(.+?)\*\*")
+_ITALIC = re.compile(r"(?<![*\w])\*(?!\s)(.+?)(?<!\s)\*(?![*\w])")
+_CODE = re.compile(r"`([^`]+)`")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*)$")
+_BULLET = re.compile(r"^\s*[-*•]\s+(.*)$")
+_NUMBERED = re.compile(r"^\s*\d+[.)]\s+(.*)$")
+
+
+def _inline(text):
+    text = html.escape(text, quote=False)
+    text = _CODE.sub(r"<code>\1</code>", text)
+    text = _BOLD.sub(r"<strong>\1</strong>", text)
+    return _ITALIC.sub(r"<em>\1</em>", text)
+
+
+def markdown_html(text):
+    """Ders metinlerinde kullanılan Markdown alt kümesi: başlık, kalın, italik, kod, liste, paragraf"""
+    parts, paragraph, items, list_tag = [], [], [], None
+
+    def flush():
+        nonlocal paragraph, items, list_tag
+        if paragraph:
+            parts.append("<p>" + "<br>".join(_inline(line) for line in paragraph) + "</p>")
+            paragraph = []
+        if items:
+            parts.append(f"<{list_tag}>" + "".join(f"<li>{_inline(item)}</li>" for item in items) + f"</{list_tag}>")
+            items, list_tag = [], None
+
+    for line in text.splitlines():
+        heading, bullet, numbered = _HEADING.match(line), _BULLET.match(line), _NUMBERED.match(line)
+        if not line.strip():
+            flush()
+        elif heading:
+            flush()
+            level = min(len(heading.group(1)) + 2, 6)
+            parts.append(f"<h{level}>{_inline(heading.group(2))}</h{level}>")
+        elif bullet or numbered:
+            tag = "ul" if bullet else "ol"
+            if paragraph or (items and list_tag != tag):
+                flush()
+            list_tag = tag
+            items.append((bullet or numbered).group(1))
+        else:
+            if items:
+                flush()
+            paragraph.append(line)
+    flush()
+    return "\n".join(parts)
+
+
+def graph_values(section):
+    """Grafik bölümünün varsayılan slider değerleri ve seçenekleri ile senaryoları"""
+    graph_type = section.get('graph_type', 'budget_constraint')
+    params = graph_params(graph_type, section.get('params', {}))
+    overlay = None
+    if 'overlay' in section:
+        overlay = (section['overlay']['param'], overlay_values(section['overlay']))
+    values = {
+        name: params.get(name, default)
+        for name, _, _, _, default, _ in GRAPH_SLIDERS.get(graph_type, [])
+        if not overlay or name != overlay[0]
+    }
+    values.update(graph_options(graph_type, params))
+    return graph_type, values, overlay
+
+
+def _render(job):
+    graph_type, values, overlay = job
+    try:
+        return render_graph(graph_type, values, overlay)
+    except TimeoutError:
+        return None
+
+
+def formula_html(latex):
+    """Formülün gömülü SVG görüntüsü; mathtext'in desteklemediği formüller kaynak olarak gösterilir"""
+    from matplotlib.font_manager import FontProperties
+    from matplotlib.mathtext import math_to_image
+
+    buffer = io.BytesIO()
+    try:
+        math_to_image(f"${latex}$", buffer, prop=FontProperties(size=FORMULA_SIZE), format="svg")
+    except ValueError:
+        return f'<div class="formula"><pre>{html.escape(latex)}</pre></div>'
+    data = base64.b64encode(buffer.getvalue()).decode("ascii")
+    return f'<div class="formula"><img src="data:image/svg+xml;base64,{data}" alt="{html.escape(latex)}"></div>'
+
+
+def _table_html(rows):
+    if not rows:
+        return ""
+    header = "".join(f"<th>{html.escape(str(name))}</th>" for name in rows[0])
+    body = "".join(
+        "<tr>" + "".join(f"<td>{'' if value is None else html.escape(str(value))}</td>" for value in row.values()) + "</tr>"
+        for row in rows
+    )
+    return f"<table><tr>{header}</tr>{body}</table>"
+
+
+def _section_html(section, png, notes):
+    if section['type'] == 'text':
+        body = markdown_html(section['content'])
+    elif section['type'] == 'formula':
+        body = formula_html(section['content'])
+    else:
+        graph_type, values, _ = graph_values(section)
+        topic = graph_topic(graph_type)
+        caption = section.get('description', topic['aciklama'] if topic else '')
+        if png is None:
+            image = '<p class="missing">Grafik çizilemedi.</p>'
+        else:
+            image = f'<img src="data:image/png;base64,{base64.b64encode(png).decode("ascii")}" alt="{html.escape(section.get("title", "Grafik"))}">'
+        table = ""
+        if GRAPH_TYPES.get(graph_type, {}).get('table'):
+            from modules.cekirdekler import series_table
+            table = _table_html(series_table(graph_type, values))
+        body = (f"<h3>{html.escape(section_title(section))}</h3>"
+                f"<figure>{image}<figcaption>{html.escape(caption)}</figcaption></figure>{table}")
+    for note in notes:
+        body += (f'<div class="note"><small>💡 {html.escape(note["date"])}</small><br>'
+                 f'{html.escape(note["text"]).replace(chr(10), "<br>")}</div>')
+    return body
+
+
+def export_units(content, unit_numbers, notes=None, on_progress=None):
+    """Üniteleri tek bir durağan HTML belgesine çevirir; grafikler paralel çizilir
+
+    Grafikler uygulamadaki gibi bölümün varsayılan parametreleriyle (ve senaryolarıyla)
+    çizilir; notes (NoteStore) verilirse her bölümün altına o bölümün notları eklenir.
+    on_progress(oran) her grafik bittiğinde çağrılır.
+    """
+    units = [content.unit(unit_number) for unit_number in unit_numbers]
+    units = [unit for unit in units if unit is not None]
+
+    # Önce tüm grafikler toplanır; çizim havuzu sınırlı olduğu için eşzamanlılık işçi sayısını aşmaz
+    jobs = {}
+    for unit in units:
+        for position, page in enumerate(content.pages(unit['unit_number']), 1):
+            for section in page['sections']:
+                if section['type'] == 'graph' and section.get('graph_type', 'budget_constraint') in GRAPH_SLIDERS:
+                    jobs[(unit['unit_number'], position, section['id'])] = graph_values(section)
+
+    started = time.perf_counter()
+    images = {}
+    workers = max(1, CONFIG['render_workers'])
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mikro-export") as executor:
+        futures = {key: executor.submit(_render, job) for key, job in jobs.items()}
+        for done, (key, future) in enumerate(futures.items(), 1):
+            images[key] = future.result()
+            if on_progress is not None:
+                on_progress(done / len(futures))
+    render_seconds = time.perf_counter() - started
+
+    body = []
+    for unit in units:
+        unit_number = unit['unit_number']
+        body.append(f'<section class="unit"><h1>Ünite {unit_number}: {html.escape(unit["unit_title"])}</h1>')
+        for position, page in enumerate(content.pages(unit_number), 1):
+            body.append(f'<div class="page"><h2>Sayfa {position}</h2>')
+            for section in page['sections']:
+                section_notes = notes.for_section(unit_number, page['page_number'], section['id']) if notes is not None else []
+                body.append(_section_html(section, images.get((unit_number, position, section['id'])), section_notes))
+            body.append("</div>")
+        body.append("</section>")
+
+    title = "Mikro Ekonomi Lab — " + ", ".join(f"Ünite {unit['unit_number']}" for unit in units)
+    document = f"""<!DOCTYPE html>
+<html lang="tr">
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<style>{_STYLE}</style>
+</head>
+<body>
+{"".join(body)}
+<p><small>{datetime.now().strftime("%d.%m.%Y %H:%M")} tarihinde oluşturuldu.</small></p>
+</body>
+</html>
+"""
+    return {
+        "data": document.encode("utf-8"),
+        "file_name": f"mikro_ders_{datetime.now().strftime('%Y%m%d_%H%M')}.html",
+        "mime": "text/html",
+        "graphs": len(jobs),
+        "missing": sum(png is None for png in images.values()),
+        "render_seconds": render_seconds,
+    }
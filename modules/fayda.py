@@ -0,0 +1,136 @@
+import numpy as np
+
+# İki dönemli modelde desteklenen fayda aileleri
+#   cobb_douglas:    U = C₁^α · C₂^(1-α)
+#   ces:             U = (α·C₁^ρ + (1-α)·C₂^ρ)^(1/ρ),  ρ = (σ-1)/σ
+#   time_preference: U = u(C₁) + β·u(C₂),  u(c) = c^(1-θ)/(1-θ)  (θ = 1 için ln c)
+UTILITY_FAMILIES = ("cobb_douglas", "ces", "time_preference")
+
+# Bölümlerde verilmeyen tercih parametrelerinin varsayılanları
+DEFAULT_PREFERENCES = {"alpha": 0.5, "sigma": 0.5, "beta": 0.95, "theta": 2.0}
+
+# Tüm fonksiyonlar numpy yayınlama (broadcasting) kurallarıyla dizi üzerinde çalışır;
+# R₁, R₂, j₁₂ ve tercih parametreleri skaler ya da aynı boyuta yayılabilen diziler olabilir.
+
+
+def _crra(c, theta):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(theta == 1, np.log(c), c ** (1 - theta) / (1 - theta))
+
+
+def _crra_inverse(u, theta):
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # θ ≠ 1 için (1-θ)·u pozitif olmalı; değilse bu fayda düzeyine ulaşılamaz
+        base = (1 - theta) * u
+        power = np.where(base > 0, base, np.nan) ** (1 / (1 - theta))
+        return np.where(theta == 1, np.exp(u), power)
+
+
+def _ces_rho(sigma):
+    return (sigma - 1) / sigma
+
+
+def tangency_ratio(utility, gross, prefs):
+    """Teğetlik koşulundan optimum C₂/C₁ oranı; gross = 1 + j₁₂"""
+    alpha, sigma, beta, theta = (prefs[name] for name in ("alpha", "sigma", "beta", "theta"))
+    if utility == "cobb_douglas":
+        return gross * (1 - alpha) / alpha
+    if utility == "ces":
+        return (gross * (1 - alpha) / alpha) ** sigma
+    if utility == "time_preference":
+        # Euler denklemi: u'(C₁) = β(1+j₁₂)·u'(C₂)
+        return (beta * gross) ** (1 / theta)
+    raise ValueError(f"Bilinmeyen fayda ailesi: {utility}")
+
+
+def utility_level(utility, C1, C2, prefs):
+    alpha = prefs["alpha"]
+    if utility == "cobb_douglas":
+        return C1 ** alpha * C2 ** (1 - alpha)
+    if utility == "ces":
+        rho = _ces_rho(prefs["sigma"])
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            ces = (alpha * C1 ** rho + (1 - alpha) * C2 ** rho) ** (1 / rho)
+        # σ = 1 sınırında CES, Cobb-Douglas'a dönüşür
+        return np.where(np.abs(rho) < 1e-9, C1 ** alpha * C2 ** (1 - alpha), ces)
+    if utility == "time_preference":
+        return _crra(C1, prefs["theta"]) + prefs["beta"] * _crra(C2, prefs["theta"])
+    raise ValueError(f"Bilinmeyen fayda ailesi: {utility}")
+
+
+def indifference_curve(utility, C1, level, prefs):
+    """level fayda düzeyindeki kayıtsızlık eğrisinin C₁ noktalarındaki C₂ değerleri
+
+    Eğrinin tanımlı olmadığı noktalar NaN döner.
+    """
+    alpha = prefs["alpha"]
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        if utility == "cobb_douglas":
+            return (level / C1 ** alpha) ** (1 / (1 - alpha))
+        if utility == "ces":
+            rho = _ces_rho(prefs["sigma"])
+            base = (level ** rho - alpha * C1 ** rho) / (1 - alpha)
+            ces = np.where(base > 0, base, np.nan) ** (1 / rho)
+            return np.where(np.abs(rho) < 1e-9, (level / C1 ** alpha) ** (1 / (1 - alpha)), ces)
+        if utility == "time_preference":
+            return _crra_inverse((level - _crra(C1, prefs["theta"])) / prefs["beta"], prefs["theta"])
+    raise ValueError(f"Bilinmeyen fayda ailesi: {utility}")
+
+
+def scale_to_utility(utility, level, ratio, prefs):
+    """C₂ = ratio·C₁ ışını üzerinde level faydasını veren C₁ (Hicks talebi için)"""
+    if utility in ("cobb_douglas", "ces"):
+        # Birinci dereceden homojen: U(C₁, k·C₁) = C₁·U(1, k)
+        return level / utility_level(utility, 1.0, ratio, prefs)
+    if utility == "time_preference":
+        beta, theta = prefs["beta"], prefs["theta"]
+        with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+            log_case = np.exp((level - beta * np.log(ratio)) / (1 + beta))
+            power_case = (level * (1 - theta) / (1 + beta * ratio ** (1 - theta))) ** (1 / (1 - theta))
+        return np.where(theta == 1, log_case, power_case)
+    raise ValueError(f"Bilinmeyen fayda ailesi: {utility}")
+
+
+def preferences(alpha=None, sigma=None, beta=None, theta=None):
+    """Verilmeyen tercih parametrelerini varsayılanlarla doldurup dizilere çevirir"""
+    given = {"alpha": alpha, "sigma": sigma, "beta": beta, "theta": theta}
+    return {
+        name: np.asarray(DEFAULT_PREFERENCES[name] if value is None else value, dtype=float)
+        for name, value in given.items()
+    }
+
+
+def solve(utility, R1, R2, j12, prefs):
+    """Bütçe kısıtı altında kapalı biçimli optimum: (C₁*, C₂*, U*)
+
+    Bütçe: C₁ + C₂/(1+j₁₂) = R₁ + R₂/(1+j₁₂)
+    """
+    gross = 1 + np.asarray(j12, dtype=float)
+    wealth = R1 + R2 / gross
+    ratio = tangency_ratio(utility, gross, prefs)
+    C1 = wealth / (1 + ratio / gross)
+    C2 = ratio * C1
+    return C1, C2, utility_level(utility, C1, C2, prefs)
+
+
+def slutsky(utility, R1, R2, j_base, j_new, prefs):
+    """Faiz j_base'ten j_new'e değişince C₁ ve tasarruftaki değişimin ayrıştırılması
+
+    İkame etkisi: başlangıç fayda düzeyinde (Hicks) yeni fiyata uyum.
+    Gelir etkisi: kalan kısım; başlangıç gelirinin (R) değer değişimini de içerir.
+    """
+    C1_base, C2_base, U_base = solve(utility, R1, R2, j_base, prefs)
+    C1_new, C2_new, _ = solve(utility, R1, R2, j_new, prefs)
+    ratio_new = tangency_ratio(utility, 1 + np.asarray(j_new, dtype=float), prefs)
+    C1_hicks = scale_to_utility(utility, U_base, ratio_new, prefs)
+    return {
+        "C1_base": C1_base,
+        "C1_new": C1_new,
+        "C2_new": C2_new,
+        "C1_hicks": C1_hicks,
+        "substitution": C1_hicks - C1_base,
+        "income": C1_new - C1_hicks,
+        "total": C1_new - C1_base,
+        # Tasarruf S = R₁ - C₁; C₁'deki her etki tasarrufu ters yönde değiştirir
+        "saving": R1 - C1_new,
+    }
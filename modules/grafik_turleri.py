@@ -0,0 +1,168 @@
+# Yalnızca veri: matplotlib / numpy içe aktarmadan grafik türlerini tanımak için
+from collections.abc import Mapping
+
+from modules.veri import EKONOMI_KONULARI
+
+# Tek bir bölümde üst üste çizilebilecek en fazla senaryo
+MAX_SCENARIOS = 50
+
+# Grafik türü kaydı: başlıklar, parametreler ve numpy çekirdeğinin yolu
+GRAPH_TYPES = {}
+
+# Grafik türlerinin slider tanımları: (parametre, etiket, min, max, varsayılan, adım)
+GRAPH_SLIDERS = {}
+
+
+def register_graph_type(name, title, xlabel, ylabel, params, kernel, topic=None, options=None, table=False,
+                        legacy=None):
+    """Yeni grafik türünü kaydeder; sayfa çizici, doğrulama ve ön ısıtma bu kayıttan okur
+
+    kernel "modül:fonksiyon" biçimindedir ve ilk çizimde içe aktarılır. Çekirdek her
+    parametre için (n,) boyutlu diziler alır ve n senaryonun eğrilerini tek seferde
+    hesaplar. topic, EKONOMI_KONULARI içindeki konunun anahtarıdır. options slider
+    olmayan bölüm parametreleridir: {ad: (varsayılan, seçenekler ya da (min, max))};
+    varsayılanı sözlük olan seçenekler arz/talep eğrisi tanımıdır ve seçenekleri eğri biçimleridir.
+    table True ise çekirdek bölümün altında gösterilecek bir tablo da üretir. legacy,
+    türün eski sürümlerindeki parametreleri güncel parametrelere çeviren işlevdir.
+    """
+    if topic is not None and topic not in EKONOMI_KONULARI:
+        raise ValueError(f"Bilinmeyen konu: {topic}")
+    GRAPH_TYPES[name] = {
+        "title": title,
+        "xlabel": xlabel,
+        "ylabel": ylabel,
+        "params": list(params),
+        "kernel": kernel,
+        "topic": topic,
+        "options": dict(options or {}),
+        "table": table,
+        "legacy": legacy,
+    }
+    GRAPH_SLIDERS[name] = GRAPH_TYPES[name]["params"]
+
+
+def graph_topic(graph_type):
+    """Grafik türünün bağlı olduğu konu (başlık, açıklama, formül) ya da None"""
+    topic = GRAPH_TYPES.get(graph_type, {}).get("topic")
+    return EKONOMI_KONULARI.get(topic) if topic else None
+
+
+def graph_params(graph_type, params):
+    """Bölüm parametreleri; türün eski sürümlerindeki parametreler güncel karşılıklarına çevrilir"""
+    legacy = GRAPH_TYPES.get(graph_type, {}).get("legacy")
+    return legacy(params) if legacy is not None else params
+
+
+def _plain(value):
+    # İçerik deposunun salt okunur görünümleri önbellek anahtarına çevrilemez (bkz. onbellek._rounded)
+    if isinstance(value, Mapping):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    return value
+
+
+def graph_options(graph_type, params):
+    """Bölüm parametrelerinden grafik türünün slider olmayan seçenekleri"""
+    options = GRAPH_TYPES.get(graph_type, {}).get("options", {})
+    return {name: _plain(params[name]) for name in options if name in params}
+
+
+def overlay_values(overlay):
+    """Bölümdeki senaryo tanımından değer listesi: {"values": [...]} ya da {"min", "max", "count"}"""
+    if "values" in overlay:
+        return [float(value) for value in overlay["values"]]
+    count = int(overlay["count"])
+    if count == 1:
+        return [float(overlay["min"])]
+    step = (overlay["max"] - overlay["min"]) / (count - 1)
+    return [overlay["min"] + step * idx for idx in range(count)]
+
+
+# İki dönemli modelin fayda ailesi ve tercih parametreleri (bkz. modules/fayda.py)
+UTILITY_OPTIONS = {
+    "utility": ("cobb_douglas", ("cobb_douglas", "ces", "time_preference")),
+    "alpha": (0.5, (0.01, 0.99)),
+    "sigma": (0.5, (0.05, 5.0)),
+    "beta": (0.95, (0.5, 1.5)),
+    "theta": (2.0, (0.1, 10.0)),
+}
+
+INTERTEMPORAL_SLIDERS = [
+    ("R1", "R₁ - Gelir 1", 50, 200, 100, 1),
+    ("R2", "R₂ - Gelir 2", 50, 200, 80, 1),
+    ("j12", "j₁₂ - Faiz", 0.0, 0.5, 0.1, 0.01),
+]
+
+register_graph_type(
+    "budget_constraint",
+    title="İki Dönemli Tüketici Optimumu",
+    xlabel="C₁ (Birinci Dönem Tüketimi)",
+    ylabel="C₂ (İkinci Dönem Tüketimi)",
+    params=INTERTEMPORAL_SLIDERS,
+    kernel="modules.cekirdekler:budget_constraint_kernel",
+    topic="iki_donemli_tuketici",
+    options=UTILITY_OPTIONS,
+)
+
+register_graph_type(
+    "intertemporal_statics",
+    title="Faiz Oranı ve Tasarruf: İkame ve Gelir Etkileri",
+    xlabel="j₁₂ (Faiz Oranı)",
+    ylabel="Tasarruf Değişimi (ΔS)",
+    params=INTERTEMPORAL_SLIDERS,
+    kernel="modules.cekirdekler:intertemporal_statics_kernel",
+    topic="iki_donemli_tuketici",
+    options=UTILITY_OPTIONS,
+    table=True,
+)
+
+# Arz ve talep eğrisi biçimleri ve zorunlu alanları (bkz. modules/denge.py)
+CURVE_FIELDS = {
+    "linear": ("intercept", "slope"),
+    "constant_elasticity": ("scale", "elasticity"),
+    "piecewise": ("prices", "quantities"),
+}
+
+# Varsayılan eğriler: Q = 200 - 10P ve Q = 10P, denge (Q, P) = (100, 10)
+DEFAULT_DEMAND = {"form": "linear", "intercept": 200, "slope": -10}
+DEFAULT_SUPPLY = {"form": "linear", "intercept": 0, "slope": 10}
+
+SHIFT_RANGE = (-50, 50)
+
+
+def _supply_demand_legacy(params):
+    """Eski P_eq / Q_eq slider'ları yalnızca denge işaretini taşırdı; yerine varsayılan
+    eğrileri (Q_eq, P_eq) noktasında kesiştiren talep ve arz kaymaları kullanılır"""
+    if 'P_eq' not in params and 'Q_eq' not in params:
+        return params
+    price = params.get('P_eq', 10)
+    quantity = params.get('Q_eq', 100)
+    converted = {name: value for name, value in params.items() if name not in ('P_eq', 'Q_eq')}
+    # Q = a + bP + ΔQ doğrusal eğrilerinde (Q_eq, P_eq) noktasından geçiren kayma; slider aralığına sığdırılır
+    for name, curve in (("demand_shift", DEFAULT_DEMAND), ("supply_shift", DEFAULT_SUPPLY)):
+        shift = quantity - curve["intercept"] - curve["slope"] * price
+        converted.setdefault(name, min(max(shift, SHIFT_RANGE[0]), SHIFT_RANGE[1]))
+    return converted
+
+
+register_graph_type(
+    "supply_demand",
+    title="Arz ve Talep Dengesi",
+    xlabel="Miktar (Q)",
+    ylabel="Fiyat (P)",
+    params=[
+        ("demand_shift", "Talep Kayması (ΔQ)", *SHIFT_RANGE, 0, 5),
+        ("supply_shift", "Arz Kayması (ΔQ)", *SHIFT_RANGE, 0, 5),
+        ("tax", "Birim Vergi (t)", 0.0, 5.0, 0.0, 0.5),
+    ],
+    kernel="modules.cekirdekler:supply_demand_kernel",
+    topic="arz_talep",
+    options={
+        "demand": (DEFAULT_DEMAND, tuple(CURVE_FIELDS)),
+        "supply": (DEFAULT_SUPPLY, tuple(CURVE_FIELDS)),
+        "ceiling": (None, (0.0, 1000.0)),
+    },
+    table=True,
+    legacy=_supply_demand_legacy,
+)
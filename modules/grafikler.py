@@ -1,32 +1,237 @@
-import matplotlib.pyplot as plt
+import io
+import threading
+
 import numpy as np
+from matplotlib import colormaps
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import LineCollection
+from matplotlib.colors import Normalize
+from matplotlib.figure import Figure
+
+from modules.cekirdekler import compute_series
+from modules.grafik_turleri import GRAPH_TYPES
+
+
+# pyplot kullanılmaz: onun "geçerli figür" durumu süreç geneldir ve aynı anda çizim yapan
+# oturumlar arasında paylaşılır. Her figür kendi Agg tuvaliyle kurulur ve çöp toplayıcıyla gider.
+
+
+def new_figure():
+    """pyplot'a kaydedilmeyen, kendi Agg tuvali olan figür ve ekseni"""
+    fig = Figure(figsize=(10, 8))
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
 
-def butce_egrisi_ciz(R1=100, R2=80, j12=0.1, C1_opt=60):
-    C1_max = R1 + R2/(1+j12)
-    C1_degerleri = np.linspace(0, C1_max, 100)
-    C2_degerleri = R1*(1+j12) + R2 - (1+j12)*C1_degerleri
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(C1_degerleri, C2_degerleri, 'b-', linewidth=2, label='Bütçe Doğrusu (AB)')
-    C2_opt = R1*(1+j12) + R2 - (1+j12)*C1_opt
-    ax.scatter(C1_opt, C2_opt, color='red', s=100, label='Optimum Nokta (P)', zorder=5)
-    ax.set_xlabel('C₁ - Birinci Dönem Tüketimi', fontsize=12)
-    ax.set_ylabel('C₂ - İkinci Dönem Tüketimi', fontsize=12)
-    ax.set_title('İki Dönemli Tüketici Modeli', fontsize=14)
-    ax.legend()
+
+def _format_point(x, y):
+    return f"({round(float(x), 1):g}, {round(float(y), 1):g})"
+
+
+def _segments(line):
+    return np.stack([line["x"], line["y"]], axis=-1)
+
+
+def _decorate(ax, spec, series):
+    """Eksen yazıları, başlık, ızgara, gösterge ve sınırlar"""
+    ax.set_xlabel(spec["xlabel"], fontsize=12, fontweight='bold')
+    ax.set_ylabel(spec["ylabel"], fontsize=12, fontweight='bold')
+    ax.set_title(spec["title"], fontsize=14, fontweight='bold')
     ax.grid(True, alpha=0.3)
+    legend = ax.legend(loc='upper right')
+    ax.set_xlim(*series["xlim"])
+    ax.set_ylim(*series["ylim"])
+    return legend
+
+
+def _info_box(ax, text):
+    return ax.text(0.02, 0.98, text, transform=ax.transAxes,
+                   verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
+
+
+def draw_graph(graph_type, params, overlay=None):
+    """Kayıtlı grafik türünü çizer; her eğri ailesi senaryo sayısından bağımsız tek bir LineCollection"""
+    spec = GRAPH_TYPES[graph_type]
+    series, scenario_values = compute_series(graph_type, params, overlay)
+    single = scenario_values is None
+    fig, ax = new_figure()
+
+    if not single:
+        norm = Normalize(scenario_values.min(), scenario_values.max())
+        scenario_colors = colormaps["viridis"](norm(scenario_values))
+
+    for line in series["lines"]:
+        collection = LineCollection(
+            _segments(line),
+            linewidths=line.get("width", 1),
+            linestyles=line.get("style", "-"),
+            alpha=line.get("alpha", 1.0),
+            colors=scenario_colors if not single and line.get("vary") else line["color"],
+            label=line["label"] if line["label"] else "_nolegend_",
+        )
+        ax.add_collection(collection)
+
+    for point in series["points"]:
+        label = point["label"]
+        if single:
+            label += ": " + _format_point(point["x"][0], point["y"][0])
+        ax.scatter(
+            point["x"], point["y"], s=point["size"] ** 2, zorder=5, label=label,
+            c=scenario_colors if not single else point["color"],
+        )
+        if single:
+            x, y = point["x"][0], point["y"][0]
+            # Ofset punto cinsinden: eksen ölçeği (faiz oranı ya da miktar) ne olursa olsun aynı uzaklık
+            ax.annotate(point["mark"], xy=(x, y), xytext=(12, 12), textcoords="offset points", fontsize=12,
+                        fontweight='bold', color=point["color"] if point["color"] != "k" else None)
+
+    _decorate(ax, spec, series)
+
+    if single and series["info"]:
+        _info_box(ax, series["info"][0])
+    if not single:
+        # Senaryo renkleri değişen parametrenin değerini gösterir
+        param_label = next(label for name, label, *_ in spec["params"] if name == overlay[0])
+        colorbar = fig.colorbar(ScalarMappable(norm=norm, cmap="viridis"), ax=ax, pad=0.02)
+        colorbar.set_label(param_label, fontsize=12)
+
     return fig
 
-def arz_talep_grafigi(arz_esneklik=1.0, talep_esneklik=-1.0, denge_fiyat=10):
-    fiyatlar = np.linspace(0, 20, 100)
-    talep_miktar = 100 + talep_esneklik * (fiyatlar - denge_fiyat) * 10
-    arz_miktar = 50 + arz_esneklik * (fiyatlar - denge_fiyat) * 10
-    fig, ax = plt.subplots(figsize=(10, 6))
-    ax.plot(talep_miktar, fiyatlar, 'r-', linewidth=2, label='Talep Eğrisi')
-    ax.plot(arz_miktar, fiyatlar, 'g-', linewidth=2, label='Arz Eğrisi')
-    ax.scatter(75, denge_fiyat, color='blue', s=100, label='Denge Noktası', zorder=5)
-    ax.set_xlabel('Miktar (Q)', fontsize=12)
-    ax.set_ylabel('Fiyat (P)', fontsize=12)
-    ax.set_title('Arz-Talep Dengesi', fontsize=14)
-    ax.legend()
-    ax.grid(True, alpha=0.3)
-    return fig
\ No newline at end of file
+
+def layout_key(graph_type, series):
+    """Figürün yapısını belirleyen her şey; yalnızca veriler farklıysa aynı figür yeniden kullanılır"""
+    return (
+        graph_type,
+        tuple((line["label"], line["color"], line.get("style", "-"), line.get("width", 1), line.get("alpha", 1.0))
+              for line in series["lines"]),
+        tuple((point["label"], point["mark"], point["color"], point["size"]) for point in series["points"]),
+        bool(series["info"]),
+    )
+
+
+class PooledFigure:
+    """Tek senaryolu grafik için bir kez kurulan figür; yeni parametrelerde yalnızca veriler güncellenir
+
+    Yalnızca onu havuzdan alan iş parçacığı kullanır.
+    """
+
+    def __init__(self, graph_type, series):
+        spec = GRAPH_TYPES[graph_type]
+        self.key = layout_key(graph_type, series)
+        self.fig, self.ax = new_figure()
+
+        self.lines = []
+        for line in series["lines"]:
+            collection = LineCollection(
+                _segments(line),
+                linewidths=line.get("width", 1),
+                linestyles=line.get("style", "-"),
+                alpha=line.get("alpha", 1.0),
+                colors=line["color"],
+                label=line["label"] if line["label"] else "_nolegend_",
+            )
+            self.ax.add_collection(collection)
+            self.lines.append(collection)
+
+        self.points = []
+        for point in series["points"]:
+            x, y = point["x"][0], point["y"][0]
+            scatter = self.ax.scatter([x], [y], s=point["size"] ** 2, zorder=5, c=point["color"],
+                                      label=point["label"] + ": " + _format_point(x, y))
+            annotation = self.ax.annotate(point["mark"], xy=(x, y), xytext=(12, 12), textcoords="offset points",
+                                          fontsize=12, fontweight='bold',
+                                          color=point["color"] if point["color"] != "k" else None)
+            self.points.append((scatter, annotation))
+
+        legend = _decorate(self.ax, spec, series)
+        # Gösterge satırları etiketli sanatçılarla aynı sıradadır; nokta etiketleri koordinat içerir
+        handles, _ = self.ax.get_legend_handles_labels()
+        texts = dict(zip(map(id, handles), legend.get_texts()))
+        self.legend_texts = [texts[id(scatter)] for scatter, _ in self.points]
+        self.info = _info_box(self.ax, series["info"][0]) if series["info"] else None
+
+    def update(self, series):
+        for collection, line in zip(self.lines, series["lines"]):
+            collection.set_segments(_segments(line))
+        for (scatter, annotation), text, point in zip(self.points, self.legend_texts, series["points"]):
+            x, y = point["x"][0], point["y"][0]
+            scatter.set_offsets([[x, y]])
+            annotation.xy = (x, y)
+            text.set_text(point["label"] + ": " + _format_point(x, y))
+        self.ax.set_xlim(*series["xlim"])
+        self.ax.set_ylim(*series["ylim"])
+        if self.info is not None:
+            self.info.set_text(series["info"][0])
+
+
+class FigurePool:
+    """Düzen anahtarı başına boşta bekleyen hazır figürler
+
+    Streamlit her yeniden çalıştırmayı farklı bir iş parçacığında yapabildiği için
+    figürler iş parçacığına bağlanmaz; acquire ile alınan figür release edilene kadar
+    yalnızca alanındır. Anahtar başına en fazla per_layout figür saklanır.
+    """
+
+    def __init__(self, per_layout=4):
+        self.per_layout = per_layout
+        self._idle = {}
+        self._lock = threading.Lock()
+        self.built = 0
+        self.reused = 0
+
+    def acquire(self, graph_type, params):
+        """Parametrelerle güncellenmiş bir figür; iş bitince release ile geri verilmeli"""
+        series, _ = compute_series(graph_type, params)
+        key = layout_key(graph_type, series)
+        with self._lock:
+            idle = self._idle.get(key)
+            pooled = idle.pop() if idle else None
+            if pooled is None:
+                self.built += 1
+            else:
+                self.reused += 1
+        if pooled is None:
+            return PooledFigure(graph_type, series)
+        pooled.update(series)
+        return pooled
+
+    def release(self, pooled):
+        with self._lock:
+            idle = self._idle.setdefault(pooled.key, [])
+            if len(idle) < self.per_layout:
+                idle.append(pooled)
+
+    def clear(self):
+        with self._lock:
+            self._idle.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "layouts": len(self._idle),
+                "idle": sum(len(idle) for idle in self._idle.values()),
+                "built": self.built,
+                "reused": self.reused,
+            }
+
+
+figure_pool = FigurePool()
+
+
+def figure_to_png(fig):
+    """Figürü st.pyplot ile aynı ayarlarla PNG baytlarına çevirir"""
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def prewarm_figure():
+    """Yazı tipi önbelleğini ve Agg çiziciyi ısıtmak için boş bir figür çizer"""
+    fig, ax = new_figure()
+    # Grafiklerde kullanılan yazı boyutları, kalınlıklar ve alt simge karakterleri
+    ax.plot([0, 1], [1, 0], 'b-', label='C₁ C₂ R₁ j₁₂ Ü ı ğ ş')
+    ax.set_xlabel('Miktar (Q)', fontsize=12, fontweight='bold')
+    ax.set_title('İki Dönemli Tüketici Optimumu', fontsize=14, fontweight='bold')
+    ax.annotate('P', xy=(0.5, 0.5), fontsize=12, fontweight='bold')
+    ax.legend(loc='upper right')
+    return len(figure_to_png(fig))
@@ -0,0 +1,232 @@
+import gzip
+import io
+import json
+
+from modules.sema import validate_lesson, validate_note_list, validate_summary, validate_test
+from modules.yedek import NOTE_PAGES
+
+READ_SIZE = 64 * 1024
+BATCH_SIZE = 200
+MAX_ERRORS = 1000
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\n\r'
+
+# Bir alanın liste / nesne değeri başlarken üretilen işaretler
+LIST_START = object()
+OBJECT_START = object()
+
+
+class _Reader:
+    """Metin akışı üzerinde, yalnızca gerektiği kadarını tamponda tutan okuyucu"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        if self.eof:
+            return False
+        chunk = self.stream.read(READ_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        # Tüketilmiş kısmı atarak tamponu sınırlı tut
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Boşlukları atlayıp sıradaki karakteri döndürür"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, chars):
+        char = self.peek()
+        if char == '' or char not in chars:
+            raise ValueError(f"Beklenen '{chars}', bulunan '{char or 'dosya sonu'}'")
+        self.pos += 1
+        return char
+
+    def value(self):
+        """Sıradaki tam JSON değerini çözer; değer tampona sığmıyorsa daha fazla okur"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if not self._fill():
+                    raise
+                continue
+            # Sayılar tampon sınırında bölünmüş olabilir
+            if end == len(self.buf) and not self.eof and isinstance(value, (int, float)):
+                self._fill()
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_items(stream):
+    """Üst düzey JSON nesnesini (alan, öğe) çiftleri halinde akıtır
+
+    Listeler öğe öğe, nesneler (ör. notes) (anahtar, değer) çiftleri halinde,
+    diğer değerler tek seferde üretilir. Liste ve nesnelerin başında
+    LIST_START / OBJECT_START işareti gelir; böylece boş koleksiyonlar da görülür.
+    """
+    reader = _Reader(stream)
+    reader.expect('{')
+    if reader.peek() == '}':
+        return
+    while True:
+        field = reader.value()
+        reader.expect(':')
+        opener = reader.peek()
+        if opener in '[{':
+            reader.pos += 1
+            closer = ']' if opener == '[' else '}'
+            yield field, LIST_START if opener == '[' else OBJECT_START
+            if reader.peek() == closer:
+                reader.pos += 1
+            else:
+                while True:
+                    if opener == '[':
+                        yield field, reader.value()
+                    else:
+                        key = reader.value()
+                        reader.expect(':')
+                        yield field, (key, reader.value())
+                    if reader.expect(',' + closer) == closer:
+                        break
+        else:
+            yield field, reader.value()
+        if reader.expect(',}') == '}':
+            return
+
+
+def open_upload(uploaded_file):
+    """Yüklenen dosyayı (gerekirse gzip çözerek) UTF-8 metin akışı olarak açar"""
+    raw = uploaded_file
+    if uploaded_file.name.endswith('.gz'):
+        raw = gzip.GzipFile(fileobj=uploaded_file)
+    return io.TextIOWrapper(raw, encoding='utf-8')
+
+
+VALIDATORS = {
+    'lessons': validate_lesson,
+    'tests': validate_test,
+    'summaries': validate_summary,
+}
+
+
+def _record_label(collection, index, record):
+    if collection == 'lessons' and isinstance(record, dict) and 'unit_number' in record:
+        return f"Ünite {record['unit_number']}"
+    if collection == 'notes':
+        return str(record[0])
+    return f"#{index + 1}"
+
+
+def stream_import(depo, uploaded_file, on_progress=None, owner=''):
+    """Dosyayı akış halinde doğrulayıp depoya toplu yazar
+
+    Koleksiyonlar tek işlemde değiştirilir; geçersiz kayıtlar atlanır ve
+    rapora eklenir. Artımlı yedek dosyaları birleştirilerek uygulanır.
+    Notlar yalnızca owner kullanıcısının notlarının yerine geçer; dosyadaki
+    sahip bilgisi dikkate alınmaz, başka kullanıcıların notlarına dokunulmaz.
+    Not sayfası sayfanın sırası olan eski yedeklerde notlar sayfa numarasına taşınır.
+    """
+    report = {"imported": {}, "errors": [], "delta": False}
+    total_size = max(uploaded_file.size, 1)
+    batches = {}
+    counters = {}
+    seen = set()
+    delta = {}
+    note_pages = None
+
+    def flush(conn, collection):
+        records = batches.pop(collection, [])
+        if records:
+            depo.insert_records(conn, collection, records, owner)
+            report["imported"][collection] = report["imported"].get(collection, 0) + len(records)
+
+    uploaded_file.seek(0)
+    stream = open_upload(uploaded_file)
+    with depo.transaction() as conn:
+        for field, item in iter_json_items(stream):
+            if field == 'format' and item == 'mikro-delta':
+                report["delta"] = True
+            if report["delta"]:
+                # Artımlı yedekler küçüktür; birleştirme için belleğe alınır
+                if item is LIST_START:
+                    delta[field] = []
+                elif item is OBJECT_START:
+                    delta[field] = {}
+                elif isinstance(delta.get(field), list):
+                    delta[field].append(item)
+                elif isinstance(delta.get(field), dict):
+                    delta[field][item[0]] = item[1]
+                else:
+                    delta[field] = item
+                continue
+
+            if field == 'note_pages':
+                note_pages = item
+            if field not in ('lessons', 'tests', 'notes', 'summaries'):
+                continue
+            if item is LIST_START or item is OBJECT_START:
+                # Koleksiyon başlarken eski içerik temizlenir
+                depo.clear_collection(conn, field, owner)
+                seen.add(field)
+                continue
+
+            index = counters.get(field, 0)
+            counters[field] = index + 1
+            if field == 'notes':
+                errors = validate_note_list(*item)
+            else:
+                errors = VALIDATORS[field](item)
+
+            if errors:
+                if len(report["errors"]) < MAX_ERRORS:
+                    label = _record_label(field, index, item)
+                    report["errors"].extend(
+                        {"Koleksiyon": field, "Kayıt": label, "Hata": error} for error in errors
+                    )
+                continue
+
+            batches.setdefault(field, []).append(item)
+            if len(batches[field]) >= BATCH_SIZE:
+                flush(conn, field)
+                if on_progress is not None:
+                    on_progress(min(uploaded_file.tell() / total_size, 1.0), report)
+
+        for collection in list(batches):
+            flush(conn, collection)
+
+        if report["delta"]:
+            depo.merge_delta(delta, conn, owner)
+            if delta.get('note_pages') != NOTE_PAGES and isinstance(delta.get('notes'), dict):
+                note_ids = [note['id'] for note_list in delta['notes'].values() for note in note_list]
+                depo.number_note_pages(conn, owner, note_ids)
+            report["imported"] = {
+                name: len(delta[name]) for name in ('lessons', 'tests', 'notes', 'summaries') if name in delta
+            }
+            seen = {'lessons', 'tests', 'notes', 'summaries'}
+        else:
+            # Boş gelen koleksiyonlar da değiştirilmiş sayılır
+            for collection in seen:
+                report["imported"].setdefault(collection, 0)
+            if 'notes' in seen and note_pages != NOTE_PAGES:
+                depo.number_note_pages(conn, owner)
+
+    if on_progress is not None:
+        on_progress(1.0, report)
+    report["collections"] = sorted(seen)
+    return report
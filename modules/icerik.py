@@ -0,0 +1,236 @@
+import bisect
+import threading
+from types import MappingProxyType
+
+from modules.arama import SearchIndex, fold, section_fields
+from modules.depo import get_depo
+
+
+def freeze(value):
+    """Sözlükleri salt okunur görünümlere, listeleri demetlere çevirir"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def section_title(section):
+    """İçindekiler satırı: grafik başlığı ya da metnin ilk kelimeleri"""
+    if section['type'] == 'graph':
+        return f"📊 {section.get('title', 'Grafik')}"
+    if section['type'] == 'formula':
+        return "∑ Formül"
+    text = section['content'].strip().splitlines()[0] if section['content'].strip() else ""
+    return f"📄 {text[:60]}…" if len(text) > 60 else f"📄 {text}"
+
+
+class ContentStore:
+    """Süreç başına bir kez tutulan, salt okunur ve sürümlü ders/test içeriği
+
+    Oturumlar içeriği kopyalamaz; yalnızca kendi notlarını, cevaplarını ve
+    konumlarını tutar. Sayfa eklemek ya da içe aktarmak sürümü artırır.
+    """
+
+    def __init__(self, depo):
+        self.depo = depo
+        self._lock = threading.RLock()
+        self.version = 0
+        self._load()
+
+    def _load(self):
+        units = self.depo.load_units()
+        # Depo üniteleri numara sırasıyla verir; sıralı numara listesi bisect ile güncel tutulur
+        self._units = {unit['unit_number']: freeze(unit) for unit in units}
+        self._unit_numbers = [unit['unit_number'] for unit in units]
+        self._unit_list = tuple(self._units[unit_num] for unit_num in self._unit_numbers)
+        self._pages = {}
+        self._page_numbers = {}
+        self._tests = freeze(self.depo.load_tests())
+        self.page_total = sum(unit['page_count'] for unit in self._unit_list)
+        # Arama dizini ilk aramada kurulur
+        self._search = None
+        self.version += 1
+
+    def invalidate(self):
+        """Depo dışarıdan (ör. içe aktarma) değiştiğinde içeriği yeniden okur"""
+        with self._lock:
+            self._load()
+
+    def units(self):
+        return self._unit_list
+
+    def find_units(self, query):
+        """Numarası ya da başlığı sorguyla eşleşen üniteler; boş sorguda tümü"""
+        query = fold(query.strip())
+        if not query:
+            return self._unit_list
+        return tuple(
+            unit for unit in self._unit_list
+            if query == str(unit['unit_number']) or query in fold(unit['unit_title'])
+        )
+
+    def _index_page(self, unit_number, page, old=None):
+        """Sayfanın bölümlerini arama dizininde günceller; old değiştirilen sayfadır"""
+        if old is not None:
+            for section in old['sections']:
+                self._search.remove((unit_number, old['page_number'], section['id']))
+        unit_title = self._units[unit_number]['unit_title']
+        for section in page['sections']:
+            self._search.add((unit_number, page['page_number'], section['id']), section_fields(section), {
+                "kind": "section", "unit": unit_number, "unit_title": unit_title,
+                "page": page['page_number'], "section": section['id'],
+            })
+
+    def search(self, query, limit=20):
+        """Bölüm başlık, açıklama ve içeriklerinde sıralı arama"""
+        with self._lock:
+            if self._search is None:
+                self._search = SearchIndex()
+                for unit in self._unit_list:
+                    for page in self.pages(unit['unit_number']):
+                        self._index_page(unit['unit_number'], page)
+            index = self._search
+        return index.search(query, limit)
+
+    def unit(self, unit_number):
+        return self._units.get(unit_number)
+
+    def pages(self, unit_number):
+        """Ünitenin sayfaları; süreç içinde ilk istendiğinde depodan okunur"""
+        pages = self._pages.get(unit_number)
+        if pages is None:
+            with self._lock:
+                pages = self._pages.get(unit_number)
+                if pages is None:
+                    pages = freeze(self.depo.load_pages(unit_number))
+                    self._page_numbers[unit_number] = [page['page_number'] for page in pages]
+                    self._pages[unit_number] = pages
+        return pages
+
+    def has_page(self, unit_number, page_number):
+        if unit_number not in self._units:
+            return False
+        self.pages(unit_number)
+        numbers = self._page_numbers[unit_number]
+        pos = bisect.bisect_left(numbers, page_number)
+        return pos < len(numbers) and numbers[pos] == page_number
+
+    def page_position(self, unit_number, page_number):
+        """Sayfanın ünitedeki sırası (1'den başlar); sayfa yoksa None"""
+        if not self.has_page(unit_number, page_number):
+            return None
+        return bisect.bisect_left(self._page_numbers[unit_number], page_number) + 1
+
+    def _page(self, unit_number, page_number):
+        numbers = self._page_numbers[unit_number]
+        pos = bisect.bisect_left(numbers, page_number)
+        if pos < len(numbers) and numbers[pos] == page_number:
+            return self._pages[unit_number][pos]
+        return None
+
+    def tests(self):
+        return self._tests
+
+    def test(self, test_id):
+        return next((test for test in self._tests if test['id'] == test_id), None)
+
+    def unit_pages(self):
+        return {unit['unit_number']: unit['page_count'] for unit in self._unit_list}
+
+    def _place_page(self, unit_number, page):
+        """Sayfayı ünitenin sıralı sayfa listesine yerleştirir; aynı numara varsa değiştirir"""
+        numbers = self._page_numbers[unit_number]
+        pages = self._pages[unit_number]
+        pos = bisect.bisect_left(numbers, page['page_number'])
+        if pos < len(numbers) and numbers[pos] == page['page_number']:
+            self._pages[unit_number] = pages[:pos] + (page,) + pages[pos + 1:]
+            return True
+        numbers.insert(pos, page['page_number'])
+        # Okuyucuların elindeki eski demet değişmez; yeni demet yerine konur
+        self._pages[unit_number] = pages[:pos] + (page,) + pages[pos:]
+        return False
+
+    def _place_unit(self, header):
+        unit_number = header['unit_number']
+        pos = bisect.bisect_left(self._unit_numbers, unit_number)
+        if unit_number in self._units:
+            self._unit_list = self._unit_list[:pos] + (header,) + self._unit_list[pos + 1:]
+        else:
+            self._unit_numbers.insert(pos, unit_number)
+            self._unit_list = self._unit_list[:pos] + (header,) + self._unit_list[pos:]
+        self._units[unit_number] = header
+
+    def add_pages(self, pages, replace=False):
+        """Birden çok sayfayı tek işlemde depoya yazar ve dizinleri yerinde günceller
+
+        Her sayfa unit_number, unit_title, page_number ve sections alanlarını içerir.
+        Aynı numaralı sayfa zaten varsa replace=False iken hiçbir şey yazılmaz ve
+        ValueError yükseltilir; replace=True iken sayfa değiştirilir.
+        {"added", "replaced", "new_units"} özetini döndürür.
+        """
+        with self._lock:
+            planned = {}
+            for page in pages:
+                key = (page['unit_number'], page['page_number'])
+                if key in planned:
+                    raise ValueError(f"Ünite {key[0]}, Sayfa {key[1]} listede birden fazla kez var")
+                planned[key] = page
+
+            existing = [key for key in planned if self.has_page(*key)]
+            if existing and not replace:
+                listed = ", ".join(f"Ünite {unit_num} Sayfa {page_num}" for unit_num, page_num in existing[:5])
+                raise ValueError(f"Bu sayfalar zaten var: {listed}")
+
+            self.depo.add_pages(planned.values())
+
+            new_units = []
+            added = replaced = 0
+            for (unit_num, page_num), page in sorted(planned.items(), key=lambda item: item[0]):
+                if unit_num not in self._units:
+                    # Yeni ünitenin boş sayfa dizini; depodan okumaya gerek yok
+                    self._pages[unit_num] = ()
+                    self._page_numbers[unit_num] = []
+                    self._place_unit(freeze({
+                        "unit_number": unit_num, "unit_title": page['unit_title'], "page_count": 0,
+                    }))
+                    new_units.append(unit_num)
+                frozen = freeze({"page_number": page_num, "sections": page['sections']})
+                if self._search is not None:
+                    self._index_page(unit_num, frozen, self._page(unit_num, page_num))
+                if self._place_page(unit_num, frozen):
+                    replaced += 1
+                else:
+                    added += 1
+
+            for unit_num in {unit_num for unit_num, _ in planned}:
+                header = self._units[unit_num]
+                self._place_unit(freeze({
+                    "unit_number": unit_num,
+                    "unit_title": header['unit_title'],
+                    "page_count": len(self._page_numbers[unit_num]),
+                }))
+            self.page_total += added
+            self.version += 1
+        return {"added": added, "replaced": replaced, "new_units": new_units}
+
+    def add_page(self, unit_number, unit_title, page_number, sections, replace=True):
+        """Tek sayfa ekler; (yeni ünite mi, mevcut sayfa mı değiştirildi) döndürür"""
+        result = self.add_pages([{
+            "unit_number": unit_number, "unit_title": unit_title,
+            "page_number": page_number, "sections": sections,
+        }], replace=replace)
+        return bool(result['new_units']), bool(result['replaced'])
+
+
+_content = None
+_content_lock = threading.Lock()
+
+
+def get_content():
+    """Süreç genelindeki içerik deposu"""
+    global _content
+    with _content_lock:
+        if _content is None:
+            _content = ContentStore(get_depo())
+        return _content
@@ -0,0 +1,138 @@
+import bisect
+from datetime import datetime
+
+from modules.arama import SearchIndex
+
+
+def note_key(unit_number, page_number, section_id):
+    """Yedek dosyalarında kullanılan "ünite-sayfa-bölüm" anahtarı"""
+    return f"{unit_number}-{page_number}-{section_id}"
+
+
+class NoteStore:
+    """Bir kullanıcının (ünite, sayfa, bölüm) ve not id'si ile adreslenen, indeksli not deposu
+
+    Depodaki notlar owner sütunuyla kullanıcılara ayrılır; her oturum yalnızca
+    kendi kullanıcısının notlarını yükler ve yazar.
+    """
+
+    def __init__(self, depo=None, owner=''):
+        self.depo = depo
+        self.owner = owner
+        self._notes = {}
+        self._by_section = {}
+        self._by_page = {}
+        self._by_unit = {}
+        # (ünite, sayfa, -id, id) sıralı görünümü; eklemede bisect ile güncel tutulur
+        self._sorted = []
+        # Arama dizini ilk aramada kurulur, sonra ekleme ve silmeyle güncellenir
+        self._search = None
+
+    @classmethod
+    def from_depo(cls, depo, owner=''):
+        store = cls(depo, owner)
+        for note_id, unit_num, page_num, section_id, text, date in depo.iter_note_rows(owner):
+            store._index({
+                "id": note_id, "text": text, "date": date,
+                "unit": unit_num, "page": page_num, "section": section_id,
+            }, keep_sorted=False)
+        store._sorted.sort()
+        return store
+
+    def _index(self, note, keep_sorted=True):
+        note_id = note['id']
+        unit_num, page_num = note['unit'], note['page']
+        self._notes[note_id] = note
+        self._by_section.setdefault((unit_num, page_num, note['section']), []).append(note_id)
+        self._by_page.setdefault((unit_num, page_num), set()).add(note_id)
+        self._by_unit.setdefault(unit_num, set()).add(note_id)
+        entry = (unit_num, page_num, -note_id, note_id)
+        if keep_sorted:
+            bisect.insort(self._sorted, entry)
+        else:
+            self._sorted.append(entry)
+        if self._search is not None:
+            self._index_text(note)
+
+    def _index_text(self, note):
+        self._search.add(note['id'], {"content": note['text']}, {
+            "kind": "note", "id": note['id'], "unit": note['unit'], "page": note['page'],
+            "section": note['section'], "date": note['date'],
+        })
+
+    def add(self, unit_number, page_number, section_id, text):
+        now = datetime.now()
+        note = {
+            "id": now.timestamp(),
+            "text": text,
+            "date": now.strftime("%d.%m.%Y %H:%M"),
+            "unit": unit_number,
+            "page": page_number,
+            "section": section_id,
+        }
+        # Aynı anda eklenen iki notun id'si çakışmasın
+        while note['id'] in self._notes:
+            note['id'] += 1e-6
+        if self.depo is not None:
+            # Id başka kullanıcının notuyla çakışırsa depo yeni id verir
+            note['id'] = self.depo.add_note(note_key(unit_number, page_number, section_id), note, self.owner)
+        self._index(note)
+        return note
+
+    def delete(self, note_id):
+        note = self._notes.pop(note_id, None)
+        if note is None:
+            return False
+        if self.depo is not None:
+            self.depo.delete_note(note_id, self.owner)
+
+        unit_num, page_num = note['unit'], note['page']
+        section_ids = self._by_section[(unit_num, page_num, note['section'])]
+        section_ids.remove(note_id)
+        if not section_ids:
+            del self._by_section[(unit_num, page_num, note['section'])]
+        self._by_page[(unit_num, page_num)].discard(note_id)
+        self._by_unit[unit_num].discard(note_id)
+
+        pos = bisect.bisect_left(self._sorted, (unit_num, page_num, -note_id, note_id))
+        del self._sorted[pos]
+        if self._search is not None:
+            self._search.remove(note_id)
+        return True
+
+    def search(self, query, limit=20):
+        """Not metinlerinde sıralı arama"""
+        if self._search is None:
+            self._search = SearchIndex()
+            for note in self._notes.values():
+                self._index_text(note)
+        return self._search.search(query, limit)
+
+    def get(self, note_id):
+        return self._notes.get(note_id)
+
+    def for_section(self, unit_number, page_number, section_id):
+        return [self._notes[note_id] for note_id in self._by_section.get((unit_number, page_number, section_id), [])]
+
+    def count_for_unit(self, unit_number):
+        return len(self._by_unit.get(unit_number, ()))
+
+    def count_for_page(self, unit_number, page_number):
+        return len(self._by_page.get((unit_number, page_number), ()))
+
+    def units(self):
+        return sorted(unit_num for unit_num, ids in self._by_unit.items() if ids)
+
+    def sorted_notes(self, unit_number=None, offset=0, limit=None):
+        """Ünite ve sayfaya göre sıralı notlar (yeniler önce); ünite verilirse yalnızca o ünite"""
+        lo, hi = 0, len(self._sorted)
+        if unit_number is not None:
+            lo = bisect.bisect_left(self._sorted, (unit_number,))
+            hi = bisect.bisect_left(self._sorted, (unit_number + 1,))
+        lo = min(lo + offset, hi)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return [self._notes[entry[3]] for entry in self._sorted[lo:hi]]
+
+    def __len__(self):
+        return len(self._notes)
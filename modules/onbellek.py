@@ -0,0 +1,147 @@
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+from modules.profil import profiled
+from modules.yapilandirma import CONFIG
+
+def _rounded(value):
+    # Slider'dan gelen 0.11000000000000001 gibi değerler aynı anahtara düşsün
+    if isinstance(value, float):
+        return round(value, 6)
+    # Eğri tanımı gibi iç içe seçenekler hashlenebilir demetlere çevrilir
+    if isinstance(value, dict):
+        return tuple(sorted((name, _rounded(item)) for name, item in value.items()))
+    if isinstance(value, list):
+        return tuple(_rounded(item) for item in value)
+    return value
+
+
+def cache_key(graph_type, params, overlay=None):
+    """(grafik türü, parametreler[, senaryolar]) için hashlenebilir anahtar"""
+    items = tuple(sorted((name, _rounded(value)) for name, value in params.items()))
+    if overlay is None:
+        return (graph_type, items)
+    return (graph_type, items, (overlay[0], tuple(_rounded(value) for value in overlay[1])))
+
+
+class FigureCache:
+    """Süreç genelinde paylaşılan, boyut sınırlı LRU PNG önbelleği"""
+
+    def __init__(self, max_entries=512, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            png = self._items.get(key)
+            if png is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return png
+
+    def put(self, key, png):
+        # Tek başına sınırı aşan görüntüler hiç saklanmaz
+        if len(png) > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._items[key] = png
+            self._bytes += len(png)
+            while len(self._items) > self.max_entries or self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._items
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._items),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+figure_cache = FigureCache()
+
+# Çizim modlarının sunucu süresi ve aktarılan bayt karşılaştırması
+_stats_lock = threading.Lock()
+RENDER_STATS = {
+    mode: {"renders": 0, "seconds": 0.0, "bytes": 0}
+    for mode in ("png", "vector")
+}
+
+
+def record_render(mode, seconds, nbytes):
+    with _stats_lock:
+        stats = RENDER_STATS[mode]
+        stats["renders"] += 1
+        stats["seconds"] += seconds
+        stats["bytes"] += nbytes
+
+
+def draw_png(graph_type, params, overlay=None):
+    """Grafiği önbelleğe bakmadan çizip PNG baytlarını döndürür"""
+    # matplotlib ilk çizimde içe aktarılır
+    from modules import grafikler
+    if overlay is None and CONFIG['figure_pool']:
+        # Slider yolu: hazır figürün yalnızca verileri güncellenir
+        with profiled(f"grafik: {graph_type}", "figür"):
+            pooled = grafikler.figure_pool.acquire(graph_type, params)
+        try:
+            with profiled(f"grafik: {graph_type}", "png"):
+                return grafikler.figure_to_png(pooled.fig)
+        finally:
+            grafikler.figure_pool.release(pooled)
+    with profiled(f"grafik: {graph_type}", "figür"):
+        fig = grafikler.draw_graph(graph_type, params, overlay)
+    with profiled(f"grafik: {graph_type}", "png"):
+        return grafikler.figure_to_png(fig)
+
+
+def pool_stats():
+    """Figür havuzu sayaçları; matplotlib henüz içe aktarılmadıysa sıfırlar"""
+    grafikler = sys.modules.get("modules.grafikler")
+    if grafikler is None:
+        return {"layouts": 0, "idle": 0, "built": 0, "reused": 0}
+    return grafikler.figure_pool.stats()
+
+
+def render_graph(graph_type, params, overlay=None):
+    """Grafiği PNG olarak döndürür; aynı parametreler için önbellekten okur
+
+    overlay (parametre, değerler) verilirse tüm senaryolar tek figürde çizilir.
+    """
+    started = time.perf_counter()
+    key = cache_key(graph_type, params, overlay)
+    png = figure_cache.get(key)
+    if png is None:
+        # Çizim süreç havuzunda yapılır ve önbelleğe yazılır (bkz. modules/cizim.py)
+        from modules.cizim import render_pool
+        png = render_pool.render(key, graph_type, params, overlay)
+    record_render("png", time.perf_counter() - started, len(png))
+    return png
@@ -0,0 +1,116 @@
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+from modules.baslatma import prewarm
+from modules.grafik_turleri import GRAPH_SLIDERS
+from modules.onbellek import cache_key, draw_png, figure_cache
+from modules.yapilandirma import CONFIG
+
+_lock = threading.RLock()
+_executor = None
+_executor_workers = 0
+_pending = set()
+
+
+def _domain(spec):
+    """Slider tanımındaki tüm değerler"""
+    _, _, lo, hi, _, step = spec
+    count = int(round((hi - lo) / step)) + 1
+    if isinstance(step, int) and isinstance(lo, int):
+        return [lo + i * step for i in range(count)]
+    return [round(lo + i * step, 10) for i in range(count)]
+
+
+@lru_cache(maxsize=32)
+def _offsets(dims, radius):
+    """Merkeze göre komşu ofsetleri: önce tek eksenli kaydırmalar, sonra yakından uzağa"""
+    window = range(-radius, radius + 1)
+    offsets = [o for o in itertools.product(window, repeat=dims) if any(o)]
+    offsets.sort(key=lambda o: (sum(1 for d in o if d), sum(abs(d) for d in o)))
+    return tuple(offsets)
+
+
+def lattice_points(graph_type, params, budget, radius):
+    """Mevcut slider değerlerinin çevresindeki (ya da küçükse tüm) parametre kafesi"""
+    specs = GRAPH_SLIDERS[graph_type]
+    domains = [_domain(spec) for spec in specs]
+    # Slider olmayan seçenekler (ör. fayda ailesi) her noktaya aynen taşınır
+    slider_names = {spec[0] for spec in specs}
+    fixed = {name: value for name, value in params.items() if name not in slider_names}
+
+    size = 1
+    for values in domains:
+        size *= len(values)
+    if size <= budget:
+        # Kafesin tamamı bütçeye sığıyor
+        return [dict(fixed, **dict(zip((spec[0] for spec in specs), combo))) for combo in itertools.product(*domains)]
+
+    center = []
+    for spec, values in zip(specs, domains):
+        value = params.get(spec[0], spec[4])
+        center.append(min(range(len(values)), key=lambda i: abs(values[i] - value)))
+
+    points = []
+    for offset in _offsets(len(specs), radius):
+        idx = [c + d for c, d in zip(center, offset)]
+        if all(0 <= i < len(values) for i, values in zip(idx, domains)):
+            points.append(dict(fixed, **{spec[0]: values[i] for spec, values, i in zip(specs, domains, idx)}))
+            if len(points) >= budget:
+                break
+    return points
+
+
+def _get_executor():
+    global _executor, _executor_workers
+    workers = max(1, CONFIG["warmup_workers"])
+    if _executor is None or _executor_workers != workers:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _pending.clear()
+        # Çizim pyplot kullanmadığı için iş parçacıkları yeterli; spawn ile başlayan
+        # süreçler app.py'yi __mp_main__ olarak baştan çalıştırırdı (bkz. modules/cizim.py).
+        # Isıtma süreç başına bir kez yapılır; diğer işçiler ilkini bekler.
+        _executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="mikro-warmup", initializer=prewarm,
+        )
+        _executor_workers = workers
+    return _executor
+
+
+def _store(key, future):
+    with _lock:
+        _pending.discard(key)
+    if not future.cancelled() and future.exception() is None:
+        figure_cache.put(key, future.result())
+
+
+def warm_up(graph_type, params):
+    """Komşu parametreleri arka planda çizip figür önbelleğine yazar"""
+    if not CONFIG["warmup_enabled"] or graph_type not in GRAPH_SLIDERS:
+        return 0
+
+    budget = CONFIG["warmup_budget"]
+    submitted = 0
+    with _lock:
+        # Kuyruk bütçeyi aşmışsa yeni iş ekleme
+        if len(_pending) >= budget:
+            return 0
+        executor = _get_executor()
+        for point in lattice_points(graph_type, params, budget, CONFIG["warmup_radius"]):
+            key = cache_key(graph_type, point)
+            if key in _pending or key in figure_cache:
+                continue
+            future = executor.submit(draw_png, graph_type, point)
+            _pending.add(key)
+            future.add_done_callback(lambda f, key=key: _store(key, f))
+            submitted += 1
+            if len(_pending) >= budget:
+                break
+    return submitted
+
+
+def pending_count():
+    with _lock:
+        return len(_pending)
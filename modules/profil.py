@@ -0,0 +1,95 @@
+import bisect
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+from modules.yapilandirma import CONFIG
+
+# Histogram kova üst sınırları (ms); sonuncusunun üstü taşma kovasıdır
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+BUCKET_LABELS = tuple(f"≤{limit} ms" for limit in BUCKETS_MS) + (f">{BUCKETS_MS[-1]} ms",)
+
+_NOOP = nullcontext()
+
+
+def _percentile(ordered, fraction):
+    return ordered[int(fraction * (len(ordered) - 1))]
+
+
+class RenderProfiler:
+    """(sayfa, aşama) başına son `window` ölçümü tutan süreç geneli profil"""
+
+    def __init__(self, window=500):
+        self.window = window
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, page, stage, seconds):
+        with self._lock:
+            samples = self._samples.get((page, stage))
+            if samples is None:
+                samples = self._samples[(page, stage)] = deque(maxlen=self.window)
+            samples.append(seconds * 1000)
+
+    @contextmanager
+    def _timed(self, page, stage):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            # st.rerun() / st.stop() istisnalarında da süre kaydedilir
+            self.record(page, stage, time.perf_counter() - started)
+
+    def timed(self, page, stage):
+        """Profil açıksa bloğun süresini ölçer; kapalıyken boş bağlam döndürür"""
+        if not CONFIG["profiling_enabled"]:
+            return _NOOP
+        return self._timed(page, stage)
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def _snapshot(self):
+        with self._lock:
+            return {key: sorted(samples) for key, samples in self._samples.items()}
+
+    def summary(self):
+        """Sayfa ve aşama başına adet, ortalama, p50, p95 ve en büyük süre (ms)"""
+        rows = []
+        for (page, stage), ordered in sorted(self._snapshot().items()):
+            rows.append({
+                "Sayfa": page,
+                "Aşama": stage,
+                "Adet": len(ordered),
+                "Ortalama (ms)": round(sum(ordered) / len(ordered), 2),
+                "p50 (ms)": round(_percentile(ordered, 0.5), 2),
+                "p95 (ms)": round(_percentile(ordered, 0.95), 2),
+                "En büyük (ms)": round(ordered[-1], 2),
+            })
+        return rows
+
+    def histogram(self, page, stage):
+        """Son ölçümlerin kova sayıları; BUCKET_LABELS ile aynı sırada"""
+        counts = [0] * len(BUCKET_LABELS)
+        with self._lock:
+            samples = list(self._samples.get((page, stage), ()))
+        for value in samples:
+            counts[bisect.bisect_left(BUCKETS_MS, value)] += 1
+        return counts
+
+    def export(self):
+        """Özet ve histogramları JSON'a yazılabilir biçimde döndürür"""
+        return {
+            "window": self.window,
+            "buckets_ms": list(BUCKETS_MS),
+            "stages": [
+                dict(row, histogram=self.histogram(row["Sayfa"], row["Aşama"]))
+                for row in self.summary()
+            ],
+        }
+
+
+render_profiler = RenderProfiler()
+profiled = render_profiler.timed
@@ -0,0 +1,147 @@
+import re
+import threading
+
+from modules.grafik_turleri import GRAPH_SLIDERS, GRAPH_TYPES, graph_options, graph_params, graph_topic, overlay_values
+from modules.icerik import section_title
+
+# \begin{ortam} / \end{ortam} ve \left / \right eşleşmesi için
+_ENVIRONMENT = re.compile(r"\\(begin|end)\s*\{([^}]*)\}")
+_DELIMITER = re.compile(r"\\(left|right)(?![a-zA-Z])")
+
+
+def latex_error(text):
+    """KaTeX'e gönderilmeden yakalanabilen LaTeX hataları; geçerliyse None"""
+    if not text.strip():
+        return "Formül boş"
+    depth = 0
+    escaped = False
+    for char in text:
+        if escaped:
+            escaped = False
+        elif char == "\\":
+            escaped = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth < 0:
+                return "Fazladan '}' var"
+    if depth:
+        return f"{depth} adet '{{' kapatılmamış"
+    open_envs = []
+    for kind, name in _ENVIRONMENT.findall(text):
+        if kind == "begin":
+            open_envs.append(name)
+        elif not open_envs or open_envs.pop() != name:
+            return f"\\end{{{name}}} eşleşmiyor"
+    if open_envs:
+        return f"\\begin{{{open_envs[-1]}}} kapatılmamış"
+    sides = _DELIMITER.findall(text)
+    if sides.count("left") != sides.count("right"):
+        return "\\left ve \\right sayıları eşit değil"
+    return None
+
+
+def _graph_plan(section, note_key):
+    graph_type = section.get('graph_type', 'budget_constraint')
+    params = graph_params(graph_type, section.get('params', {}))
+    topic = graph_topic(graph_type)
+    overlay = None
+    if 'overlay' in section:
+        overlay = (section['overlay']['param'], tuple(overlay_values(section['overlay'])))
+    return {
+        "graph_type": graph_type,
+        "heading": f"📊 {section.get('title', 'Grafik')}",
+        "caption": section.get('description', topic['aciklama'] if topic else ''),
+        "overlay": overlay,
+        # (parametre, etiket, min, max, başlangıç değeri, adım, widget anahtarı)
+        "sliders": tuple(
+            (name, label, lo, hi, params.get(name, default), step, f"{name.lower()}_{note_key}")
+            for name, label, lo, hi, default, step in GRAPH_SLIDERS.get(graph_type, [])
+            if not overlay or name != overlay[0]
+        ),
+        "options": graph_options(graph_type, params),
+        "drawable": graph_type in GRAPH_SLIDERS,
+        "table": bool(GRAPH_TYPES.get(graph_type, {}).get('table')),
+    }
+
+
+def compile_page(unit_number, page):
+    """Sayfanın çizim planı: bölüm türleri, widget anahtarları, doğrulanmış formüller, grafik tanımları
+
+    Not ve widget anahtarları sayfa numarasıyla kurulur; araya sayfa eklenince değişmez.
+    Plan oturumlar arasında paylaşılır ve değiştirilmez; grafik seçenekleri önbellek
+    anahtarına çevrilebilsin diye düz sözlük/liste olarak kalır.
+    """
+    page_key = f"{unit_number}-{page['page_number']}"
+    sections = []
+    for section in page['sections']:
+        note_key = f"{page_key}-{section['id']}"
+        plan = {
+            "id": section['id'],
+            "type": section['type'],
+            "title": section_title(section),
+            "note_key": note_key,
+            "open_key": f"open_{note_key}",
+            "show_key": f"show_note_{note_key}",
+            "toggle_key": f"note_toggle_{note_key}",
+        }
+        if section['type'] == 'graph':
+            plan["graph"] = _graph_plan(section, note_key)
+        elif section['type'] == 'formula':
+            plan["content"] = section['content']
+            plan["latex_error"] = latex_error(section['content'])
+        else:
+            plan["content"] = section['content']
+        sections.append(plan)
+    return {
+        "page_number": page['page_number'],
+        "page_key": page_key,
+        "sections": tuple(sections),
+        "open_keys": tuple(plan["open_key"] for plan in sections),
+    }
+
+
+class PlanCache:
+    """(ünite, sayfa numarası) → (sayfa, plan); sayfa nesnesi değişmişse plan yeniden kurulur
+
+    İçerik deposu sayfaları değişmez nesneler olarak tutar: sayfa düzenlendiğinde
+    ya da içerik yeniden içe aktarıldığında o numaradaki nesne değişir ve eski
+    plan kendiliğinden geçersiz olur.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._plans = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, unit_number, page):
+        key = (unit_number, page['page_number'])
+        with self._lock:
+            cached = self._plans.get(key)
+            if cached is not None and cached[0] is page:
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+        # Derleme kilit dışında; aynı anda iki kez derlenirse sonuçlar aynıdır
+        plan = compile_page(unit_number, page)
+        with self._lock:
+            self._plans[key] = (page, plan)
+        return plan
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+
+    def stats(self):
+        with self._lock:
+            return {"pages": len(self._plans), "hits": self.hits, "misses": self.misses}
+
+
+plan_cache = PlanCache()
+
+
+def page_plan(content, unit_number, position):
+    """Ünitenin position. sırasındaki sayfasının önbellekteki planı"""
+    return plan_cache.get(unit_number, content.pages(unit_number)[position - 1])
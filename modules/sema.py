@@ -0,0 +1,211 @@
+from modules.grafik_turleri import CURVE_FIELDS, GRAPH_SLIDERS, GRAPH_TYPES, MAX_SCENARIOS
+
+SECTION_TYPES = ('text', 'formula', 'graph')
+QUESTION_TYPES = ('multiple', 'classic')
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_curve(name, spec):
+    """Arz ya da talep eğrisi tanımı; talep azalan, arz artan olmalıdır"""
+    if not isinstance(spec, dict) or spec.get('form') not in CURVE_FIELDS:
+        return [f"'{name}.form' {', '.join(CURVE_FIELDS)} değerlerinden biri olmalıdır"]
+    form = spec['form']
+    missing = [field for field in CURVE_FIELDS[form] if field not in spec]
+    if missing:
+        return [f"'{name}' için {', '.join(missing)} alanları zorunludur"]
+    sign = -1 if name == 'demand' else 1
+    direction = "azalan" if sign < 0 else "artan"
+    if form == 'piecewise':
+        prices, quantities = spec['prices'], spec['quantities']
+        if (not isinstance(prices, list) or not isinstance(quantities, list) or len(prices) < 2
+                or len(prices) != len(quantities) or not all(_is_number(value) for value in prices + quantities)):
+            return [f"'{name}.prices' ve '{name}.quantities' en az iki sayıdan oluşan eşit uzunlukta listeler olmalıdır"]
+        if any(later <= earlier for earlier, later in zip(prices, prices[1:])):
+            return [f"'{name}.prices' kesin artan olmalıdır"]
+        if any(sign * (later - earlier) < 0 for earlier, later in zip(quantities, quantities[1:])):
+            return [f"'{name}.quantities' fiyatla {direction} olmalıdır"]
+        return []
+    first, second = CURVE_FIELDS[form]
+    if not _is_number(spec[first]) or not _is_number(spec[second]):
+        return [f"'{name}.{first}' ve '{name}.{second}' sayı olmalıdır"]
+    if form == 'constant_elasticity' and spec['scale'] <= 0:
+        return [f"'{name}.scale' pozitif olmalıdır"]
+    if sign * spec[second] <= 0:
+        return [f"'{name}.{second}' {'negatif' if sign < 0 else 'pozitif'} olmalıdır"]
+    return []
+
+
+def validate_graph_options(params, graph_type):
+    """Grafik bölümündeki slider olmayan seçenekler (ör. fayda ailesi) ve aralıkları"""
+    errors = []
+    for name, (default, allowed) in GRAPH_TYPES.get(graph_type, {}).get('options', {}).items():
+        if name not in params:
+            continue
+        value = params[name]
+        if isinstance(default, dict):
+            errors.extend(validate_curve(name, value))
+        elif all(isinstance(choice, str) for choice in allowed):
+            if value not in allowed:
+                errors.append(f"'{name}' {', '.join(allowed)} değerlerinden biri olmalıdır")
+        elif not _is_number(value) or not allowed[0] <= value <= allowed[1]:
+            errors.append(f"'{name}' {allowed[0]} ile {allowed[1]} arasında bir sayı olmalıdır")
+    return errors
+
+
+def validate_overlay(overlay, graph_type):
+    """Grafik bölümündeki senaryo tanımı: {"param", "values"} ya da {"param", "min", "max", "count"}"""
+    if not isinstance(overlay, dict):
+        return ["'overlay' nesne olmalıdır"]
+    param_names = [spec[0] for spec in GRAPH_SLIDERS.get(graph_type, [])]
+    if overlay.get('param') not in param_names:
+        return [f"'overlay.param' {', '.join(param_names)} değerlerinden biri olmalıdır"]
+    if 'values' in overlay:
+        values = overlay['values']
+        if not isinstance(values, list) or not values or not all(_is_number(value) for value in values):
+            return ["'overlay.values' sayılardan oluşan boş olmayan bir liste olmalıdır"]
+        count = len(values)
+    elif all(field in overlay for field in ('min', 'max', 'count')):
+        if not _is_number(overlay['min']) or not _is_number(overlay['max']) or not _is_int(overlay['count']) or overlay['count'] < 1:
+            return ["'overlay' min/max sayı, count pozitif tam sayı olmalıdır"]
+        count = overlay['count']
+    else:
+        return ["'overlay' ya 'values' ya da 'min', 'max', 'count' alanlarını içermelidir"]
+    if count > MAX_SCENARIOS:
+        return [f"'overlay' en fazla {MAX_SCENARIOS} senaryo içerebilir"]
+    return []
+
+
+def validate_sections(sections):
+    """Bölüm listesindeki hataları döndürür"""
+    if not isinstance(sections, list):
+        return ["'sections' bir liste olmalıdır"]
+    errors = []
+    seen = set()
+    for idx, section in enumerate(sections, 1):
+        if not isinstance(section, dict):
+            errors.append(f"Bölüm {idx}: nesne olmalıdır")
+            continue
+        if 'id' not in section:
+            errors.append(f"Bölüm {idx}: 'id' alanı zorunludur")
+        elif section['id'] in seen:
+            errors.append(f"Bölüm {idx}: '{section['id']}' id'si tekrar ediyor")
+        else:
+            seen.add(section['id'])
+        section_type = section.get('type')
+        if section_type not in SECTION_TYPES:
+            errors.append(f"Bölüm {idx}: 'type' {', '.join(SECTION_TYPES)} değerlerinden biri olmalıdır")
+        elif section_type in ('text', 'formula') and not isinstance(section.get('content'), str):
+            errors.append(f"Bölüm {idx}: 'content' metin olmalıdır")
+        elif section_type == 'graph':
+            if section.get('graph_type', 'budget_constraint') not in GRAPH_SLIDERS:
+                errors.append(f"Bölüm {idx}: bilinmeyen grafik türü '{section.get('graph_type')}'")
+            if not isinstance(section.get('params', {}), dict):
+                errors.append(f"Bölüm {idx}: 'params' nesne olmalıdır")
+            if isinstance(section.get('params', {}), dict):
+                errors.extend(f"Bölüm {idx}: {error}" for error in validate_graph_options(
+                    section.get('params', {}), section.get('graph_type', 'budget_constraint')
+                ))
+            if 'overlay' in section:
+                errors.extend(f"Bölüm {idx}: {error}" for error in validate_overlay(
+                    section['overlay'], section.get('graph_type', 'budget_constraint')
+                ))
+    return errors
+
+
+def validate_new_page(data):
+    """"Yeni Sayfa Ekle" JSON'u: unit_number, unit_title, page_number, sections"""
+    if not isinstance(data, dict):
+        return ["JSON bir nesne olmalıdır"]
+    for field in ('unit_number', 'unit_title', 'page_number', 'sections'):
+        if field not in data:
+            return [f"'{field}' alanı zorunludur!"]
+    errors = []
+    if not _is_int(data['unit_number']):
+        errors.append("'unit_number' tam sayı olmalıdır")
+    if not isinstance(data['unit_title'], str):
+        errors.append("'unit_title' metin olmalıdır")
+    if not _is_int(data['page_number']):
+        errors.append("'page_number' tam sayı olmalıdır")
+    return errors + validate_sections(data['sections'])
+
+
+def validate_lesson(lesson):
+    if not isinstance(lesson, dict):
+        return ["Ünite bir nesne olmalıdır"]
+    errors = []
+    if not _is_int(lesson.get('unit_number')):
+        errors.append("'unit_number' tam sayı olmalıdır")
+    if not isinstance(lesson.get('unit_title'), str):
+        errors.append("'unit_title' metin olmalıdır")
+    pages = lesson.get('pages', [])
+    if not isinstance(pages, list):
+        return errors + ["'pages' bir liste olmalıdır"]
+    seen = set()
+    for idx, page in enumerate(pages, 1):
+        if not isinstance(page, dict) or not _is_int(page.get('page_number')):
+            errors.append(f"Sayfa {idx}: 'page_number' tam sayı olmalıdır")
+            continue
+        if page['page_number'] in seen:
+            errors.append(f"Sayfa {page['page_number']}: sayfa numarası tekrar ediyor")
+        seen.add(page['page_number'])
+        errors.extend(f"Sayfa {page['page_number']}: {error}" for error in validate_sections(page.get('sections')))
+    return errors
+
+
+def validate_test(test):
+    if not isinstance(test, dict):
+        return ["Test bir nesne olmalıdır"]
+    errors = []
+    if 'id' not in test:
+        errors.append("'id' alanı zorunludur")
+    if not isinstance(test.get('unit'), str):
+        errors.append("'unit' metin olmalıdır")
+    questions = test.get('questions')
+    if not isinstance(questions, list):
+        return errors + ["'questions' bir liste olmalıdır"]
+    for idx, q in enumerate(questions, 1):
+        if not isinstance(q, dict) or 'id' not in q or not isinstance(q.get('question'), str):
+            errors.append(f"Soru {idx}: 'id' ve 'question' alanları zorunludur")
+            continue
+        if q.get('type') not in QUESTION_TYPES:
+            errors.append(f"Soru {idx}: 'type' {', '.join(QUESTION_TYPES)} değerlerinden biri olmalıdır")
+        elif q['type'] == 'multiple':
+            options = q.get('options')
+            if not isinstance(options, list) or len(options) < 2:
+                errors.append(f"Soru {idx}: en az iki seçenek gereklidir")
+            elif not _is_int(q.get('correct')) or not 0 <= q['correct'] < len(options):
+                errors.append(f"Soru {idx}: 'correct' geçerli bir seçenek sırası olmalıdır")
+    # İsteğe bağlı: her denemede soru bankasından rastgele seçilecek soru sayısı
+    if 'sample' in test and (not _is_int(test['sample']) or not 1 <= test['sample'] <= len(questions)):
+        errors.append(f"'sample' 1 ile {len(questions)} arasında bir tam sayı olmalıdır")
+    return errors
+
+
+def validate_note_list(note_key, note_list):
+    parts = str(note_key).split('-', 2)
+    if len(parts) != 3 or not parts[0].isdigit() or not parts[1].isdigit():
+        return ["Not anahtarı 'ünite-sayfa-bölüm' biçiminde olmalıdır"]
+    if not isinstance(note_list, list):
+        return ["Notlar bir liste olmalıdır"]
+    errors = []
+    for idx, note in enumerate(note_list, 1):
+        if not isinstance(note, dict) or not _is_number(note.get('id')):
+            errors.append(f"Not {idx}: 'id' sayı olmalıdır")
+        elif not isinstance(note.get('text'), str) or not isinstance(note.get('date'), str):
+            errors.append(f"Not {idx}: 'text' ve 'date' metin olmalıdır")
+        elif not isinstance(note.get('owner', ''), str):
+            errors.append(f"Not {idx}: 'owner' metin olmalıdır")
+    return errors
+
+
+def validate_summary(summary):
+    if not isinstance(summary, dict):
+        return ["Özet bir nesne olmalıdır"]
+    return []
@@ -0,0 +1,196 @@
+import random
+import threading
+from datetime import datetime
+
+import numpy as np
+
+# Yeniden kurulumda depodan okunan denemeler bu büyüklükte parçalar halinde işlenir
+ATTEMPT_CHUNK = 5000
+
+# Boş bırakılan soruların seçenek sırası
+OMITTED = -1
+
+
+def _qid(question_id):
+    # Cevaplar depoya JSON olarak yazılır ve anahtarlar metin olarak döner;
+    # içe aktarılan bankalardaki sayısal id'ler de aynı biçimde karşılaştırılır
+    return str(question_id)
+
+
+def draw_questions(test, seed):
+    """Denemede sorulacak soruların id'leri; 'sample' verilmişse bankadan rastgele N soru"""
+    question_ids = [q['id'] for q in test['questions']]
+    sample = test.get('sample')
+    if not sample or sample >= len(question_ids):
+        return question_ids
+    return random.Random(seed).sample(question_ids, sample)
+
+
+def score_attempt(test, question_ids, answers):
+    """Çoktan seçmeli soruları puanlar: (doğru sayısı, puanlanan soru sayısı, {soru id: doğru mu})"""
+    questions = {q['id']: q for q in test['questions']}
+    results = {}
+    for question_id in question_ids:
+        q = questions.get(question_id)
+        if q is not None and q['type'] == 'multiple':
+            results[question_id] = answers.get(question_id) == q['correct']
+    return sum(results.values()), len(results), results
+
+
+def record_attempt(depo, test, question_ids, answers):
+    """Denemeyi puanlayıp depoya yazar; istatistikler bir sonraki okumada artımlı güncellenir"""
+    correct, total, results = score_attempt(test, question_ids, answers)
+    depo.add_attempt(
+        test['id'], datetime.now().strftime("%d.%m.%Y %H:%M"),
+        {_qid(question_id): answers.get(question_id) for question_id in question_ids}, correct, total,
+    )
+    return {"correct": correct, "total": total, "results": results}
+
+
+class ItemStats:
+    """Bir testin soruları için artımlı madde istatistikleri
+
+    Her soru için yalnızca toplamlar tutulur; yeni denemeler numpy ile bu toplamlara
+    eklenir, eski denemeler yeniden taranmaz. Ayırt edicilik, sorunun doğru/yanlış
+    puanı ile denemenin geri kalan sorularındaki doğru oranı arasındaki nokta çift
+    serili (point-biserial) korelasyondur.
+    """
+
+    def __init__(self, test_id):
+        self.test_id = test_id
+        self.attempts = 0
+        self.last_attempt = 0
+        self._lock = threading.Lock()
+        # Aynı denemelerin iki oturum tarafından birlikte eklenmesini önler
+        self._refresh_lock = threading.Lock()
+        self._rows = {}
+        self._options = np.zeros((0, 0))
+        # Sütunlar: sunulma, doğru, boş, n, Σx, Σr, Σr², Σxr (r: geri kalan doğru oranı)
+        self._sums = np.zeros((0, 8))
+
+    def _row_indices(self, question_ids, width):
+        for question_id in question_ids:
+            if question_id not in self._rows:
+                self._rows[question_id] = len(self._rows)
+        grow = len(self._rows) - len(self._sums)
+        if grow > 0:
+            self._sums = np.vstack([self._sums, np.zeros((grow, self._sums.shape[1]))])
+            self._options = np.vstack([self._options, np.zeros((grow, self._options.shape[1]))])
+        if width > self._options.shape[1]:
+            self._options = np.hstack([self._options, np.zeros((len(self._options), width - self._options.shape[1]))])
+        return np.fromiter((self._rows[question_id] for question_id in question_ids), dtype=np.intp,
+                           count=len(question_ids))
+
+    def add_batch(self, test, attempts):
+        """[(deneme id, {soru id: seçilen})] denemelerini toplamlara ekler; id'ler metin olarak eşlenir"""
+        multiple = {_qid(q['id']): q for q in test['questions'] if q['type'] == 'multiple'}
+        question_ids, chosen, correct, rest, has_rest = [], [], [], [], []
+        last = self.last_attempt
+        for attempt_id, answers in attempts:
+            last = max(last, attempt_id)
+            answers = {_qid(question_id): answer for question_id, answer in answers.items()}
+            items = [question_id for question_id in answers if question_id in multiple]
+            marks = [answers[question_id] == multiple[question_id]['correct'] for question_id in items]
+            total, count = sum(marks), len(marks)
+            for question_id, mark in zip(items, marks):
+                answer = answers[question_id]
+                # Test sonradan değiştiyse artık olmayan seçenekler boş sayılır
+                valid = isinstance(answer, int) and 0 <= answer < len(multiple[question_id]['options'])
+                question_ids.append(question_id)
+                chosen.append(answer if valid else OMITTED)
+                correct.append(mark)
+                rest.append((total - mark) / (count - 1) if count > 1 else 0.0)
+                has_rest.append(count > 1)
+
+        with self._lock:
+            self.attempts += len(attempts)
+            self.last_attempt = last
+            if not question_ids:
+                return
+            width = max(len(q['options']) for q in multiple.values())
+            rows = self._row_indices(question_ids, width)
+            chosen = np.asarray(chosen, dtype=np.intp)
+            x = np.asarray(correct, dtype=float)
+            r = np.asarray(rest, dtype=float)
+            mask = np.asarray(has_rest, dtype=float)
+
+            columns = np.column_stack([
+                np.ones_like(x), x, (chosen == OMITTED).astype(float),
+                mask, mask * x, mask * r, mask * r * r, mask * x * r,
+            ])
+            np.add.at(self._sums, rows, columns)
+            answered = chosen != OMITTED
+            np.add.at(self._options, (rows[answered], chosen[answered]), 1)
+
+    def refresh(self, depo, test):
+        """Depoya bu nesnenin görmediği denemeler yazıldıysa yalnızca onları ekler"""
+        with self._refresh_lock:
+            batch = []
+            for attempt in depo.iter_attempts(self.test_id, after=self.last_attempt):
+                batch.append(attempt)
+                if len(batch) >= ATTEMPT_CHUNK:
+                    self.add_batch(test, batch)
+                    batch = []
+            if batch:
+                self.add_batch(test, batch)
+
+    def table(self, test):
+        """Soru başına deneme sayısı, güçlük, ayırt edicilik ve seçenek dağılımı"""
+        with self._lock:
+            sums = self._sums.copy()
+            options = self._options.copy()
+            rows = dict(self._rows)
+
+        seen, correct, omitted, n, sx, sr, srr, sxr = sums.T if len(sums) else np.zeros((8, 0))
+        # Seçenek sütunları testin şu anki en uzun sorusu kadar genişletilir
+        width = max((len(q['options']) for q in test['questions'] if q['type'] == 'multiple'), default=0)
+        if width > options.shape[1]:
+            options = np.hstack([options, np.zeros((len(options), width - options.shape[1]))])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            difficulty = correct / seen
+            spread = np.sqrt((n * sx - sx ** 2) * (n * srr - sr ** 2))
+            discrimination = np.where(spread > 0, (n * sxr - sx * sr) / spread, np.nan)
+            frequencies = options / seen[:, None]
+
+        table = []
+        for number, q in enumerate(test['questions'], 1):
+            row = rows.get(_qid(q['id']))
+            if q['type'] != 'multiple':
+                continue
+            if row is None or not seen[row]:
+                table.append({"Soru": number, "Deneme": 0, "Güçlük (p)": None, "Ayırt edicilik (r)": None,
+                              "Boş (%)": None, "Seçenekler (%)": ""})
+                continue
+            table.append({
+                "Soru": number,
+                "Deneme": int(seen[row]),
+                "Güçlük (p)": round(float(difficulty[row]), 3),
+                "Ayırt edicilik (r)": None if np.isnan(discrimination[row]) else round(float(discrimination[row]), 3),
+                "Boş (%)": round(float(omitted[row] / seen[row]) * 100, 1),
+                "Seçenekler (%)": " • ".join(
+                    f"{chr(65 + idx)}{'✓' if idx == q['correct'] else ''}: {frequencies[row, idx] * 100:.0f}"
+                    for idx in range(len(q['options']))
+                ),
+            })
+        return table
+
+
+# test id → (test, istatistikler); içerik deposu testleri değişmez nesneler olarak tutar
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+def item_stats(depo, test):
+    """Testin süreç genelindeki istatistikleri; depodaki yeni denemelerle güncellenmiş
+
+    Test yeniden içe aktarıldığında ya da içerik yeniden okunduğunda içerik deposu yeni
+    bir test nesnesi verir; eski bankanın toplamları atılır ve denemeler şu anki
+    sorularla baştan taranır.
+    """
+    with _stats_lock:
+        cached = _stats.get(test['id'])
+        if cached is None or cached[0] is not test:
+            cached = _stats[test['id']] = (test, ItemStats(test['id']))
+    stats = cached[1]
+    stats.refresh(depo, test)
+    return stats
@@ -0,0 +1,114 @@
+import json
+import time
+
+import numpy as np
+
+from modules.grafik_turleri import GRAPH_TYPES
+from modules.cekirdekler import compute_series
+from modules.onbellek import record_render
+
+
+def _line_rows(name, x, y, dash=False, max_points=50, group=0, value=None):
+    """Eğriyi seyrekleştirip yuvarlanmış satırlara çevirir"""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    # Tanımsız (NaN / sonsuz) noktalar JSON'a yazılamaz
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    if len(x) > max_points:
+        idx = np.unique(np.linspace(0, len(x) - 1, max_points).round().astype(int))
+        x, y = x[idx], y[idx]
+    extra = {} if value is None else {"g": group, "v": round(float(value), 4)}
+    return [
+        {"k": "l", "s": name, "d": int(dash), "i": i, "x": round(float(xv), 2), "y": round(float(yv), 2), **extra}
+        for i, (xv, yv) in enumerate(zip(x, y))
+    ]
+
+
+def _point_row(name, label, x, y, group=0, value=None):
+    extra = {} if value is None else {"g": group, "v": round(float(value), 4)}
+    return {"k": "p", "s": name, "t": label, "x": round(float(x), 2), "y": round(float(y), 2), **extra}
+
+
+def _spec(rows, title, subtitle, x_title, y_title, xlim, ylim, value_title=None):
+    x = {"field": "x", "type": "quantitative", "title": x_title, "scale": {"domain": [round(xlim[0], 2), round(xlim[1], 2)]}}
+    y = {"field": "y", "type": "quantitative", "title": y_title, "scale": {"domain": [round(ylim[0], 2), round(ylim[1], 2)]}}
+    if value_title is None:
+        color = {"field": "s", "type": "nominal", "title": None, "legend": {"orient": "top-right"}}
+        detail = {}
+    else:
+        # Senaryolar değişen parametrenin değerine göre renklenir
+        color = {"field": "v", "type": "quantitative", "title": value_title, "scale": {"scheme": "viridis"}}
+        detail = {"detail": [{"field": "s"}, {"field": "g"}]}
+    return {
+        "title": {"text": title, "subtitle": subtitle},
+        "height": 480,
+        "data": {"values": rows},
+        "layer": [
+            {
+                "transform": [{"filter": "datum.k == 'l'"}],
+                "mark": {"type": "line", "clip": True},
+                "encoding": {
+                    "x": x, "y": y, "color": color, "order": {"field": "i"},
+                    "strokeDash": {"field": "d", "type": "nominal", "legend": None, "scale": {"domain": [0, 1], "range": [[1, 0], [6, 4]]}},
+                    **detail,
+                },
+            },
+            {
+                "transform": [{"filter": "datum.k == 'p'"}],
+                "mark": {"type": "point", "filled": True, "size": 160},
+                "encoding": {"x": x, "y": y, "color": color, "tooltip": [{"field": "s"}, {"field": "x"}, {"field": "y"}]},
+            },
+            {
+                "transform": [{"filter": "datum.k == 'p'"}],
+                "mark": {"type": "text", "dx": 10, "dy": -10, "fontWeight": "bold"},
+                "encoding": {"x": x, "y": y, "text": {"field": "t"}},
+            },
+        ],
+    }
+
+
+def vector_spec(graph_type, params, overlay=None):
+    """Kayıtlı grafik türü için Vega-Lite tanımı; senaryolar aynı çekirdek çağrısından gelir"""
+    spec = GRAPH_TYPES[graph_type]
+    series, scenario_values = compute_series(graph_type, params, overlay)
+    single = scenario_values is None
+    values = [None] if single else list(scenario_values)
+
+    rows = []
+    for line in series["lines"]:
+        # Etiketsiz kılavuz çizgileri yalnızca PNG modunda çizilir
+        if line["label"] is None:
+            continue
+        # Senaryolar çoğaldıkça eğri başına nokta azaltılır
+        max_points = 2 if line.get("straight") else (50 if single else 20)
+        for group, value in enumerate(values):
+            rows += _line_rows(line["label"], line["x"][group], line["y"][group],
+                               dash=line.get("style", "-") != "-", max_points=max_points,
+                               group=group, value=value)
+    for point in series["points"]:
+        for group, value in enumerate(values):
+            x, y = point["x"][group], point["y"][group]
+            if single:
+                name = f'{point["label"]}: ({round(float(x), 1):g}, {round(float(y), 1):g})'
+                rows.append(_point_row(name, point["mark"], x, y))
+            else:
+                rows.append(_point_row(point["label"], "", x, y, group, value))
+
+    value_title = None
+    if single:
+        subtitle = series["info"][0].split('\n') if series["info"] else ''
+    else:
+        value_title = next(label for name, label, *_ in spec["params"] if name == overlay[0])
+        subtitle = f"{value_title}: {len(values)} senaryo"
+    return _spec(rows, spec["title"], subtitle, spec["xlabel"], spec["ylabel"],
+                 series["xlim"], series["ylim"], value_title)
+
+
+def render_vector(graph_type, params, overlay=None):
+    """Grafiği tarayıcıda çizilecek Vega-Lite tanımı olarak döndürür"""
+    started = time.perf_counter()
+    spec = vector_spec(graph_type, params, overlay)
+    payload = len(json.dumps(spec, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+    record_render("vector", time.perf_counter() - started, payload)
+    return spec
@@ -11,4 +11,144 @@ EKONOMI_KONULARI = {
         "formul": "Q_d = a - bP\\\\Q_s = c + dP",
         "teori": "**Arz Eğrisi:** Üreticilerin belirli fiyatlarda satmaya razı oldukları miktar\n**Talep Eğrisi:** Tüketicilerin belirli fiyatlarda satın almaya razı oldukları miktar\n\n**Denge:** Arz ve talebin kesiştiği noktada piyasa dengesi oluşur."
     }
-}
\ No newline at end of file
+}
+
+# Veritabanı boşken yüklenen demo içerik
+DEMO_LESSONS = [
+    {
+        "unit_number": 1,
+        "unit_title": "İki Dönemli Tüketici Modeli",
+        "pages": [
+            {
+                "page_number": 1,
+                "sections": [
+                    {
+                        "id": "s1",
+                        "type": "text",
+                        "content": "İki dönemli tüketici modeli, tüketicinin gelir ve faiz oranları kısıtı altında, bugünkü (C₁) ve gelecekteki (C₂) tüketimi arasındaki tercihlerini eniyilemesini inceler."
+                    },
+                    {
+                        "id": "s2",
+                        "type": "formula",
+                        "content": r"C_2 = R_1(1+j_{12}) + R_2 - (1+j_{12})C_1"
+                    }
+                ]
+            },
+            {
+                "page_number": 2,
+                "sections": [
+                    {
+                        "id": "s1",
+                        "type": "text",
+                        "content": "Tüketici optimumu gösteren (P) noktasında, bütçe doğrusunun eğimi ile zaman kayıtsızlık eğrisinin eğimi birbirine eşittir."
+                    },
+                    {
+                        "id": "s2",
+                        "type": "graph",
+                        "graph_type": "budget_constraint",
+                        "title": "İki Dönemli Optimum Tüketim",
+                        "description": "Bütçe doğrusu ve farksızlık eğrileri",
+                        "params": {"R1": 100, "R2": 80, "j12": 0.1}
+                    }
+                ]
+            },
+            {
+                "page_number": 3,
+                "sections": [
+                    {
+                        "id": "s1",
+                        "type": "text",
+                        "content": "Faiz oranı arttıkça bütçe doğrusu başlangıç noktası (R) etrafında döner ve dikleşir."
+                    },
+                    {
+                        "id": "s2",
+                        "type": "graph",
+                        "graph_type": "budget_constraint",
+                        "title": "Faiz Oranının Etkisi",
+                        "description": "%0 ile %50 arasındaki 20 faiz oranı için bütçe doğruları",
+                        "params": {"R1": 100, "R2": 80},
+                        "overlay": {"param": "j12", "min": 0.0, "max": 0.5, "count": 20}
+                    },
+                    {
+                        "id": "s3",
+                        "type": "graph",
+                        "graph_type": "intertemporal_statics",
+                        "title": "Tasarrufun Faize Tepkisi",
+                        "description": "Faiz değişiminin tasarrufa etkisi: ikame etkisi ve gelir etkisi",
+                        "params": {"R1": 100, "R2": 80, "j12": 0.1, "utility": "time_preference", "beta": 0.95, "theta": 2.0}
+                    }
+                ]
+            }
+        ]
+    },
+    {
+        "unit_number": 2,
+        "unit_title": "Arz ve Talep Analizi",
+        "pages": [
+            {
+                "page_number": 1,
+                "sections": [
+                    {
+                        "id": "s1",
+                        "type": "text",
+                        "content": "Arz ve talep, piyasa ekonomisinin temel dinamiklerini açıklar. Fiyat mekanizması bu iki kuvvetin etkileşimiyle oluşur."
+                    },
+                    {
+                        "id": "s2",
+                        "type": "graph",
+                        "graph_type": "supply_demand",
+                        "title": "Arz ve Talep Dengesi",
+                        "description": "Piyasa denge noktası",
+                        "params": {"demand_shift": 0, "supply_shift": 0, "tax": 0.0}
+                    }
+                ]
+            },
+            {
+                "page_number": 2,
+                "sections": [
+                    {
+                        "id": "s1",
+                        "type": "text",
+                        "content": "Satıcıdan alınan birim vergi, alıcı ve satıcı fiyatları arasına bir fark koyar. Vergi yükünün paylaşımı yasal yükümlüye değil, eğrilerin esnekliklerine bağlıdır."
+                    },
+                    {
+                        "id": "s2",
+                        "type": "graph",
+                        "graph_type": "supply_demand",
+                        "title": "Birim Verginin Yansıması",
+                        "description": "Sabit esneklikli talep (ε = -2) altında 0 ile 5 arasındaki vergiler",
+                        "params": {
+                            "demand_shift": 0, "supply_shift": 0,
+                            "demand": {"form": "constant_elasticity", "scale": 10000, "elasticity": -2}
+                        },
+                        "overlay": {"param": "tax", "min": 0.0, "max": 5.0, "count": 11}
+                    },
+                    {
+                        "id": "s3",
+                        "type": "graph",
+                        "graph_type": "supply_demand",
+                        "title": "Tavan Fiyat ve Kıtlık",
+                        "description": "Denge fiyatının altındaki tavan fiyatta talep edilen miktar arzı aşar",
+                        "params": {"demand_shift": 0, "supply_shift": 0, "tax": 0.0, "ceiling": 8.0}
+                    }
+                ]
+            }
+        ]
+    }
+]
+
+DEMO_TESTS = [
+    {
+        "id": 1,
+        "unit": "Ünite 1",
+        "questions": [
+            {
+                "id": "q1",
+                "type": "multiple",
+                "question": "İki dönemli modelde faiz oranı artarsa bütçe doğrusunun eğimi nasıl değişir?",
+                "options": ["Artar (daha dik)", "Azalır (daha yatık)", "Değişmez", "Belirsiz"],
+                "correct": 0
+            }
+        ]
+    }
+]
@@ -0,0 +1,41 @@
+import os
+
+# Dağıtım geneli ayarlar: süreç başına bir kez ortam değişkenlerinden okunur. Tüm oturumları
+# etkiledikleri için Ayarlar > Performans sekmesinden yalnızca yönetici (MIKRO_ADMIN=1) değiştirir.
+CONFIG = {
+    "db_path": os.environ.get(
+        "MIKRO_DB_PATH",
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mikro.db")
+    ),
+    # Notların sahibi: ayarlanmamışsa her tarayıcı adres çubuğundaki ?u= anahtarıyla kendi
+    # notlarını görür; ayarlanırsa (boş dahil) tüm oturumlar bu kullanıcıyı paylaşır.
+    # Tek kullanıcılı kurulumlar MIKRO_USER= ile sahipsiz eski notları görmeye devam eder.
+    "shared_user": os.environ.get("MIKRO_USER"),
+    # Süreç geneli ayarları arayüzden değiştirme yetkisi; kapalıyken ayarlar salt okunur gösterilir
+    "admin": os.environ.get("MIKRO_ADMIN", "0") == "1",
+    # Yeni oturumların çizim modu: "png" sunucuda matplotlib, "vector" tarayıcıda Vega-Lite;
+    # her oturum kendi modunu Ayarlar > Performans'tan değiştirir. Bilinmeyen değerde "png"
+    "render_mode": os.environ.get("MIKRO_RENDER_MODE", "png"),
+    # PNG çizim havuzunun işçi sayısı (0: çizim oturumun kendi iş parçacığında yapılır), işçi
+    # başına kuyruk derinliği ve bir çizimin kuyrukta bekleme dahil en uzun süresi (saniye)
+    "render_workers": int(os.environ.get("MIKRO_RENDER_WORKERS", str(min(4, os.cpu_count() or 1)))),
+    "render_queue": int(os.environ.get("MIKRO_RENDER_QUEUE", "4")),
+    "render_timeout": float(os.environ.get("MIKRO_RENDER_TIMEOUT", "30")),
+    # Tek senaryolu grafiklerde figürler yeniden kurulmaz; havuzdaki hazır figürün verileri güncellenir
+    "figure_pool": os.environ.get("MIKRO_FIGURE_POOL", "1") == "1",
+    # Çizim arka ucunu (matplotlib, yazı tipleri) ilk grafik istenmeden arka planda hazırla
+    "prewarm_enabled": os.environ.get("MIKRO_PREWARM", "1") == "1",
+    # Ayarlar > Profil sekmesindeki aşama süreleri; kapalıyken ölçüm yapılmaz
+    "profiling_enabled": os.environ.get("MIKRO_PROFILE", "0") == "1",
+    # Grafik bölümleri ve not panelleri kendi widget'ları değişince tek başına yeniden çalışır
+    # (Streamlit 1.33+; daha eski sürümlerde tüm betik yeniden çalışır)
+    "isolate_sections": os.environ.get("MIKRO_ISOLATE", "1") == "1",
+    "warmup_enabled": os.environ.get("MIKRO_WARMUP", "0") == "1",
+    "warmup_budget": int(os.environ.get("MIKRO_WARMUP_BUDGET", "200")),
+    "warmup_radius": int(os.environ.get("MIKRO_WARMUP_RADIUS", "10")),
+    "warmup_workers": int(os.environ.get("MIKRO_WARMUP_WORKERS", "2")),
+}
+
+RENDER_MODES = ("png", "vector")
+if CONFIG["render_mode"] not in RENDER_MODES:
+    CONFIG["render_mode"] = "png"
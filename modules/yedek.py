@@ -0,0 +1,160 @@
+import json
+import zlib
+from datetime import datetime
+
+_encoder = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+CHUNK_SIZE = 64 * 1024
+# Not anahtarlarındaki sayfa, sayfa numarasıdır; bu alanı taşımayan eski yedeklerde sayfanın sırasıdır
+NOTE_PAGES = "page_number"
+
+
+def _iter_list(items):
+    yield "["
+    for idx, item in enumerate(items):
+        yield ",\n" if idx else "\n"
+        yield from _encoder.iterencode(item)
+    yield "\n]"
+
+
+def _iter_mapping(pairs):
+    yield "{"
+    for idx, (key, value) in enumerate(pairs):
+        yield ",\n" if idx else "\n"
+        yield json.dumps(str(key), ensure_ascii=False) + ": "
+        yield from _encoder.iterencode(value)
+    yield "\n}"
+
+
+def _iter_document(fields):
+    """(alan, parça üreteci) listesinden üst düzey JSON nesnesi üretir"""
+    yield "{"
+    for idx, (name, chunks) in enumerate(fields):
+        yield ",\n" if idx else "\n"
+        yield json.dumps(name) + ": "
+        yield from chunks
+    yield "\n}\n"
+
+
+def _buffered(chunks):
+    """Küçük JSON parçalarını CHUNK_SIZE boyutunda bloklara toplar"""
+    buffer, size = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= CHUNK_SIZE:
+            yield "".join(buffer).encode('utf-8')
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode('utf-8')
+
+
+def iter_gzip(blocks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+    for block in blocks:
+        compressed = compressor.compress(block)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def iter_full_backup(depo, owner):
+    """Tüm içeriğin ve owner kullanıcısının notlarının yedeği: depodan parça parça okunur"""
+    return _iter_document([
+        ("note_pages", iter([json.dumps(NOTE_PAGES)])),
+        ("lessons", _iter_list(depo.iter_lessons())),
+        ("tests", _iter_list(depo.load_tests())),
+        ("notes", _iter_mapping(depo.iter_notes(owner))),
+        ("summaries", _iter_list(depo.load_summaries())),
+        ("export_date", iter([json.dumps(datetime.now().isoformat())])),
+    ])
+
+
+def _changed_lessons(depo, page_keys):
+    """Değişen sayfaları üniteye göre gruplar"""
+    lessons = {}
+    for page_key in sorted(page_keys, key=lambda k: tuple(int(p) for p in k.split('-'))):
+        unit_num, page_num = (int(p) for p in page_key.split('-'))
+        page = depo.load_page(unit_num, page_num)
+        if page is None:
+            continue
+        unit_title = page.pop('unit_title')
+        lesson = lessons.setdefault(unit_num, {"unit_number": unit_num, "unit_title": unit_title, "pages": []})
+        lesson['pages'].append(page)
+    return lessons.values()
+
+
+def iter_delta_backup(depo, owner, base_seq, seq):
+    """owner kullanıcısının son yedeğinden (base_seq) bu yana değişen kayıtların yedeği"""
+    changes = depo.changes_since(base_seq, seq, owner)
+    replaced = sorted(c for c, ops in changes.items() if ops.get('*') == 'replace')
+
+    fields = [
+        ("format", iter(['"mikro-delta"'])),
+        ("note_pages", iter([json.dumps(NOTE_PAGES)])),
+        ("base_seq", iter([str(base_seq)])),
+        ("seq", iter([str(seq)])),
+        ("replaced", iter([json.dumps(replaced)])),
+    ]
+
+    if 'lessons' in replaced:
+        fields.append(("lessons", _iter_list(depo.iter_lessons())))
+    elif 'pages' in changes:
+        fields.append(("lessons", _iter_list(_changed_lessons(depo, changes['pages']))))
+
+    if 'tests' in changes:
+        fields.append(("tests", _iter_list(depo.load_tests())))
+
+    if 'notes' in replaced:
+        fields.append(("notes", _iter_mapping(depo.iter_notes(owner))))
+    elif 'notes' in changes:
+        upserted, deleted = {}, []
+        for note_key, op in changes['notes'].items():
+            note_id = float(note_key)
+            found = depo.load_note(note_id, owner) if op == 'upsert' else None
+            if found is None:
+                deleted.append(note_id)
+            else:
+                upserted.setdefault(found[0], []).append(found[1])
+        fields.append(("notes", _iter_mapping(sorted(upserted.items()))))
+        fields.append(("deleted_notes", iter([json.dumps(deleted)])))
+
+    if 'summaries' in replaced:
+        fields.append(("summaries", _iter_list(depo.load_summaries())))
+    elif 'summaries' in changes:
+        summary_ids = sorted(int(k) for k in changes['summaries'])
+        summaries = (depo.load_summary(summary_id) for summary_id in summary_ids)
+        fields.append(("summaries", _iter_list(s for s in summaries if s is not None)))
+
+    fields.append(("export_date", iter([json.dumps(datetime.now().isoformat())])))
+    return _iter_document(fields)
+
+
+def build_backup(depo, owner, delta=False, compress=False):
+    """Yedeği istek üzerine parça parça oluşturur; yalnızca çıktı baytları bellekte tutulur
+
+    Notlardan yalnızca owner kullanıcısınınkiler yedeklenir. Kullanıcı daha önce
+    yedek almadıysa artımlı yedeğin dayanağı yoktur; tam yedek alınır.
+    """
+    seq = depo.current_seq()
+    base_seq = depo.last_backup_seq(owner) if delta else None
+    delta = base_seq is not None
+    if delta:
+        chunks = iter_delta_backup(depo, owner, base_seq, seq)
+    else:
+        chunks = iter_full_backup(depo, owner)
+
+    blocks = _buffered(chunks)
+    if compress:
+        blocks = iter_gzip(blocks)
+
+    kind = "delta" if delta else "backup"
+    file_name = f"mikro_econ_{kind}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    if compress:
+        file_name += ".gz"
+    return {
+        "data": b"".join(blocks),
+        "seq": seq,
+        "file_name": file_name,
+        "mime": "application/gzip" if compress else "application/json",
+    }